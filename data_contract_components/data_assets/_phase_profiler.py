@@ -0,0 +1,213 @@
+"""
+Opt-in profiling of named phases (spec load, catalog query, merge, ...).
+
+Set DATA_CONTRACT_PROFILE=1 (or pass --profile to the detection CLI or
+seed_db.py) and every profiled run prints a breakdown to stderr: per phase the
+number of calls, the wall time, the memory allocated by the phase and not freed,
+and the peak of traced memory above the phase's start (tracemalloc).  Set it to
+a directory instead and each run also writes <run>-<timestamp>-<pid>.pstats
+(cProfile, open with `python -m pstats`) and a .phases.json with the same
+breakdown, to attach to a performance regression:
+
+    DATA_CONTRACT_PROFILE=/tmp/profiles python -m data_contract_components.detection all
+
+When profiling is off, run() and phase() do nothing beyond entering a context
+manager.  When it is on, tracemalloc slows allocation-heavy code down several
+times, so compare wall times between profiled runs only.  tracemalloc is
+process-wide, so phases running in parallel threads see each other's
+allocations, and cProfile only covers the thread that started the run.
+
+Only the standard library is used, so this module can be imported both as
+data_contract_components.data_assets._phase_profiler and, by the scripts run
+from this directory, as _phase_profiler.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROFILE_ENV_VARIABLE = "DATA_CONTRACT_PROFILE"
+_DISABLED_VALUES = ("", "0", "false", "no", "off")
+_ENABLED_VALUES = ("1", "true", "yes", "on")
+
+
+class PhaseProfiler:
+    """
+    Records wall time and allocations per named phase of one run.
+
+    A profiler can be shared: a run() nested in another run() of the same profiler
+    (e.g. a detector inside a CLI invocation) only adds its phases to the outer
+    run's report.  Phases with the same name are aggregated.
+    """
+
+    def __init__(self, run_name: str, enabled: bool = False, output_directory: Optional[str] = None) -> None:
+        """
+        Initialize the PhaseProfiler.
+
+        Args:
+            run_name: Name of the profiled program, used in the report and file names
+            enabled: Record phases; a disabled profiler does nothing
+            output_directory: Also write a .pstats and a .phases.json file per run here
+        """
+        self.run_name = run_name
+        self.enabled = enabled or output_directory is not None
+        self.output_directory = Path(output_directory) if output_directory else None
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._run_depth = 0
+
+    @classmethod
+    def from_env(cls, run_name: str, setting: Optional[str] = None) -> "PhaseProfiler":
+        """
+        Build a profiler from a setting, falling back to the DATA_CONTRACT_PROFILE variable.
+
+        "1"/"true" enables the report, a directory path also enables the file dumps,
+        and an empty, unset or "0" setting disables profiling.
+        """
+        if setting is None:
+            setting = os.environ.get(PROFILE_ENV_VARIABLE, "")
+        setting = setting.strip()
+        if setting.lower() in _DISABLED_VALUES:
+            return cls(run_name)
+        if setting.lower() in _ENABLED_VALUES:
+            return cls(run_name, enabled=True)
+        return cls(run_name, output_directory=setting)
+
+    def _stack(self) -> List[Dict[str, int]]:
+        """Open phases of the current thread, innermost last."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record the wall time and allocations of the enclosed block under `name`."""
+        if not self.enabled:
+            yield
+            return
+
+        tracing = tracemalloc.is_tracing()
+        stack = self._stack()
+        current_before = 0
+        if tracing:
+            current_before, peak_so_far = tracemalloc.get_traced_memory()
+            # The peak is reset for this phase, so hand the enclosing phase its peak so far first
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak_so_far)
+            tracemalloc.reset_peak()
+        with self._lock:
+            record = self.phases.setdefault(
+                name, {"calls": 0, "wall_seconds": 0.0, "allocated_bytes": 0, "peak_bytes": 0}
+            )
+        frame = {"peak": current_before}
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_seconds = time.perf_counter() - start
+            stack.pop()
+            current_after, peak_after = tracemalloc.get_traced_memory() if tracing else (0, 0)
+            peak = max(frame["peak"], peak_after)
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+
+            with self._lock:
+                record["calls"] += 1
+                record["wall_seconds"] += wall_seconds
+                record["allocated_bytes"] += current_after - current_before
+                record["peak_bytes"] = max(record["peak_bytes"], peak - current_before)
+
+    @contextmanager
+    def run(self):
+        """
+        Profile a whole run: start tracemalloc (and cProfile when dumping), and report on exit.
+        """
+        with self._lock:
+            self._run_depth += 1
+            outermost = self._run_depth == 1
+        if not self.enabled or not outermost:
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._run_depth -= 1
+            return
+
+        self.phases = {}
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profile = cProfile.Profile() if self.output_directory else None
+        if profile is not None:
+            profile.enable()
+
+        try:
+            with self.phase("total"):
+                yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            if started_tracing:
+                tracemalloc.stop()
+            with self._lock:
+                self._run_depth -= 1
+            self.write_report(profile)
+
+    def summary(self) -> Dict[str, Any]:
+        """The recorded phases in the order they first started, and the totals of the run."""
+        phases = [
+            {"phase": name, **record}
+            for name, record in self.phases.items()
+            if name != "total"
+        ]
+        total = self.phases.get("total")
+        return {
+            "run": self.run_name,
+            "wall_seconds": total["wall_seconds"] if total else sum(p["wall_seconds"] for p in phases),
+            "peak_bytes": total["peak_bytes"] if total else max((p["peak_bytes"] for p in phases), default=0),
+            "phases": phases,
+        }
+
+    def format_report(self) -> str:
+        """Render the summary as a table."""
+        summary = self.summary()
+        mib = 1024 * 1024
+        lines = [
+            f"Profile of {summary['run']}: {summary['wall_seconds']:.3f}s, "
+            f"peak {summary['peak_bytes'] / mib:.1f} MiB traced",
+            f"  {'phase':<24} {'calls':>6} {'wall s':>9} {'alloc MiB':>10} {'peak MiB':>9}",
+        ]
+        for phase in summary["phases"]:
+            lines.append(
+                f"  {phase['phase']:<24} {phase['calls']:>6} {phase['wall_seconds']:>9.3f} "
+                f"{phase['allocated_bytes'] / mib:>10.1f} {phase['peak_bytes'] / mib:>9.1f}"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, profile: Optional[cProfile.Profile] = None) -> Optional[Path]:
+        """Print the report to stderr and, with an output directory, dump the files; returns the pstats path."""
+        print(self.format_report(), file=sys.stderr)
+        if self.output_directory is None:
+            return None
+
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        stem = self.output_directory / f"{self.run_name}-{timestamp}-{os.getpid()}"
+        with open(stem.with_suffix(".phases.json"), "w") as file:
+            json.dump(self.summary(), file, indent=2)
+        if profile is None:
+            return None
+        pstats_path = stem.with_suffix(".pstats")
+        profile.dump_stats(pstats_path)
+        print(f"  cProfile stats written to {pstats_path}", file=sys.stderr)
+        return pstats_path
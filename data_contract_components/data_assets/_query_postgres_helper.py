@@ -2,6 +2,27 @@ import pandas as pd
 from psycopg_pool import ConnectionPool
 import socket
 
+
+def leaf_tables_sql(relation_oid: str, relkind: str) -> str:
+    """
+    Subquery listing, as relid, the tables that hold the rows of a relation: the
+    leaf partitions of a partitioned table, otherwise the relation itself.
+
+    Meant for a CROSS JOIN LATERAL, so catalog queries can sum sizes or row
+    counts over the partitions of a partitioned table, e.g.
+    leaf_tables_sql("pg_class.oid", "pg_class.relkind").
+
+    Args:
+        relation_oid: SQL expression for the relation's oid
+        relkind: SQL expression for the relation's pg_class.relkind
+    """
+    return f"""(
+                SELECT {relation_oid} AS relid WHERE {relkind} <> 'p'
+                UNION ALL
+                SELECT relid FROM pg_partition_tree({relation_oid}) WHERE isleaf AND {relkind} = 'p'
+            )"""
+
+
 class PostgresDB:
     def __init__(self):
         """Initialize database connection."""
@@ -32,13 +53,13 @@ class PostgresDB:
             self.pool = ConnectionPool(self.db_url, min_size=1, max_size=5, open=True)
         return self.pool
     
-    def query(self, sql_query: str) -> pd.DataFrame:
+    def query(self, sql_query: str, params=None) -> pd.DataFrame:
         """Execute a SQL query and return results as DataFrame."""
         
         pool = self._get_pool()
         with pool.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql_query)
+                cur.execute(sql_query, params)
                 results = cur.fetchall()
                 
                 # Get column names
@@ -48,6 +69,45 @@ class PostgresDB:
                 df = pd.DataFrame(results, columns=column_names)
                 return df
     
+    def query_chunks(self, sql_query: str, params=None, chunk_size: int = 10000):
+        """
+        Execute a SQL query and yield (column_names, rows) chunks of at most chunk_size rows.
+
+        Uses a server-side cursor, so neither the client library nor Python ever holds
+        the whole result at once.
+        """
+
+        pool = self._get_pool()
+        with pool.connection() as conn:
+            with conn.cursor(name="query_chunks") as cur:
+                cur.execute(sql_query, params)
+                while True:
+                    rows = cur.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield [desc[0] for desc in cur.description], rows
+
+    def execute(self, sql_statement: str, params=None) -> int:
+        """Execute a SQL statement in its own transaction and return the affected row count."""
+
+        pool = self._get_pool()
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql_statement, params)
+                return cur.rowcount
+
+    def execute_all(self, statements) -> list:
+        """Execute (sql, params) pairs in one transaction and return their affected row counts."""
+
+        pool = self._get_pool()
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                rowcounts = []
+                for sql_statement, params in statements:
+                    cur.execute(sql_statement, params)
+                    rowcounts.append(cur.rowcount)
+                return rowcounts
+
     def __del__(self):
         """Clean up the connection pool when the object is destroyed."""
         if self.pool and not self.pool.closed:
@@ -1,9 +1,17 @@
+import sys
 from logging.config import fileConfig
+from pathlib import Path
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
+from alembic.script import ScriptDirectory
+
+# The contract gate imports the detection package from the repository root.
+repository_root = Path(__file__).resolve().parents[3]
+if str(repository_root) not in sys.path:
+    sys.path.insert(0, str(repository_root))
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -24,6 +32,67 @@ target_metadata = None
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
+contract_directory = Path(__file__).resolve().parents[2] / "contract_definition"
+
+# Upgrade steps applied by this invocation (commands like "current" apply none).
+applied_upgrades = []
+
+
+def record_applied_step(ctx, step, heads, run_args) -> None:
+    """on_version_apply hook: remember upgrade steps for the contract gate."""
+    if step.is_upgrade:
+        applied_upgrades.append(step.up_revision_id)
+
+
+class ContractGateError(Exception):
+    """Raised inside the migration transaction when the new schema breaks a contract."""
+
+
+def run_contract_gate(connection) -> None:
+    """Check the contracts against the schema the migrations just produced.
+
+    Runs on the migration connection before the transaction commits, so the
+    catalog query sees the uncommitted DDL, and raising rolls every migration
+    of this run back. Contracts describe the head revision, so the gate only
+    runs when this invocation upgraded the database and it ends up at head.
+    Skip it with ``alembic -x contract_gate=false upgrade head``.
+    """
+    if context.get_x_argument(as_dictionary=True).get("contract_gate", "true") == "false":
+        return
+    if not applied_upgrades:
+        return
+
+    script = ScriptDirectory.from_config(config)
+    if set(context.get_context().get_current_heads()) != set(script.get_heads()):
+        return
+
+    from data_contract_components.detection._get_data_catalog import get_data_catalog_from_connection
+    from data_contract_components.detection.contract_coverage_detector import ContractCoverageDetector
+    from data_contract_components.detection.contract_violation_detector import ContractViolationDetector
+
+    catalog = get_data_catalog_from_connection(connection)
+
+    def catalog_source():
+        return catalog
+
+    problems = [
+        f"Table '{table_name}' is under contract but missing from the data catalog"
+        for table_name in ContractCoverageDetector(
+            contract_directory, catalog_source=catalog_source
+        ).detect_coverage_in_data_catalog()
+    ]
+    problems += [
+        f"{violation['table_name']}.{violation['column_name']}: {violation['violations']}"
+        for violation in ContractViolationDetector(
+            contract_directory, catalog_source=catalog_source
+        ).detect_constraint_violations()
+    ]
+
+    if problems:
+        raise ContractGateError(
+            "Migration rolled back, the resulting schema violates the data contracts:\n  "
+            + "\n  ".join(problems)
+        )
 
 
 def run_migrations_offline() -> None:
@@ -65,11 +134,14 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            on_version_apply=record_applied_step,
         )
 
         with context.begin_transaction():
             context.run_migrations()
+            run_contract_gate(connection)
 
 
 if context.is_offline_mode():
@@ -14,10 +14,32 @@ Bulk-download records from The Met Collection API.  Two modes of operation:
    • Fetches each corresponding object record.
 
 All fetched objects are appended to a single JSON array (`objects.json`
-by default).  A checkpoint log (`processed_ids.log`) allows the script to
-resume safely after interruption.  The request rate never exceeds
+by default), or with `--format ndjson` to a directory of size-bounded,
+gzip-compressed NDJSON shards plus a `manifest.json` (see
+`ShardedNdjsonStore`).  A checkpoint log (`processed_ids.log`) allows the script to
+resume safely after interruption; it is group-committed together with the
+output (see `CheckpointLog`), so it never claims an ID whose object has not
+reached disk.  The request rate never exceeds
 80 requests/minute (1.0s delay between calls).
 
+Passing `--sync-state FILE` enables delta sync: the first run fetches the
+full scope and records the run date as a watermark; later runs ask the
+objects listing for IDs whose `metadataDate` changed since the watermark,
+fetch only those (into `<out>.delta`), and merge them into the existing
+output, replacing older versions.  The watermark only advances when every
+changed ID was fetched.
+
+Passing `--cache FILE` keeps every object response (body plus ETag /
+Last-Modified) in a SQLite cache keyed by object ID; later fetches are
+conditional and reuse the cached body on 304.  `--offline` serves entirely
+from that cache (and the saved search response), which makes rebuilding
+`objects.json` in CI fast, reproducible and free of network traffic.
+
+Passing `--concurrency N` switches to the asyncio fetch mode: up to N
+requests are in flight at once and a shared token bucket paces them at
+`--rate-limit` requests/minute.  A 403/429 on any request pauses and slows
+the whole bucket instead of only the request that was throttled.
+
 DATA SOURCE:
     The Metropolitan Museum of Art Collection API
     https://metmuseum.github.io/
@@ -30,39 +52,496 @@ python get_data_subset_from_met_api.py \
   --search-first \
   --out objects.json \
   --checkpoint processed_ids.log
+
+Sharded output (seed_db.py loads the shards in parallel):
+python get_data_subset_from_met_api.py \
+  --search-first \
+  --format ndjson \
+  --out objects
+
+Concurrent fetch (8 in flight, still capped at 80 requests/minute):
+python get_data_subset_from_met_api.py \
+  --search-first \
+  --concurrency 8 \
+  --rate-limit 80
+
+Nightly delta refresh of the same scope:
+python get_data_subset_from_met_api.py \
+  --search-first \
+  --sync-state sync_state.json
+
+Offline rebuild from the response cache (e.g. in CI):
+python get_data_subset_from_met_api.py \
+  --search-first \
+  --cache response_cache.sqlite \
+  --offline \
+  --checkpoint rebuild_ids.log
 """
 
 import argparse
+import asyncio
+import gzip
 import json
 import logging
 import os
 import pathlib
+import re
+import sqlite3
 import time
-from typing import List, Set, Tuple
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+
+class TokenBucket:
+    """
+    Async token bucket shared by every in-flight request.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one token before it is sent, so the request rate never
+    exceeds the target regardless of latency or concurrency.  Waiters are
+    served in arrival order.
+
+    When the server throttles us, `throttle` pauses the whole bucket for the
+    back-off period and halves the rate (never below `min_rate`).  Every
+    successful response then recovers the rate additively towards the
+    target, so the limiter adapts collectively instead of each request
+    sleeping on its own.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        min_rate: float | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        rate : float
+            Target request rate in requests/second.
+        capacity : float
+            Maximum burst size.  1.0 spaces requests exactly 1/rate apart.
+        min_rate : float | None
+            Floor for the adaptive rate; defaults to a tenth of *rate*.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.target_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available (and any pause has ended), then take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self, pause_sec: float) -> None:
+        """
+        Pause every requester for *pause_sec* and halve the rate.
+
+        Several requests throttled inside the same pause window only cut the
+        rate once; the pause is extended to the latest deadline.
+        """
+        now = time.monotonic()
+        if now >= self.paused_until:
+            self.rate = max(self.min_rate, self.rate / 2)
+        self.paused_until = max(self.paused_until, now + pause_sec)
+        self.tokens = 0.0
+        self.updated = max(now, self.updated)
+
+    def succeed(self) -> None:
+        """Recover the rate additively (5% of target per success)."""
+        self.rate = min(self.target_rate, self.rate + self.target_rate * 0.05)
+
+
+class CheckpointLog:
+    """
+    Append-only log of completed object IDs, written with group commit.
+
+    IDs are buffered in memory and appended in one write per commit.  Each
+    commit ends with an `@<position>` marker line holding the durable end of
+    the output at that moment (a byte size for the JSON array, or
+    `<shard>:<bytes>` for sharded output) and is fsynced *after* the output,
+    so the checkpoint never runs ahead of the data:
+
+        437133
+        437134
+        @48213
+
+    On load, IDs after the last marker belong to a batch whose commit never
+    completed and are discarded (and trimmed from the file), and the output
+    can be truncated back to the last committed position.  Logs written before
+    markers existed (one ID per line only) load as fully committed.
+    """
+
+    _MARKER_LINE = re.compile(rb"^@[^\n]*\n", re.MULTILINE)
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.pending: List[int] = []
+        self.committed_position: str | None = None
+        self._handle = None
+
+    def load(self) -> Set[int]:
+        """
+        Return the committed IDs and remember the last committed output position.
+
+        The whole log is read in one call and parsed with bytes-level
+        operations, which keeps resume fast for multi-million-ID logs.
+        """
+        if not self.path.exists():
+            return set()
+        data = self.path.read_bytes()
+
+        # A torn final line (no newline) may be a truncated ID; never trust it.
+        if data and not data.endswith(b"\n"):
+            data = data[: data.rfind(b"\n") + 1]
+
+        # rfind() returns -1 when absent, so 0 means "no marker after line 1".
+        last_marker = data.rfind(b"\n@") + 1
+        if last_marker or data.startswith(b"@"):
+            line_end = data.index(b"\n", last_marker)
+            self.committed_position = data[last_marker + 1 : line_end].decode("ascii")
+            data = data[: line_end + 1]
+
+        # Drop the uncommitted tail so later appends start on a clean line.
+        if self.path.stat().st_size > len(data):
+            with self.path.open("r+b") as f:
+                f.truncate(len(data))
+
+        if self.committed_position is not None:
+            data = self._MARKER_LINE.sub(b"", data)
+
+        return set(map(int, data.split()))
+
+    def add(self, object_id: int) -> None:
+        """Buffer *object_id* until the next commit."""
+        self.pending.append(object_id)
+
+    def commit(self, output_position: str) -> None:
+        """
+        Durably append the buffered IDs plus a marker for *output_position*.
+
+        The caller must have fsynced the output up to *output_position* first.
+        """
+        if self._handle is None:
+            self._handle = self.path.open("ab")
+        lines = "".join(f"{object_id}\n" for object_id in self.pending)
+        self._handle.write(f"{lines}@{output_position}\n".encode("ascii"))
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.pending.clear()
+        self.committed_position = output_position
+
+    def close(self) -> None:
+        """Close the log file handle (buffered IDs are *not* committed)."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of object responses keyed by object ID.
+
+    Each row holds the zlib-compressed response body and its ETag /
+    Last-Modified validators, so later fetches can be conditional.  The
+    database runs in WAL mode and is only touched from the scraper's main
+    (event loop) thread; writes are committed alongside the output's group
+    commits.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " object_id INTEGER PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " body BLOB NOT NULL,"
+            " fetched_at TEXT NOT NULL)"
+        )
+
+    def get(self, object_id: int) -> dict | None:
+        """Return the cached entry for *object_id* (validators + raw body), if any."""
+        row = self.conn.execute(
+            "SELECT etag, last_modified, body FROM responses WHERE object_id = ?",
+            (object_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "body": row[2]}
+
+    @staticmethod
+    def decode(entry: dict) -> dict:
+        """Return the JSON object stored in a cache *entry*."""
+        return json.loads(zlib.decompress(entry["body"]))
+
+    def put(self, object_id: int, resp: requests.Response) -> None:
+        """Store *resp*'s body and validators for *object_id*."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (
+                object_id,
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
+                zlib.compress(resp.content),
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+
+    def commit(self) -> None:
+        """Commit pending writes."""
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.conn.commit()
+        self.conn.close()
+
+
+class ShardedNdjsonStore:
+    """
+    Directory of gzip-compressed NDJSON shards described by `manifest.json`.
+
+    Objects are written one JSON document per line to `part-NNNNN.ndjson.gz`.
+    A shard is sealed once it holds `max_shard_bytes` of uncompressed JSON
+    and the next one is started.  Every `sync()` closes the current gzip
+    member, so a shard is a valid multi-member gzip file at every committed
+    position; resuming just truncates the last shard to the checkpointed
+    position and appends a new member to it.
+
+    The manifest lists every shard with its record count and sizes and is
+    replaced atomically on each sync:
+
+        {"format": "ndjson.gz", "complete": true,
+         "shards": [{"file": "part-00000.ndjson.gz", "records": 1200,
+                     "bytes": 4194012, "compressed_bytes": 801233}, ...]}
+    """
+
+    MANIFEST_NAME = "manifest.json"
+    SHARD_NAME = "part-{:05d}.ndjson.gz"
+
+    def __init__(self, directory: pathlib.Path, max_shard_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_shard_bytes = max_shard_bytes
+        self.manifest_path = directory / self.MANIFEST_NAME
+        self.shards: List[dict] = []
+        self._raw = None
+        self._member = None
+
+    @classmethod
+    def read_manifest(cls, directory: pathlib.Path) -> dict:
+        """Return the manifest of the store in *directory*."""
+        with (directory / cls.MANIFEST_NAME).open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def iter_shard(path: pathlib.Path) -> Iterator[dict]:
+        """Stream the objects of one shard without loading it into memory."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def open(self, committed_position: str | None) -> None:
+        """
+        Open the last shard for appending.
+
+        With a *committed_position* (`<shard>:<bytes>`) everything written
+        after it is discarded first: later shards are deleted and the last
+        one is truncated, then its record count is recounted.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.manifest_path.exists():
+            self.shards = self.read_manifest(self.directory)["shards"]
+
+        if committed_position is not None and ":" in committed_position:
+            index, size = map(int, committed_position.split(":"))
+            for shard in self.shards[index + 1 :]:
+                (self.directory / shard["file"]).unlink(missing_ok=True)
+            self.shards = self.shards[: index + 1]
+            while len(self.shards) <= index:
+                self.shards.append(self._new_shard_entry(len(self.shards)))
+            path = self.directory / self.shards[index]["file"]
+            with path.open("ab") as f:
+                f.truncate(size)
+            self._recount(self.shards[index])
+
+        if not self.shards or self.shards[-1]["bytes"] >= self.max_shard_bytes:
+            self._start_shard()
+        else:
+            self._raw = (self.directory / self.shards[-1]["file"]).open("ab")
+
+    def _start_shard(self) -> None:
+        """
+        Add a new, empty shard and open it.
+
+        "wb" discards any stale file of the same name left behind by a run
+        that rotated but crashed before its next commit.
+        """
+        self.shards.append(self._new_shard_entry(len(self.shards)))
+        self._raw = (self.directory / self.shards[-1]["file"]).open("wb")
+
+    def _new_shard_entry(self, index: int) -> dict:
+        """Return an empty manifest entry for shard *index*."""
+        return {"file": self.SHARD_NAME.format(index), "records": 0, "bytes": 0, "compressed_bytes": 0}
+
+    def _recount(self, shard: dict) -> None:
+        """Refresh *shard*'s counters from its file on disk."""
+        path = self.directory / shard["file"]
+        records = uncompressed = 0
+        if path.stat().st_size:
+            with gzip.open(path, "rb") as f:
+                for line in f:
+                    records += 1
+                    uncompressed += len(line)
+        shard.update(records=records, bytes=uncompressed, compressed_bytes=path.stat().st_size)
+
+    def write(self, obj: dict) -> None:
+        """Append *obj* as one line, rotating to a new shard when full."""
+        line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+        current = self.shards[-1]
+        if current["records"] and current["bytes"] + len(line) > self.max_shard_bytes:
+            self._rotate()
+            current = self.shards[-1]
+        if self._member is None:
+            self._member = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        self._member.write(line)
+        current["records"] += 1
+        current["bytes"] += len(line)
+
+    def _rotate(self) -> None:
+        """Seal the current shard and start the next one."""
+        self._close_member()
+        self._raw.close()
+        self._start_shard()
+
+    def _close_member(self) -> None:
+        """Finish the open gzip member and fsync the shard file."""
+        if self._member is not None:
+            self._member.close()
+            self._member = None
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self.shards[-1]["compressed_bytes"] = self._raw.tell()
+
+    def _write_manifest(self, complete: bool) -> None:
+        """Atomically replace the manifest."""
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(
+                {"format": "ndjson.gz", "complete": complete, "shards": self.shards},
+                f,
+                indent=2,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.manifest_path)
+
+    def sync(self, complete: bool = False) -> str:
+        """Make everything written so far durable; return its position."""
+        self._close_member()
+        self._write_manifest(complete)
+        return f"{len(self.shards) - 1}:{self._raw.tell()}"
+
+    def close(self) -> None:
+        """Close the shard file handle."""
+        self._raw.close()
+
+    def merge(self, updates: Dict[int, dict]) -> str:
+        """
+        Replace stored objects with the versions in *updates* (by objectID).
+
+        Only shards that contain an updated ID are rewritten, each to a
+        temporary file swapped in with `os.replace`; IDs not stored yet are
+        appended.  Must be called on an opened store.  Returns the new
+        durable position for the checkpoint.
+        """
+        remaining = dict(updates)
+        self._close_member()
+        for shard in self.shards:
+            path = self.directory / shard["file"]
+            if not path.stat().st_size:
+                continue
+            objects = list(self.iter_shard(path))
+            if not any(obj.get("objectID") in remaining for obj in objects):
+                continue
+            tmp = path.with_suffix(".tmp")
+            with gzip.open(tmp, "wb") as f:
+                for obj in objects:
+                    obj = remaining.pop(obj.get("objectID"), obj)
+                    f.write((json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8"))
+            if shard is self.shards[-1]:
+                self._raw.close()
+            os.replace(tmp, path)
+            if shard is self.shards[-1]:
+                self._raw = path.open("ab")
+            self._recount(shard)
+
+        for obj in remaining.values():
+            self.write(obj)
+        return self.sync(complete=True)
 
 
 class MetScraper:
     """Download Met object records with optional pre-search and restart-safety."""
 
-    OBJECT_URL = (
-        "https://collectionapi.metmuseum.org/public/collection/v1/objects/{}"
-    )
-    SEARCH_URL = (
-        "https://collectionapi.metmuseum.org/public/collection/v1/"
-        "search?isHighlight=true&hasImages=true&q=*"
-        )
+    API_BASE_URL = "https://collectionapi.metmuseum.org/public/collection/v1"
+    OBJECT_PATH = "/objects/{}"
+    SEARCH_PATH = "/search?isHighlight=true&hasImages=true&q=*"
+    CHANGED_PATH = "/objects?metadataDate={}"
+
+    # Retry policy for throttled or failed object requests
+    RETRY_BACKOFF_SEC = 5
+    MAX_BACKOFF_SEC = 120
+    MAX_ATTEMPTS = 4
 
     def __init__(
         self,
         ids_file: str | None = None,
-        out_file: str = "objects.json",
+        out_file: str | None = "objects.json",
         checkpoint_file: str = "processed_ids.log",
         search_first: bool = False,
         search_out_file: str = "search_results.json",
         rate_delay_sec: float = 1.00,
         flush_every: int = 25,
+        concurrency: int = 0,
+        requests_per_minute: float = 80.0,
+        api_base_url: str | None = None,
+        output_format: str = "json",
+        max_shard_bytes: int = 256 * 1024 * 1024,
+        sync_state_file: str | None = None,
+        cache_file: str | None = None,
+        offline: bool = False,
+        sink: Callable[[dict], None] | None = None,
+        sink_flush: Callable[[], None] | None = None,
     ):
         """
         Parameters
@@ -70,8 +549,10 @@ class MetScraper:
         ids_file : str | None
             JSON file containing a list of object IDs.  Ignored if
             `search_first` is True.
-        out_file : str
-            Destination file for the combined JSON array of objects.
+        out_file : str | None
+            Destination file for the combined JSON array of objects, or the
+            shard directory when `output_format` is "ndjson".  None writes
+            no output file (e.g. when streaming into a `sink`).
         checkpoint_file : str
             Log file storing one completed ID per line for restart safety.
         search_first : bool
@@ -81,11 +562,42 @@ class MetScraper:
         rate_delay_sec : float
             Seconds to wait between individual object fetches.
         flush_every : int
-            Flush file handles after this many successful writes.
+            Group-commit (flush + fsync the output, then the checkpoint)
+            after this many successful writes.
+        concurrency : int
+            Maximum number of requests in flight.  0 keeps the sequential
+            mode paced by `rate_delay_sec`; any positive value uses the
+            asyncio fetcher paced by a shared token bucket.
+        requests_per_minute : float
+            Target request rate of the token bucket (concurrent mode only).
+        api_base_url : str | None
+            Override the Met API base URL, e.g. to point at a local stub
+            server in tests.
+        output_format : str
+            "json" for a single JSON array, "ndjson" for compressed shards.
+        max_shard_bytes : int
+            Uncompressed size at which an NDJSON shard is sealed.
+        sync_state_file : str | None
+            JSON file holding the delta-sync watermark.  Enables delta mode;
+            without `ids_file`/`search_first` the scope is the whole
+            collection.
+        cache_file : str | None
+            SQLite response cache; enables conditional requests.
+        offline : bool
+            Serve every object (and the search) from the cache without
+            touching the network.  Requires `cache_file`.
+        sink : Callable[[dict], None] | None
+            Called with every fetched object, e.g. to stream it straight
+            into the database (see `seed_db.py --stream`).  The output file,
+            if any, becomes a tee.
+        sink_flush : Callable[[], None] | None
+            Called before every group commit; must return only once every
+            object passed to `sink` so far is durable, so the checkpoint
+            never runs ahead of the sink either.
         """
         # Paths
         self.ids_path = pathlib.Path(ids_file) if ids_file else None
-        self.out_path = pathlib.Path(out_file)
+        self.out_path = pathlib.Path(out_file) if out_file else None
         self.checkpoint_path = pathlib.Path(checkpoint_file)
         self.search_out_path = pathlib.Path(search_out_file)
 
@@ -93,18 +605,67 @@ class MetScraper:
         self.search_first = search_first
         self.rate_delay_sec = rate_delay_sec
         self.flush_every = flush_every
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        if output_format not in ("json", "ndjson"):
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.output_format = output_format
+        self.max_shard_bytes = max_shard_bytes
+        if offline and not cache_file:
+            raise ValueError("--offline requires --cache.")
+        if offline and sync_state_file:
+            raise ValueError("Delta sync needs the network; drop --offline.")
+        self.offline = offline
+        self.cache = ResponseCache(pathlib.Path(cache_file)) if cache_file else None
+        self.sink = sink
+        self.sink_flush = sink_flush
 
         # Networking
+        base_url = (api_base_url or self.API_BASE_URL).rstrip("/")
+        self.object_url = base_url + self.OBJECT_PATH
+        self.search_url = base_url + self.SEARCH_PATH
+        self.changed_url = base_url + self.CHANGED_PATH
         self.session = requests.Session()
+        if self.concurrency > 0:
+            # One pooled connection per in-flight request.
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=max(10, self.concurrency)
+            )
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+        # Delta sync: fetch changed IDs into a side store, merge afterwards.
+        # Without an output file the sink's upserts replace old versions.
+        self.sync_state_path = pathlib.Path(sync_state_file) if sync_state_file else None
+        self.sync_state = self._load_sync_state()
+        self.delta = bool(self.sync_state.get("watermark"))
+        self.merge_target: pathlib.Path | None = None
+        if self.delta:
+            self.checkpoint_path = self.checkpoint_path.with_name(
+                self.checkpoint_path.name + ".delta"
+            )
+            if self.out_path is not None:
+                self.merge_target = self.out_path
+                self.out_path = self.out_path.with_name(self.out_path.name + ".delta")
 
         # ID lists
         if self.search_first:
             self.all_ids = self._perform_search()
-        else:
-            if not self.ids_path:
-                raise ValueError("Provide --ids-file or use --search-first.")
+        elif self.ids_path:
             self.all_ids = self._load_ids(self.ids_path)
+        elif not self.delta:
+            raise ValueError("Provide --ids-file or use --search-first.")
+        else:
+            self.all_ids = None
 
+        if self.delta:
+            changed = self._fetch_changed_ids(self.sync_state["watermark"])
+            if self.all_ids is not None:
+                scope = set(self.all_ids)
+                changed = [object_id for object_id in changed if object_id in scope]
+            self.all_ids = changed
+
+        self.checkpoint = CheckpointLog(self.checkpoint_path)
         self.done_ids = self._load_checkpoint()
         self.pending = [object_id for object_id in self.all_ids if object_id not in self.done_ids]
         self.bad_ids: List[int] = []
@@ -115,19 +676,119 @@ class MetScraper:
             return list(map(int, json.load(f)))
 
     def _load_checkpoint(self) -> Set[int]:
-        """Load completed IDs from the checkpoint file (may be empty)."""
-        if not self.checkpoint_path.exists():
-            return set()
-        with self.checkpoint_path.open("r", encoding="utf-8") as f:
-            return {int(line.strip()) for line in f if line.strip()}
+        """Load committed IDs from the checkpoint file (may be empty)."""
+        return self.checkpoint.load()
+
+    def _load_sync_state(self) -> dict:
+        """
+        Load the delta-sync state and pin this run's target watermark.
+
+        The target (today's UTC date) is persisted as `pending_watermark`
+        before fetching, so a resumed run keeps the same target.
+        """
+        if self.sync_state_path is None:
+            return {}
+        state = {}
+        if self.sync_state_path.exists():
+            with self.sync_state_path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+        if not state.get("pending_watermark"):
+            state["pending_watermark"] = datetime.now(timezone.utc).date().isoformat()
+            self._write_sync_state(state)
+        return state
+
+    def _write_sync_state(self, state: dict) -> None:
+        """Atomically replace the sync-state file."""
+        tmp = self.sync_state_path.with_name(self.sync_state_path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.sync_state_path)
+
+    def _fetch_changed_ids(self, since: str) -> List[int]:
+        """Return the IDs whose `metadataDate` is after *since* (YYYY-MM-DD)."""
+        url = self.changed_url.format(since)
+        logging.info(f"Fetching IDs changed since {since}: {url}…")
+        resp = self.session.get(url, timeout=60)
+        resp.raise_for_status()
+        ids = resp.json().get("objectIDs") or []
+        logging.info(f"{len(ids)} IDs changed since {since}")
+        return list(map(int, ids))
+
+    def _merge_delta(self) -> None:
+        """
+        Merge the fetched delta into `merge_target`, replacing older versions.
+
+        The target's checkpoint gets the merged IDs and the new durable
+        position, then the delta output and its checkpoint are removed.
+        """
+        base_checkpoint_path = self.checkpoint_path.with_name(
+            self.checkpoint_path.name[: -len(".delta")]
+        )
+        base_checkpoint = CheckpointLog(base_checkpoint_path)
+        base_done = base_checkpoint.load()
+
+        if self.output_format == "ndjson":
+            updates = {}
+            if self.out_path.exists():
+                for shard in ShardedNdjsonStore.read_manifest(self.out_path)["shards"]:
+                    for obj in ShardedNdjsonStore.iter_shard(self.out_path / shard["file"]):
+                        updates[obj["objectID"]] = obj
+            store = ShardedNdjsonStore(self.merge_target, self.max_shard_bytes)
+            store.open(base_checkpoint.committed_position)
+            position = store.merge(updates)
+            store.close()
+        else:
+            updates = {}
+            if self.out_path.exists():
+                with self.out_path.open("r", encoding="utf-8") as f:
+                    updates = {obj["objectID"]: obj for obj in json.load(f)}
+            objects = []
+            if self.merge_target.exists():
+                with self.merge_target.open("r", encoding="utf-8") as f:
+                    objects = json.load(f)
+            remaining = dict(updates)
+            merged = [remaining.pop(obj.get("objectID"), obj) for obj in objects]
+            merged.extend(remaining.values())
+            tmp = self.merge_target.with_name(self.merge_target.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                f.write("[\n")
+                f.write(",\n".join(json.dumps(obj, ensure_ascii=False) for obj in merged))
+                f.write("\n]\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.merge_target)
+            position = str(self.merge_target.stat().st_size)
+
+        for object_id in updates:
+            if object_id not in base_done:
+                base_checkpoint.add(object_id)
+        base_checkpoint.commit(position)
+        base_checkpoint.close()
+        logging.info(f"Merged {len(updates)} changed objects into {self.merge_target}")
+
+        if self.out_path.is_dir():
+            for path in self.out_path.iterdir():
+                path.unlink()
+            self.out_path.rmdir()
+        else:
+            self.out_path.unlink(missing_ok=True)
+        self.checkpoint_path.unlink(missing_ok=True)
 
     def _perform_search(self) -> List[int]:
         """
         Execute the Met object search, save raw JSON,
         and return the list of object IDs.
+
+        Offline, the previously saved search response is reused instead.
         """
-        logging.info(f"Fetching object IDs from search: {self.SEARCH_URL}…")
-        resp = self.session.get(self.SEARCH_URL, timeout=60)
+        if self.offline:
+            with self.search_out_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            logging.info(f"Offline: using saved search response {self.search_out_path}")
+            return list(map(int, data.get("objectIDs") or []))
+
+        logging.info(f"Fetching object IDs from search: {self.search_url}…")
+        resp = self.session.get(self.search_url, timeout=60)
         resp.raise_for_status()
         data = resp.json()
 
@@ -142,16 +803,29 @@ class MetScraper:
 
     def _prepare_output(self) -> Tuple[object, bool]:
         """
-        Open the JSON array file for appending.
+        Open the JSON array file (or the NDJSON shard store) for appending.
+
+        Anything written after the last checkpoint commit (objects whose IDs
+        were never checkpointed, or a torn write) is truncated first, so
+        resumed runs neither duplicate nor corrupt records.
 
         Returns
         -------
-        handle : io.TextIOBase
-            File handle open for append.
+        handle : io.TextIOBase | ShardedNdjsonStore
+            File handle open for append, or the opened shard store.
         first_item_flag : bool
             True if the array is empty and the next write will be the first
-            element (no leading comma needed).
+            element (no leading comma needed).  Always False for shards.
+            Both are (None, False) when there is no output file.
         """
+        if self.out_path is None:
+            return None, False
+
+        if self.output_format == "ndjson":
+            store = ShardedNdjsonStore(self.out_path, self.max_shard_bytes)
+            store.open(self.checkpoint.committed_position)
+            return store, False
+
         if not self.out_path.exists() or self.out_path.stat().st_size == 0:
             handle = self.out_path.open("w", encoding="utf-8")
             handle.write("[\n")
@@ -159,6 +833,9 @@ class MetScraper:
 
         # Strip closing bracket and any trailing comma/whitespace.
         with self.out_path.open("rb+") as f:
+            committed = self.checkpoint.committed_position
+            if committed is not None and committed.isdigit() and int(committed) < self.out_path.stat().st_size:
+                f.truncate(int(committed))
             f.seek(0, os.SEEK_END)
             end = f.tell()
             # Trim whitespace
@@ -181,50 +858,136 @@ class MetScraper:
                 last = f.read(1)
             if last == b",":
                 f.truncate(end)
+            # Only the opening bracket left: the next write is the first item.
+            empty = last == b"["
+            if empty:
+                f.truncate(end + 1)
 
         handle = self.out_path.open("a", encoding="utf-8")
-        return handle, False
+        return handle, empty
+
+    def _sync_output(self, handle, complete: bool = False) -> str:
+        """Flush and fsync *handle*; return the durable position of the output."""
+        if handle is None:
+            return "none"
+        if self.output_format == "ndjson":
+            return handle.sync(complete)
+        handle.flush()
+        os.fsync(handle.fileno())
+        return str(os.fstat(handle.fileno()).st_size)
+
+    def _commit(self, handle) -> None:
+        """Group commit: make the sink and output durable, then checkpoint their IDs."""
+        if self.sink_flush is not None:
+            self.sink_flush()
+        self.checkpoint.commit(self._sync_output(handle))
+        if self.cache is not None:
+            self.cache.commit()
 
     def _finalize_output(self, handle) -> None:
-        """Write the closing bracket for the JSON array and close *handle*."""
-        handle.write("\n]\n")
-        handle.close()
+        """Write the closing bracket, commit outstanding IDs, and close files."""
+        if handle is None:
+            self._commit(handle)
+        elif self.output_format == "ndjson":
+            if self.sink_flush is not None:
+                self.sink_flush()
+            self.checkpoint.commit(self._sync_output(handle, complete=True))
+            handle.close()
+        else:
+            handle.write("\n]\n")
+            self._commit(handle)
+            handle.close()
+        self.checkpoint.close()
+        if self.cache is not None:
+            self.cache.close()
 
     def _append_json(self, handle, obj: dict, first_item: bool) -> None:
         """
-        Append *obj* to the open JSON array file.
+        Append *obj* to the open JSON array file (or shard store).
 
         A leading comma is written unless *first_item* is True.
         """
+        if self.output_format == "ndjson":
+            handle.write(obj)
+            return
         if not first_item:
             handle.write(",\n")
         json.dump(obj, handle, ensure_ascii=False)
 
+    def _record(self, handle, object_id: int, obj: dict, first_item: bool) -> None:
+        """Write a fetched object and queue *object_id* for the next group commit."""
+        if self.sink is not None:
+            self.sink(obj)
+        if handle is not None:
+            self._append_json(handle, obj, first_item)
+        self.checkpoint.add(object_id)
+        if len(self.checkpoint.pending) >= self.flush_every:
+            self._commit(handle)
+
+    def _from_cache(self, object_id: int) -> dict | None:
+        """Offline mode: return the cached object, or record a failure."""
+        entry = self.cache.get(object_id)
+        if entry is None:
+            logging.warning(f"ID {object_id} → not in cache (offline)")
+            self.bad_ids.append(object_id)
+            return None
+        return self.cache.decode(entry)
+
+    def _conditional_headers(self, object_id: int) -> Tuple[dict | None, dict]:
+        """Return the cache entry for *object_id* and matching revalidation headers."""
+        if self.cache is None:
+            return None, {}
+        entry = self.cache.get(object_id)
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return entry, headers
+
+    def _response_object(self, object_id: int, resp: requests.Response, entry: dict | None) -> dict:
+        """Return the object for a 200 (caching it) or a 304 (from the cache)."""
+        if resp.status_code == 304 and entry is not None:
+            return self.cache.decode(entry)
+        if self.cache is not None:
+            self.cache.put(object_id, resp)
+        return resp.json()
+
     def _process_id(self, object_id: int, handle, first_item_flag: bool) -> bool:
         """
         Fetch a single object ID.
 
         Backoff logic:
-            - start with 5-second wait if were throttled
-            - cap the sleep at 2 minutes
-            - 1 initial try + up to {max_attempts} retries
+            - start with a `RETRY_BACKOFF_SEC` wait if we were throttled
+            - cap the sleep at `MAX_BACKOFF_SEC`
+            - `MAX_ATTEMPTS` tries in total
         Returns
         -------
         success : bool
             True if the object was fetched and written; False after all attempts fail.
         """
-        backoff = 5
-        max_backoff = 120
-        max_attempts = 4
+        if self.offline:
+            obj = self._from_cache(object_id)
+            if obj is None:
+                return False
+            self._record(handle, object_id, obj, first_item_flag)
+            return True
+
+        backoff = self.RETRY_BACKOFF_SEC
+        max_backoff = self.MAX_BACKOFF_SEC
+        max_attempts = self.MAX_ATTEMPTS
+        entry, headers = self._conditional_headers(object_id)
 
         for attempt in range(max_attempts):
             try:
-                resp = self.session.get(self.OBJECT_URL.format(object_id), timeout=20)
+                resp = self.session.get(
+                    self.object_url.format(object_id), headers=headers, timeout=20
+                )
 
-                if resp.status_code == 200:
-                    self._append_json(handle, resp.json(), first_item_flag)
-                    with self.checkpoint_path.open("a", encoding="utf-8") as log:
-                        log.write(f"{object_id}\n")
+                if resp.status_code == 200 or (resp.status_code == 304 and entry):
+                    obj = self._response_object(object_id, resp, entry)
+                    self._record(handle, object_id, obj, first_item_flag)
                     return True
 
                 if resp.status_code in (403, 429):
@@ -252,6 +1015,118 @@ class MetScraper:
         self.bad_ids.append(object_id)
         return False
 
+    def _run_sequential(self, handle, first_item: bool) -> None:
+        """Fetch every pending ID one at a time, sleeping `rate_delay_sec` between calls."""
+        for i, object_id in enumerate(self.pending, 1):
+            success = self._process_id(object_id, handle, first_item)
+            if success and first_item:
+                first_item = False
+
+            if i % self.flush_every == 0:
+                logging.info(
+                    "Progress: %d / %d (%.1f%%)",
+                    i,
+                    len(self.pending),
+                    100 * i / len(self.pending),
+                )
+            if not self.offline:
+                time.sleep(self.rate_delay_sec)
+
+    async def _fetch_id_async(self, object_id: int, limiter: TokenBucket) -> dict | None:
+        """
+        Fetch a single object ID through the shared *limiter*.
+
+        Same retry budget as `_process_id`, but a 403/429 throttles the
+        limiter (pausing every worker) rather than sleeping locally.  Network
+        errors still back off only the affected request.
+
+        Returns
+        -------
+        obj : dict | None
+            The object record, or None after all attempts fail.
+        """
+        if self.offline:
+            return self._from_cache(object_id)
+
+        backoff = self.RETRY_BACKOFF_SEC
+        max_backoff = self.MAX_BACKOFF_SEC
+        max_attempts = self.MAX_ATTEMPTS
+        url = self.object_url.format(object_id)
+        entry, headers = self._conditional_headers(object_id)
+
+        for attempt in range(max_attempts):
+            await limiter.acquire()
+            try:
+                resp = await asyncio.to_thread(
+                    self.session.get, url, headers=headers, timeout=20
+                )
+            except requests.RequestException as exc:
+                logging.warning(
+                    f"ID {object_id} → {exc} "
+                    f"(attempt {attempt + 1}/{max_attempts}) – backing off {backoff} s"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, max_backoff)
+                continue
+
+            if resp.status_code == 200 or (resp.status_code == 304 and entry):
+                limiter.succeed()
+                return self._response_object(object_id, resp, entry)
+
+            if resp.status_code in (403, 429):
+                logging.warning(
+                    f"ID {object_id} → HTTP {resp.status_code} "
+                    f"(attempt {attempt + 1}/{max_attempts}) – pausing all requests {backoff} s"
+                )
+                limiter.throttle(backoff)
+                backoff = min(backoff * 2, max_backoff)
+                continue
+
+            logging.warning(f"ID {object_id} → HTTP {resp.status_code} (no retry)")
+            break
+
+        self.bad_ids.append(object_id)
+        return None
+
+    async def _run_async(self, handle, first_item: bool) -> None:
+        """
+        Fetch every pending ID with `concurrency` workers sharing one limiter.
+
+        Workers pull IDs from a shared iterator, so memory stays flat for
+        large ID lists.  Writes happen on the event loop thread only, so
+        the output and checkpoint need no locking.
+        """
+        limiter = TokenBucket(self.requests_per_minute / 60)
+        pending = iter(self.pending)
+        total = len(self.pending)
+        state = {"first_item": first_item, "done": 0}
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        loop.set_default_executor(executor)
+
+        async def worker() -> None:
+            for object_id in pending:
+                obj = await self._fetch_id_async(object_id, limiter)
+                if obj is not None:
+                    self._record(handle, object_id, obj, state["first_item"])
+                    state["first_item"] = False
+
+                state["done"] += 1
+                if state["done"] % self.flush_every == 0:
+                    logging.info(
+                        "Progress: %d / %d (%.1f%%) | rate %.1f req/min",
+                        state["done"],
+                        total,
+                        100 * state["done"] / total,
+                        limiter.rate * 60,
+                    )
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            executor.shutdown(wait=True)
+
     def run(self) -> None:
         """Download every pending object and write it to the output JSON."""
         logging.info(
@@ -261,23 +1136,15 @@ class MetScraper:
             )
 
         handle, first_item = self._prepare_output()
+        # Record the (possibly truncated) starting size as the first commit.
+        self._commit(handle)
         start = time.perf_counter()
 
         try:
-            for i, object_id in enumerate(self.pending, 1):
-                success = self._process_id(object_id, handle, first_item)
-                if success and first_item:
-                    first_item = False
-
-                if i % self.flush_every == 0:
-                    handle.flush()
-                    logging.info(
-                        "Progress: %d / %d (%.1f%%)",
-                        i,
-                        len(self.pending),
-                        100 * i / len(self.pending),
-                    )
-                time.sleep(self.rate_delay_sec)
+            if self.concurrency > 0:
+                asyncio.run(self._run_async(handle, first_item))
+            else:
+                self._run_sequential(handle, first_item)
         finally:
             self._finalize_output(handle)
 
@@ -293,6 +1160,19 @@ class MetScraper:
                 json.dump(self.bad_ids, f, indent=2)
             logging.info("Wrote failed IDs to failed_ids.json")
 
+        if self.sync_state_path is not None:
+            if self.merge_target is not None:
+                self._merge_delta()
+            elif self.delta:
+                self.checkpoint_path.unlink(missing_ok=True)
+            if self.bad_ids:
+                # Keep the old watermark so the failures are retried next run.
+                logging.warning("Watermark not advanced: some changed IDs failed")
+            else:
+                self.sync_state["watermark"] = self.sync_state.pop("pending_watermark")
+                self._write_sync_state(self.sync_state)
+                logging.info(f"Sync watermark advanced to {self.sync_state['watermark']}")
+
 def _parse_args(argv=None):
     """Return parsed command-line arguments."""
     p = argparse.ArgumentParser(
@@ -309,7 +1189,23 @@ def _parse_args(argv=None):
         default="search_results.json",
         help="Destination for raw search JSON (search-first only)",
     )
-    p.add_argument("--out", default="objects.json", help="Output JSON array")
+    p.add_argument(
+        "--out",
+        default="objects.json",
+        help="Output JSON array (or shard directory with --format ndjson)",
+    )
+    p.add_argument(
+        "--format",
+        default="json",
+        choices=("json", "ndjson"),
+        help="Single JSON array or gzip-compressed NDJSON shards",
+    )
+    p.add_argument(
+        "--shard-max-bytes",
+        default=256 * 1024 * 1024,
+        type=int,
+        help="Uncompressed bytes per NDJSON shard before rotating",
+    )
     p.add_argument(
         "--checkpoint",
         default="processed_ids.log",
@@ -325,7 +1221,39 @@ def _parse_args(argv=None):
         "--flush-every",
         default=25,
         type=int,
-        help="Flush files to disk after this many writes",
+        help="Fsync output and checkpoint together after this many writes",
+    )
+    p.add_argument(
+        "--concurrency",
+        default=0,
+        type=int,
+        help="Max requests in flight (0 = sequential mode paced by --rate-delay)",
+    )
+    p.add_argument(
+        "--rate-limit",
+        default=80.0,
+        type=float,
+        help="Requests/minute enforced by the token bucket in concurrent mode",
+    )
+    p.add_argument(
+        "--api-base-url",
+        default=None,
+        help="Override the Met API base URL (e.g. a local stub server)",
+    )
+    p.add_argument(
+        "--sync-state",
+        default=None,
+        help="Delta-sync watermark file; refetch only IDs changed since the last sync",
+    )
+    p.add_argument(
+        "--cache",
+        default=None,
+        help="SQLite response cache for conditional requests (ETag/Last-Modified)",
+    )
+    p.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve objects and the search only from --cache, no network",
     )
     return p.parse_args(argv)
 
@@ -341,6 +1269,14 @@ def main() -> None:
         search_out_file=args.search_out,
         rate_delay_sec=args.rate_delay,
         flush_every=args.flush_every,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rate_limit,
+        api_base_url=args.api_base_url,
+        output_format=args.format,
+        max_shard_bytes=args.shard_max_bytes,
+        sync_state_file=args.sync_state,
+        cache_file=args.cache,
+        offline=args.offline,
     )
     scraper.run()
 
@@ -0,0 +1,395 @@
+import asyncio
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from data_contract_components.data_assets.db_migrations.raw_data.get_data_subset_from_met_api import (
+    CheckpointLog,
+    MetScraper,
+    ShardedNdjsonStore,
+    TokenBucket,
+)
+
+# Pause after a 403/429 in the tests, instead of the production 5 seconds
+PAUSE_SEC = 0.5
+# Requests already sent when the throttling response arrives may still land after it
+IN_FLIGHT_SLACK_SEC = 0.05
+
+
+class StubMetApi:
+    """
+    Local stand-in for the Met collection API, served from a background thread.
+
+    `statuses` maps an object ID to the status codes of its first requests, e.g.
+    {3: [429]} throttles the first request for object 3 only; every other request
+    gets a 200 with the object, titled from `titles` if present. Every object
+    request is logged as (time.monotonic() on arrival, object_id, status).
+
+    Objects carry an ETag derived from their content and a fixed Last-Modified;
+    a request whose If-None-Match still matches gets a bodyless 304 instead. The
+    validators each object request sent are logged in `validators` as
+    (object_id, If-None-Match, If-Modified-Since).
+
+    The objects listing (`/objects?metadataDate=...`) returns `changed_ids` and
+    logs the requested date in `changed_since`.
+    """
+
+    LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def __init__(self):
+        self.statuses = {}
+        self.titles = {}
+        self.changed_ids = []
+        self.changed_since = []
+        self.requests = []
+        self.validators = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.respond(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_object(self, object_id):
+        return {"objectID": object_id, "title": self.titles.get(object_id, f"Object {object_id}")}
+
+    def etag(self, object_id):
+        return '"%08x"' % zlib.crc32(json.dumps(self.get_object(object_id)).encode("utf-8"))
+
+    def respond(self, request):
+        url = urlsplit(request.path)
+        if url.path == "/objects":
+            self.changed_since.append(parse_qs(url.query)["metadataDate"][0])
+            self.send_json(request, 200, {"total": len(self.changed_ids), "objectIDs": self.changed_ids})
+            return
+        object_id = int(url.path.rsplit("/", 1)[1])
+        etag = self.etag(object_id)
+        if_none_match = request.headers.get("If-None-Match")
+        with self._lock:
+            statuses = self.statuses.get(object_id) or []
+            status = statuses.pop(0) if statuses else 200
+            if status == 200 and if_none_match == etag:
+                status = 304
+            self.requests.append((time.monotonic(), object_id, status))
+            self.validators.append((object_id, if_none_match, request.headers.get("If-Modified-Since")))
+        if status == 304:
+            request.send_response(304)
+            request.send_header("ETag", etag)
+            request.end_headers()
+            return
+        if status == 200:
+            self.send_json(request, 200, self.get_object(object_id), {"ETag": etag, "Last-Modified": self.LAST_MODIFIED})
+        else:
+            self.send_json(request, status, {"message": f"HTTP {status}"})
+
+    @staticmethod
+    def send_json(request, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        request.send_response(status)
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+
+class ScraperTestCase(unittest.TestCase):
+    """Runs MetScraper in a temporary directory against a StubMetApi."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = pathlib.Path(tmp.name)
+        self.out_path = self.directory / "objects.json"
+        self.checkpoint_path = self.directory / "processed_ids.log"
+
+    def make_scraper(self, stub, object_ids, **kwargs):
+        ids_path = self.directory / "ids.json"
+        ids_path.write_text(json.dumps(list(object_ids)))
+        settings = {
+            "ids_file": str(ids_path),
+            "out_file": str(self.out_path),
+            "checkpoint_file": str(self.checkpoint_path),
+            "flush_every": 5,
+            "concurrency": 4,
+            "requests_per_minute": 1200,
+            "api_base_url": stub.base_url,
+            **kwargs,
+        }
+        scraper = MetScraper(**settings)
+        scraper.RETRY_BACKOFF_SEC = PAUSE_SEC
+        return scraper
+
+    def read_object_ids(self):
+        return sorted(obj["objectID"] for obj in json.loads(self.out_path.read_text()))
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_pause_halves_rate_once_and_recovers(self):
+        bucket = TokenBucket(rate=20.0)
+
+        async def acquire_all(count):
+            start = time.monotonic()
+            acquired = []
+
+            async def requester():
+                await bucket.acquire()
+                acquired.append(time.monotonic() - start)
+
+            await asyncio.gather(*(requester() for _ in range(count)))
+            return acquired
+
+        bucket.throttle(0.3)
+        bucket.throttle(0.3)  # throttled again inside the same pause window
+        self.assertEqual(bucket.rate, 10.0)
+
+        acquired = asyncio.run(acquire_all(3))
+        self.assertGreaterEqual(min(acquired), 0.3 - 0.01, "a requester went ahead during the pause")
+        self.assertGreaterEqual(acquired[-1] - acquired[0], 2 / 10.0 - 0.01, "not paced at the halved rate")
+
+        for _ in range(9):
+            bucket.succeed()
+        self.assertLess(bucket.rate, 20.0)
+        bucket.succeed()
+        self.assertEqual(bucket.rate, 20.0)
+        bucket.succeed()
+        self.assertEqual(bucket.rate, 20.0)
+
+
+class TestConcurrentFetch(ScraperTestCase):
+
+    def test_throttling_pauses_every_worker(self):
+        with StubMetApi() as stub:
+            stub.statuses = {3: [429], 8: [403]}
+            with self.assertLogs(level="WARNING"):
+                self.make_scraper(stub, range(1, 21)).run()
+
+        self.assertEqual(self.read_object_ids(), list(range(1, 21)))
+        throttled = [(at, status) for at, _, status in stub.requests if status in (403, 429)]
+        self.assertEqual([status for _, status in throttled], [429, 403])
+        for throttled_at, status in throttled:
+            sent_while_paused = [
+                object_id for at, object_id, _ in stub.requests
+                if throttled_at + IN_FLIGHT_SLACK_SEC < at < throttled_at + PAUSE_SEC - IN_FLIGHT_SLACK_SEC
+            ]
+            self.assertEqual(sent_while_paused, [], f"requests sent during the pause after HTTP {status}")
+        # Both throttled objects were retried once the pause was over
+        self.assertEqual(sorted(object_id for _, object_id, _ in stub.requests), sorted([*range(1, 21), 3, 8]))
+
+    def test_resume_skips_committed_ids(self):
+        with StubMetApi() as stub:
+            self.make_scraper(stub, range(1, 11)).run()
+            # A crash between appending IDs and their commit marker leaves them uncommitted
+            with self.checkpoint_path.open("a") as f:
+                f.write("11\n12\n")
+            first_run_requests = len(stub.requests)
+
+            self.make_scraper(stub, range(1, 16)).run()
+            refetched = [object_id for _, object_id, _ in stub.requests[first_run_requests:]]
+
+        self.assertEqual(sorted(refetched), list(range(11, 16)))
+        self.assertEqual(self.read_object_ids(), list(range(1, 16)))
+        self.assertEqual(CheckpointLog(self.checkpoint_path).load(), set(range(1, 16)))
+
+
+class TestDeltaSync(ScraperTestCase):
+    """Delta sync of sharded NDJSON output, three objects per shard."""
+
+    OLD_WATERMARK = "2024-01-01"
+
+    def setUp(self):
+        super().setUp()
+        self.store_path = self.directory / "objects"
+        self.sync_state_path = self.directory / "sync_state.json"
+        # A run that fails an ID writes failed_ids.json to the working directory
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+
+    def sync(self, stub):
+        self.make_scraper(
+            stub,
+            range(1, 13),
+            out_file=str(self.store_path),
+            output_format="ndjson",
+            max_shard_bytes=130,
+            sync_state_file=str(self.sync_state_path),
+        ).run()
+
+    def full_sync(self, stub):
+        """Fetch the whole scope, then move the watermark back so later runs are deltas."""
+        self.sync(stub)
+        self.sync_state_path.write_text(json.dumps({"watermark": self.OLD_WATERMARK}))
+
+    def read_store(self):
+        """Return {shard file: [objects]} in shard order."""
+        manifest = ShardedNdjsonStore.read_manifest(self.store_path)
+        return {
+            shard["file"]: list(ShardedNdjsonStore.iter_shard(self.store_path / shard["file"]))
+            for shard in manifest["shards"]
+        }
+
+    def read_sync_state(self):
+        return json.loads(self.sync_state_path.read_text())
+
+    def test_changed_ids_replace_records_in_affected_shards_only(self):
+        with StubMetApi() as stub:
+            self.full_sync(stub)
+            before = self.read_store()
+            self.assertEqual(
+                [[obj["objectID"] for obj in objects] for objects in before.values()],
+                [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10, 11, 12]],
+            )
+            inodes = {name: (self.store_path / name).stat().st_ino for name in before}
+            first_run_requests = len(stub.requests)
+
+            stub.changed_ids = [2, 3, 99]  # 99 is outside the scope of the ID file
+            stub.titles = {2: "Object 2 (revised)", 3: "Object 3 (revised)"}
+            self.sync(stub)
+            refetched = sorted(object_id for _, object_id, _ in stub.requests[first_run_requests:])
+
+        after = self.read_store()
+        self.assertEqual(stub.changed_since, [self.OLD_WATERMARK])
+        self.assertEqual(refetched, [2, 3])
+        self.assertEqual(
+            [obj["title"] for obj in after["part-00000.ndjson.gz"]],
+            ["Object 1", "Object 2 (revised)", "Object 3 (revised)"],
+        )
+        # Shards without a changed ID keep their content and their file
+        for name in ("part-00001.ndjson.gz", "part-00002.ndjson.gz", "part-00003.ndjson.gz"):
+            self.assertEqual(after[name], before[name])
+            self.assertEqual((self.store_path / name).stat().st_ino, inodes[name], f"{name} was rewritten")
+        self.assertNotEqual((self.store_path / "part-00000.ndjson.gz").stat().st_ino, inodes["part-00000.ndjson.gz"])
+        self.assertFalse((self.directory / "objects.delta").exists())
+        self.assertEqual(self.read_sync_state(), {"watermark": datetime.now(timezone.utc).date().isoformat()})
+
+    def test_watermark_holds_when_a_changed_id_fails(self):
+        with StubMetApi() as stub:
+            self.full_sync(stub)
+            stub.changed_ids = [5, 9]
+            stub.titles = {5: "Object 5 (revised)", 9: "Object 9 (revised)"}
+            stub.statuses = {9: [404]}
+            with self.assertLogs(level="WARNING"):
+                self.sync(stub)
+
+            state = self.read_sync_state()
+            self.assertEqual(state["watermark"], self.OLD_WATERMARK)
+            self.assertIn("pending_watermark", state)
+            self.assertEqual(json.loads((self.directory / "failed_ids.json").read_text()), [9])
+            titles = {obj["objectID"]: obj["title"] for objects in self.read_store().values() for obj in objects}
+            self.assertEqual((titles[5], titles[9]), ("Object 5 (revised)", "Object 9"))
+
+            # The next run asks for the same window again and picks up the failed ID
+            self.sync(stub)
+
+        self.assertEqual(stub.changed_since, [self.OLD_WATERMARK, self.OLD_WATERMARK])
+        self.assertEqual(self.read_sync_state(), {"watermark": state["pending_watermark"]})
+        titles = {obj["objectID"]: obj["title"] for objects in self.read_store().values() for obj in objects}
+        self.assertEqual(titles[9], "Object 9 (revised)")
+        self.assertEqual(sorted(titles), list(range(1, 13)))
+
+
+class TestResponseCache(ScraperTestCase):
+    """Conditional requests and offline runs against the SQLite response cache."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache_path = self.directory / "response_cache.sqlite"
+        # A run that fails an ID writes failed_ids.json to the working directory
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+
+    def fetch(self, stub, object_ids, **kwargs):
+        """Fetch *object_ids* from scratch (no checkpoint, no output) through the cache."""
+        self.checkpoint_path.unlink(missing_ok=True)
+        self.out_path.unlink(missing_ok=True)
+        scraper = self.make_scraper(stub, object_ids, cache_file=str(self.cache_path), **kwargs)
+        scraper.run()
+        return scraper
+
+    def read_objects(self):
+        return sorted(json.loads(self.out_path.read_text()), key=lambda obj: obj["objectID"])
+
+    def test_second_run_revalidates_and_reuses_cached_bodies(self):
+        for concurrency in (0, 4):
+            with self.subTest(concurrency=concurrency), StubMetApi() as stub:
+                self.cache_path.unlink(missing_ok=True)
+                self.fetch(stub, range(1, 6), concurrency=concurrency, rate_delay_sec=0)
+                first_run = self.read_objects()
+                self.assertEqual(stub.validators, [(object_id, None, None) for object_id in range(1, 6)])
+                etags = {object_id: stub.etag(object_id) for object_id in range(1, 6)}
+                stub.requests.clear()
+                stub.validators.clear()
+
+                stub.titles = {4: "Object 4 (revised)"}
+                self.fetch(stub, range(1, 6), concurrency=concurrency, rate_delay_sec=0)
+
+                self.assertEqual(
+                    sorted(stub.validators),
+                    [(object_id, etags[object_id], StubMetApi.LAST_MODIFIED) for object_id in range(1, 6)],
+                )
+                statuses = {object_id: status for _, object_id, status in stub.requests}
+                self.assertEqual(statuses, {1: 304, 2: 304, 3: 304, 4: 200, 5: 304})
+                # The 304s carried no body: those objects come from the cache
+                expected = [obj if obj["objectID"] != 4 else stub.get_object(4) for obj in first_run]
+                self.assertEqual(self.read_objects(), expected)
+
+    def test_offline_run_needs_no_network(self):
+        with StubMetApi() as stub:
+            stub.titles = {2: "Object 2 (cached)"}
+            self.fetch(stub, range(1, 6))
+            online = self.read_objects()
+            request_count = len(stub.requests)
+
+        # The stub is shut down: any request would fail
+        scraper = self.fetch(stub, range(1, 6), offline=True)
+        self.assertEqual(self.read_objects(), online)
+        self.assertEqual(scraper.bad_ids, [])
+        self.assertEqual(len(stub.requests), request_count)
+
+    def test_offline_id_missing_from_cache_fails(self):
+        with StubMetApi() as stub:
+            self.fetch(stub, range(1, 4))
+
+        with self.assertLogs(level="WARNING") as logs:
+            scraper = self.fetch(stub, [1, 2, 99, 3], offline=True)
+        self.assertEqual(scraper.bad_ids, [99])
+        self.assertIn("ID 99 → not in cache (offline)", "\n".join(logs.output))
+        self.assertEqual([obj["objectID"] for obj in self.read_objects()], [1, 2, 3])
+        self.assertEqual(json.loads((self.directory / "failed_ids.json").read_text()), [99])
+
+    def test_offline_requires_cache_file(self):
+        ids_path = self.directory / "ids.json"
+        ids_path.write_text(json.dumps([1]))
+        with self.assertRaisesRegex(ValueError, "--offline requires --cache"):
+            MetScraper(ids_file=str(ids_path), out_file=str(self.out_path), offline=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""add validation watermarks
+
+Revision ID: 21373e6c9155
+Revises: 00e9b3375a5f
+Create Date: 2026-10-19 09:12:31.482017+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '21373e6c9155'
+down_revision: Union[str, Sequence[str], None] = '00e9b3375a5f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bookkeeping lives in its own schema so it never shows up in the public
+# data catalog that the contracts are checked against.
+data_contract_schema: str = "data_contract"
+
+seed_tables: list[str] = [
+    "object",
+    "object_history",
+    "object_physical_properties",
+    "object_gallery_info",
+    "object_tags",
+    "object_images",
+    "object_copyright",
+    "object_api_metadata",
+]
+
+
+def upgrade() -> None:
+    op.execute(f"CREATE SCHEMA IF NOT EXISTS {data_contract_schema}")
+
+    op.create_table(
+        "validation_watermark",
+        sa.Column(
+            "table_schema",
+            sa.Text,
+            primary_key=True,
+            comment="Schema of the validated table"
+        ),
+        sa.Column(
+            "table_name",
+            sa.Text,
+            primary_key=True,
+            comment="Name of the validated table"
+        ),
+        sa.Column(
+            "watermark",
+            sa.DateTime,
+            comment="Highest created_at validated without violations"
+        ),
+        sa.Column(
+            "last_full_sweep_at",
+            sa.DateTime,
+            comment="When the whole table was last validated"
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime,
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            comment="Timestamp when this watermark was last written"
+        ),
+        schema=data_contract_schema,
+    )
+
+    # A btree on created_at serves the "created_at > watermark" range of
+    # incremental validation, and also the max(created_at) of the freshness
+    # checks with one backward index step, which a BRIN index cannot answer
+    # without visiting the table.
+    for table_name in seed_tables:
+        op.create_index(f"ix_{table_name}_created_at", table_name, ["created_at"])
+
+
+def downgrade() -> None:
+    for table_name in seed_tables:
+        op.drop_index(f"ix_{table_name}_created_at", table_name=table_name)
+
+    op.drop_table("validation_watermark", schema=data_contract_schema)
+    op.execute(f"DROP SCHEMA IF EXISTS {data_contract_schema}")
@@ -0,0 +1,87 @@
+"""add storage history
+
+Revision ID: 3ec6df8eb892
+Revises: 63d1df6e7b1f
+Create Date: 2026-10-19 02:01:53.354765+00:00
+
+Keeps one row per contracted table and storage check, so the storage
+detector can report how much a table grew since the previous run.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3ec6df8eb892'
+down_revision: Union[str, Sequence[str], None] = '63d1df6e7b1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+data_contract_schema: str = "data_contract"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "storage_history",
+        sa.Column(
+            "table_schema",
+            sa.Text,
+            primary_key=True,
+            comment="Schema of the measured table"
+        ),
+        sa.Column(
+            "table_name",
+            sa.Text,
+            primary_key=True,
+            comment="Name of the measured table"
+        ),
+        sa.Column(
+            "measured_at",
+            sa.DateTime,
+            primary_key=True,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            comment="Timestamp of the storage check"
+        ),
+        sa.Column(
+            "table_bytes",
+            sa.BigInteger,
+            nullable=False,
+            comment="Main fork size, summed over partitions (pg_relation_size)"
+        ),
+        sa.Column(
+            "index_bytes",
+            sa.BigInteger,
+            nullable=False,
+            comment="Size of all indexes (pg_indexes_size)"
+        ),
+        sa.Column(
+            "toast_bytes",
+            sa.BigInteger,
+            nullable=False,
+            comment="Size of the TOAST table and its index"
+        ),
+        sa.Column(
+            "total_bytes",
+            sa.BigInteger,
+            nullable=False,
+            comment="Everything, including free space and visibility maps (pg_total_relation_size)"
+        ),
+        sa.Column(
+            "live_tuples",
+            sa.BigInteger,
+            comment="pg_stat_user_tables.n_live_tup"
+        ),
+        sa.Column(
+            "dead_tuples",
+            sa.BigInteger,
+            comment="pg_stat_user_tables.n_dead_tup"
+        ),
+        schema=data_contract_schema,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("storage_history", schema=data_contract_schema)
@@ -0,0 +1,122 @@
+"""add contract registry
+
+Revision ID: 63d1df6e7b1f
+Revises: 74e7cc66990c
+Create Date: 2026-10-19 14:37:52.118406+00:00
+
+Stores every version of every contract spec as JSONB, so detectors can look up
+the contracts for a table, an owner or a column with an index instead of
+parsing the whole contract_definition directory.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '63d1df6e7b1f'
+down_revision: Union[str, Sequence[str], None] = '74e7cc66990c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+data_contract_schema: str = "data_contract"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contract_registry",
+        sa.Column(
+            "contract_name",
+            sa.Text,
+            primary_key=True,
+            comment="Contract file name without the .json extension"
+        ),
+        sa.Column(
+            "version",
+            sa.Integer,
+            primary_key=True,
+            comment="Increments every time the spec content changes"
+        ),
+        sa.Column(
+            "spec",
+            postgresql.JSONB,
+            nullable=False,
+            comment="The full contract specification"
+        ),
+        sa.Column(
+            "content_hash",
+            sa.Text,
+            nullable=False,
+            comment="SHA-256 of the canonical JSON of the spec"
+        ),
+        sa.Column(
+            "is_current",
+            sa.Boolean,
+            nullable=False,
+            server_default=sa.true(),
+            comment="Whether this is the version currently in the contract directory"
+        ),
+        sa.Column(
+            "synced_at",
+            sa.DateTime,
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            comment="Timestamp when this version was registered"
+        ),
+        sa.Column(
+            "retired_at",
+            sa.DateTime,
+            comment="Timestamp when this version was replaced or its file removed"
+        ),
+        schema=data_contract_schema,
+    )
+
+    # At most one current version per contract.
+    op.create_index(
+        "ux_contract_registry_current",
+        "contract_registry",
+        ["contract_name"],
+        unique=True,
+        schema=data_contract_schema,
+        postgresql_where=sa.text("is_current"),
+    )
+
+    # Containment queries (spec @> '{...}'), e.g. every contract declaring a
+    # column as primary key. jsonb_path_ops only supports @>, but is smaller
+    # and faster than the default operator class for it. The registry is
+    # written in rare bulk syncs and read constantly, so fastupdate is off:
+    # otherwise fresh entries sit in the pending list, which every lookup has
+    # to scan and which the planner prices as a sequential scan.
+    op.create_index(
+        "ix_contract_registry_spec",
+        "contract_registry",
+        ["spec"],
+        schema=data_contract_schema,
+        postgresql_using="gin",
+        postgresql_ops={"spec": "jsonb_path_ops"},
+        postgresql_with={"fastupdate": "off"},
+        postgresql_where=sa.text("is_current"),
+    )
+
+    # Equality lookups by contracted table and by owning team.
+    op.create_index(
+        "ix_contract_registry_table",
+        "contract_registry",
+        [sa.text("(spec #>> '{schema,table_schema}')"), sa.text("(spec #>> '{schema,table_name}')")],
+        schema=data_contract_schema,
+        postgresql_where=sa.text("is_current"),
+    )
+    op.create_index(
+        "ix_contract_registry_owner",
+        "contract_registry",
+        [sa.text("(spec #>> '{owner,name}')")],
+        schema=data_contract_schema,
+        postgresql_where=sa.text("is_current"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("contract_registry", schema=data_contract_schema)
@@ -0,0 +1,157 @@
+"""hash partition object tables
+
+Revision ID: 74e7cc66990c
+Revises: 8f349d23a852
+Create Date: 2026-10-19 13:20:45.671092+00:00
+
+Converts the per-object tables to PARTITION BY HASH (object_id). The number of
+partitions is taken from the command line and defaults to 8:
+
+    alembic -x partitions=32 upgrade head
+
+Every table uses the same key and modulus, so partition N of each table holds
+the same objects and a loader or validator can work partition by partition.
+Partitions live in their own schema to keep them out of the public catalog the
+contracts are checked against.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '74e7cc66990c'
+down_revision: Union[str, Sequence[str], None] = '8f349d23a852'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+default_partition_count: int = 8
+partition_schema: str = "object_partitions"
+
+seed_tables: list[str] = [
+    "object",
+    "object_history",
+    "object_physical_properties",
+    "object_gallery_info",
+    "object_tags",
+    "object_images",
+    "object_copyright",
+    "object_api_metadata",
+]
+
+# Secondary indexes per table, recreated on the new table (and cascaded to
+# every partition when the table is partitioned).
+table_indexes: dict[str, list[tuple[str, str]]] = {
+    table_name: [(f"ix_{table_name}_created_at", "created_at")]
+    for table_name in seed_tables
+}
+table_indexes["object_api_metadata"].append(
+    ("ix_object_api_metadata_metadata_date", "metadata_date")
+)
+
+# The summary views from 8f349d23a852 depend on these tables and have to be
+# rebuilt around the table swap.
+summary_views_sql: list[str] = [
+    """
+    CREATE MATERIALIZED VIEW object_summary_stats AS
+    SELECT
+        1 AS summary_id,
+        (SELECT count(*) FROM object) AS total_objects,
+        (SELECT count(*) FROM object_copyright WHERE is_public_domain = true) AS public_domain_objects,
+        (SELECT count(*) FROM object_images WHERE primary_image IS NOT NULL) AS objects_with_images,
+        CURRENT_TIMESTAMP::timestamp AS refreshed_at
+    """,
+    "CREATE UNIQUE INDEX ux_object_summary_stats_summary_id ON object_summary_stats (summary_id)",
+    """
+    CREATE MATERIALIZED VIEW department_object_counts AS
+    SELECT
+        department,
+        count(*) AS object_count
+    FROM object_gallery_info
+    WHERE department IS NOT NULL
+    GROUP BY department
+    """,
+    "CREATE UNIQUE INDEX ux_department_object_counts_department ON department_object_counts (department)",
+]
+
+
+def _partition_count() -> int:
+    partition_count = int(
+        context.get_x_argument(as_dictionary=True).get(
+            "partitions", default_partition_count
+        )
+    )
+    if partition_count < 1:
+        raise ValueError("partitions must be at least 1")
+    return partition_count
+
+
+def _drop_summary_views() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS department_object_counts")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS object_summary_stats")
+
+
+def _create_summary_views() -> None:
+    for statement in summary_views_sql:
+        op.execute(statement)
+
+
+def _rebuild_table(table_name: str, partition_count: int) -> None:
+    """Recreate a table (hash partitioned when partition_count > 0) and move its rows over."""
+    previous = f"{table_name}_previous"
+    op.execute(f"ALTER TABLE {table_name} RENAME TO {previous}")
+
+    partition_clause = " PARTITION BY HASH (object_id)" if partition_count else ""
+    op.execute(
+        f"CREATE TABLE {table_name} "
+        f"(LIKE {previous} INCLUDING DEFAULTS INCLUDING COMMENTS INCLUDING STORAGE)"
+        f"{partition_clause}"
+    )
+    for remainder in range(partition_count):
+        op.execute(
+            f"CREATE TABLE {partition_schema}.{table_name}_p{remainder:03d} "
+            f"PARTITION OF {table_name} "
+            f"FOR VALUES WITH (MODULUS {partition_count}, REMAINDER {remainder})"
+        )
+
+    # object_id is a serial column; hand its sequence to the new table so it
+    # survives dropping the old one.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE sequence_name text := pg_get_serial_sequence('{previous}', 'object_id');
+        BEGIN
+            IF sequence_name IS NOT NULL THEN
+                EXECUTE format('ALTER SEQUENCE %s OWNED BY {table_name}.object_id', sequence_name);
+            END IF;
+        END $$
+        """
+    )
+
+    # Rows first, keys and indexes afterwards: one bulk index build per
+    # partition is much cheaper than maintaining the indexes row by row.
+    op.execute(f"INSERT INTO {table_name} SELECT * FROM {previous}")
+    op.execute(f"DROP TABLE {previous}")
+
+    op.execute(f"ALTER TABLE {table_name} ADD CONSTRAINT {table_name}_pkey PRIMARY KEY (object_id)")
+    for index_name, column_name in table_indexes[table_name]:
+        op.create_index(index_name, table_name, [column_name])
+
+
+def upgrade() -> None:
+    partition_count = _partition_count()
+
+    _drop_summary_views()
+    op.execute(f"CREATE SCHEMA IF NOT EXISTS {partition_schema}")
+    for table_name in seed_tables:
+        _rebuild_table(table_name, partition_count)
+    _create_summary_views()
+
+
+def downgrade() -> None:
+    _drop_summary_views()
+    for table_name in seed_tables:
+        _rebuild_table(table_name, 0)
+    op.execute(f"DROP SCHEMA IF EXISTS {partition_schema}")
+    _create_summary_views()
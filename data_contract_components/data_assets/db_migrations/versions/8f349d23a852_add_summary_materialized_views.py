@@ -0,0 +1,63 @@
+"""add summary materialized views
+
+Revision ID: 8f349d23a852
+Revises: ef607622c03c
+Create Date: 2026-10-19 11:58:22.904313+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f349d23a852'
+down_revision: Union[str, Sequence[str], None] = 'ef607622c03c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Each view has a unique index so it can be refreshed with
+# REFRESH MATERIALIZED VIEW CONCURRENTLY, which keeps readers (dashboards,
+# seed_db reporting) unblocked while the aggregates are recomputed.
+object_summary_stats_sql: str = """
+    CREATE MATERIALIZED VIEW object_summary_stats AS
+    SELECT
+        1 AS summary_id,
+        (SELECT count(*) FROM object) AS total_objects,
+        (SELECT count(*) FROM object_copyright WHERE is_public_domain = true) AS public_domain_objects,
+        (SELECT count(*) FROM object_images WHERE primary_image IS NOT NULL) AS objects_with_images,
+        CURRENT_TIMESTAMP::timestamp AS refreshed_at
+"""
+
+department_object_counts_sql: str = """
+    CREATE MATERIALIZED VIEW department_object_counts AS
+    SELECT
+        department,
+        count(*) AS object_count
+    FROM object_gallery_info
+    WHERE department IS NOT NULL
+    GROUP BY department
+"""
+
+
+def upgrade() -> None:
+    op.execute(object_summary_stats_sql)
+    op.create_index(
+        "ux_object_summary_stats_summary_id",
+        "object_summary_stats",
+        ["summary_id"],
+        unique=True,
+    )
+
+    op.execute(department_object_counts_sql)
+    op.create_index(
+        "ux_department_object_counts_department",
+        "department_object_counts",
+        ["department"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS department_object_counts")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS object_summary_stats")
@@ -0,0 +1,34 @@
+"""add freshness indexes
+
+Revision ID: ef607622c03c
+Revises: 21373e6c9155
+Create Date: 2026-10-19 10:41:07.215664+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ef607622c03c'
+down_revision: Union[str, Sequence[str], None] = '21373e6c9155'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A freshness lag_reference on metadata_date is read as max(metadata_date),
+    # one backward index step like created_at (indexed by 21373e6c9155).
+    op.create_index(
+        "ix_object_api_metadata_metadata_date",
+        "object_api_metadata",
+        ["metadata_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_object_api_metadata_metadata_date",
+        table_name="object_api_metadata",
+    )
@@ -4,17 +4,39 @@ Seed Met Museum data into PostgreSQL using psycopg3.
 
 This script reads the objects.json file and seeds the data into normalized PostgreSQL tables
 as defined in the initial alembic migration 00e9b3375a5f_create_met_museum_raw_table.py.
+
+If --input points at a sharded NDJSON directory written by
+`get_data_subset_from_met_api.py --format ndjson`, the shards are streamed and
+loaded in parallel (one worker connection per shard) instead.
+
+With --stream the scraper runs in-process: fetched objects go through a bounded
+queue straight into insert_object_batch, so rows are queryable within seconds of
+being fetched.  Writing the scraper output file becomes an optional tee (--tee-out).
+
+--profile (or DATA_CONTRACT_PROFILE=1) prints the time and memory of each load
+phase to stderr when the run ends; --profile-dir also writes a cProfile dump (see
+_phase_profiler.py).
 """
 
+import argparse
 import json
 import logging
 import os
-from typing import Dict, Any, List
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import psycopg
 from psycopg.types.json import Json
 from psycopg_pool import ConnectionPool
 
+from db_migrations.raw_data.get_data_subset_from_met_api import MetScraper, ShardedNdjsonStore
+from partition_maintenance import assign_partitions, maintain_partitions
+from _phase_profiler import PhaseProfiler
+
 # Configure logging
 logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s",
@@ -32,6 +54,9 @@ POOL_CONFIG = {
     "timeout": 30,
 }
 
+# Materialized views holding the post-load statistics (migration 8f349d23a852)
+SUMMARY_VIEWS = ["object_summary_stats", "department_object_counts"]
+
 def clear_all_tables(conn: psycopg.Connection) -> None:
     """Clear all data from the initial db tables."""
     
@@ -184,8 +209,16 @@ def insert_object_api_metadata(conn: psycopg.Connection, data: Dict[str, Any]) -
                 metadata_date = EXCLUDED.metadata_date
         """, (data["object_id"], data["metadata_date"]))
 
-def insert_object_batch(conn: psycopg.Connection, objects: List[Dict[str, Any]]) -> int:
-    """Insert a batch of objects into all normalized tables."""
+def insert_object_batch(conn: psycopg.Connection, objects: List[Dict[str, Any]],
+                        strict: bool = False) -> int:
+    """
+    Insert a batch of objects into all normalized tables.
+    
+    By default an object that fails is logged and skipped.  With strict=True the
+    error is raised instead, so the caller can roll the batch back: after a failed
+    statement the transaction is aborted, and COMMIT would silently roll back the
+    objects inserted before it as well.
+    """
     
     if not objects:
         return 0
@@ -213,15 +246,69 @@ def insert_object_batch(conn: psycopg.Connection, objects: List[Dict[str, Any]])
             inserted_count += 1
             
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error inserting object {data.get('object_id', 'unknown')}: {e}")
             continue
     
     conn.commit()
     return inserted_count
 
-def load_and_insert_data(json_file_path: str, batch_size: int = 1000) -> None:
+def load_partition(pool: ConnectionPool, remainder: int, objects: List[Dict[str, Any]],
+                   batch_size: int) -> int:
+    """Insert the objects of one hash partition; no other worker touches its partitions."""
+    
+    total_inserted = 0
+    with pool.connection() as conn:
+        for i in range(0, len(objects), batch_size):
+            batch = objects[i:i + batch_size]
+            
+            try:
+                inserted = insert_object_batch(conn, batch)
+                total_inserted += inserted
+                logger.info(f"Inserted partition {remainder} batch {i//batch_size + 1}: {inserted} objects")
+            except Exception as e:
+                logger.error(f"Error inserting partition {remainder} batch {i//batch_size + 1}: {e}")
+                conn.rollback()
+                raise
+    
+    logger.info(f"Inserted partition {remainder}: {total_inserted} objects")
+    return total_inserted
+
+def load_and_insert_partitioned(pool: ConnectionPool, objects: List[Dict[str, Any]],
+                                batch_size: int, workers: int) -> Optional[int]:
+    """
+    Load objects into the hash-partitioned tables with one worker per partition.
+    
+    All object tables share the same partition key and modulus, so grouping the
+    objects by partition gives each worker a disjoint set of heaps and indexes to
+    write, instead of every worker contending for the same ones.  Returns None if
+    the tables are not partitioned.
+    """
+    
+    with pool.connection() as conn:
+        partition_of = assign_partitions(conn, [obj["objectID"] for obj in objects if obj.get("objectID")])
+    if not partition_of:
+        return None
+    
+    groups: Dict[int, List[Dict[str, Any]]] = {}
+    for obj in objects:
+        if obj.get("objectID") in partition_of:
+            groups.setdefault(partition_of[obj["objectID"]], []).append(obj)
+    logger.info(f"Loading {len(objects)} objects into {len(groups)} partitions with {workers} workers")
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            lambda item: load_partition(pool, item[0], item[1], batch_size),
+            sorted(groups.items()),
+        )
+        return sum(results)
+
+def load_and_insert_data(json_file_path: str, batch_size: int = 1000, workers: int = 1,
+                         profiler: Optional[PhaseProfiler] = None) -> None:
     """Load data from JSON file and insert into normalized database tables."""
     
+    profiler = profiler or PhaseProfiler("seed_db")
     logger.info(f"Loading data from {json_file_path}")
     
     # Check if file exists
@@ -229,76 +316,355 @@ def load_and_insert_data(json_file_path: str, batch_size: int = 1000) -> None:
         raise FileNotFoundError(f"JSON file not found: {json_file_path}")
     
     # Create connection pool
-    with ConnectionPool(conninfo=DB_CONFIG, **POOL_CONFIG) as pool:
+    pool_config = {**POOL_CONFIG, "max_size": max(POOL_CONFIG["max_size"], workers + 1)}
+    with ConnectionPool(conninfo=DB_CONFIG, **pool_config) as pool:
         with pool.connection() as conn:
             # Clear existing data
-            clear_all_tables(conn)
+            with profiler.phase("clear_tables"):
+                clear_all_tables(conn)
             
             # Load and process data
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                objects = json.load(f)
+            with profiler.phase("read_input"):
+                with open(json_file_path, 'r', encoding='utf-8') as f:
+                    objects = json.load(f)
             
             logger.info(f"Loaded {len(objects)} objects from JSON file")
             
+            if workers > 1:
+                with profiler.phase("insert"):
+                    total_inserted = load_and_insert_partitioned(pool, objects, batch_size, workers)
+                if total_inserted is not None:
+                    logger.info(f"Successfully inserted {total_inserted} objects into normalized tables")
+                    return
+            
             # Process in batches
             total_inserted = 0
-            for i in range(0, len(objects), batch_size):
-                batch = objects[i:i + batch_size]
+            with profiler.phase("insert"):
+                for i in range(0, len(objects), batch_size):
+                    batch = objects[i:i + batch_size]
+                    
+                    try:
+                        inserted = insert_object_batch(conn, batch)
+                        total_inserted += inserted
+                        logger.info(f"Inserted batch {i//batch_size + 1}: {inserted} objects")
+                    except Exception as e:
+                        logger.error(f"Error inserting batch {i//batch_size + 1}: {e}")
+                        conn.rollback()
+                        raise
+            
+            logger.info(f"Successfully inserted {total_inserted} objects into normalized tables")
+
+def refresh_summary_views(pool: ConnectionPool) -> None:
+    """Recompute the reporting materialized views without blocking their readers."""
+    
+    with pool.connection() as conn:
+        for view in SUMMARY_VIEWS:
+            start = time.monotonic()
+            conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+            logger.info(f"Refreshed {view} in {time.monotonic() - start:.2f}s")
+
+def load_shard(pool: ConnectionPool, shard_path: Path, batch_size: int) -> int:
+    """Stream one NDJSON shard into the normalized tables, batch by batch."""
+    
+    total_inserted = 0
+    with pool.connection() as conn:
+        batch = []
+        for obj in ShardedNdjsonStore.iter_shard(shard_path):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                total_inserted += insert_object_batch(conn, batch)
+                batch = []
+        if batch:
+            total_inserted += insert_object_batch(conn, batch)
+    
+    logger.info(f"Inserted shard {shard_path.name}: {total_inserted} objects")
+    return total_inserted
+
+def load_and_insert_shards(shard_dir: str, batch_size: int = 1000, workers: int = 4,
+                           profiler: Optional[PhaseProfiler] = None) -> None:
+    """Load a sharded NDJSON store into normalized database tables, one worker per shard."""
+    
+    profiler = profiler or PhaseProfiler("seed_db")
+    shard_path = Path(shard_dir)
+    logger.info(f"Loading data from shards in {shard_path}")
+    
+    manifest = ShardedNdjsonStore.read_manifest(shard_path)
+    if not manifest.get("complete"):
+        logger.warning("Shard manifest is not marked complete; loading the shards committed so far")
+    shards = [shard for shard in manifest["shards"] if shard["records"]]
+    logger.info(f"Manifest lists {sum(s['records'] for s in shards)} objects in {len(shards)} shards")
+    
+    # One pooled connection per worker, plus one for clearing the tables
+    pool_config = {**POOL_CONFIG, "max_size": max(POOL_CONFIG["max_size"], workers + 1)}
+    with ConnectionPool(conninfo=DB_CONFIG, **pool_config) as pool:
+        with profiler.phase("clear_tables"):
+            with pool.connection() as conn:
+                clear_all_tables(conn)
+        
+        # Shards are read while they are inserted, so both count towards this phase
+        with profiler.phase("insert"):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    lambda shard: load_shard(pool, shard_path / shard["file"], batch_size),
+                    shards,
+                )
+                total_inserted = sum(results)
+    
+    logger.info(f"Successfully inserted {total_inserted} objects into normalized tables")
+
+class StreamingLoader:
+    """
+    Bounded queue between MetScraper and the batched upsert path.
+    
+    A consumer thread drains the queue into insert_object_batch, committing a batch
+    when it reaches batch_size or when its oldest object has waited max_latency_sec.
+    put() blocks while the queue is full, which throttles the fetcher to the speed of
+    the database.  flush() returns once everything put so far is committed, and is
+    wired to the scraper's group commit so its checkpoint never runs ahead of the
+    database.  If the consumer thread dies, put() and flush() raise instead of
+    waiting for it.
+    """
+    
+    _STOP = object()
+    _POLL_SEC = 0.5
+    
+    def __init__(self, pool: ConnectionPool, batch_size: int = 500,
+                 max_latency_sec: float = 2.0, max_queue: int = 5000) -> None:
+        self.pool = pool
+        self.batch_size = batch_size
+        self.max_latency_sec = max_latency_sec
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.total_inserted = 0
+        self.error: BaseException | None = None
+        self.thread = threading.Thread(target=self._consume, name="streaming-loader", daemon=True)
+    
+    def start(self) -> None:
+        """Start the consumer thread."""
+        self.thread.start()
+    
+    def put(self, obj: Dict[str, Any]) -> None:
+        """Queue one fetched object (blocks while the queue is full)."""
+        self._put(obj)
+    
+    def flush(self) -> None:
+        """Wait until every queued object has been committed."""
+        # The consumer sets the event once it has committed everything queued before it
+        flushed = threading.Event()
+        self._put(flushed)
+        while not flushed.wait(self._POLL_SEC):
+            self._check_consumer()
+        self._raise_error()
+    
+    def close(self) -> None:
+        """Commit what is left and stop the consumer thread."""
+        while self.thread.is_alive():
+            try:
+                self.queue.put(self._STOP, timeout=self._POLL_SEC)
+                break
+            except queue.Full:
+                continue
+        if self.thread.is_alive():
+            self.thread.join()
+        self._raise_error()
+    
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            raise RuntimeError("Streaming loader failed") from self.error
+    
+    def _check_consumer(self) -> None:
+        """Raise if a batch failed or the consumer thread is gone."""
+        self._raise_error()
+        if not self.thread.is_alive():
+            self._raise_error()
+            raise RuntimeError("Streaming loader thread is not running")
+    
+    def _put(self, item: Any) -> None:
+        """Queue an item, re-checking the consumer while the queue stays full."""
+        while True:
+            self._check_consumer()
+            try:
+                self.queue.put(item, timeout=self._POLL_SEC)
+                return
+            except queue.Full:
+                continue
+    
+    def _consume(self) -> None:
+        """Run the consumer; on any failure record it and release every waiter."""
+        
+        try:
+            self._consume_batches()
+        except BaseException as e:
+            logger.error(f"Streaming loader stopped: {e}")
+            if self.error is None:
+                self.error = e
+            self._drain()
+    
+    def _drain(self) -> None:
+        """Discard what is left in the queue so blocked put() and flush() calls return."""
+        
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+            self.queue.task_done()
+    
+    def _consume_batches(self) -> None:
+        """Drain the queue into batched upserts until stopped."""
+        
+        batch = []
+        deadline = None
+        with self.pool.connection() as conn:
+            while True:
+                timeout = None if not batch else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                is_marker = item is self._STOP or isinstance(item, threading.Event)
                 
                 try:
-                    inserted = insert_object_batch(conn, batch)
-                    total_inserted += inserted
-                    logger.info(f"Inserted batch {i//batch_size + 1}: {inserted} objects")
+                    if item is not None and not is_marker:
+                        if not batch:
+                            deadline = time.monotonic() + self.max_latency_sec
+                        batch.append(item)
+                    if batch and (item is None or is_marker or len(batch) >= self.batch_size):
+                        # A failed object fails the batch, so flush() raises before the checkpoint
+                        self.total_inserted += insert_object_batch(conn, batch, strict=True)
+                        logger.info(f"Streamed batch of {len(batch)} objects "
+                                    f"({self.total_inserted} total)")
+                        batch = []
                 except Exception as e:
-                    logger.error(f"Error inserting batch {i//batch_size + 1}: {e}")
+                    logger.error(f"Error inserting streamed batch: {e}")
                     conn.rollback()
-                    raise
-            
-            logger.info(f"Successfully inserted {total_inserted} objects into normalized tables")
+                    self.error = e
+                    batch = []
+                finally:
+                    if isinstance(item, threading.Event):
+                        item.set()
+                    if item is not None:
+                        self.queue.task_done()
+                
+                if item is self._STOP:
+                    return
+
+def stream_from_scraper(scraper_kwargs: Dict[str, Any], batch_size: int = 500,
+                        max_latency_sec: float = 2.0, max_queue: int = 5000) -> None:
+    """Run MetScraper in-process and upsert its objects as they arrive."""
+    
+    with ConnectionPool(conninfo=DB_CONFIG, **POOL_CONFIG) as pool:
+        loader = StreamingLoader(pool, batch_size, max_latency_sec, max_queue)
+        loader.start()
+        try:
+            scraper = MetScraper(sink=loader.put, sink_flush=loader.flush, **scraper_kwargs)
+            scraper.run()
+        finally:
+            loader.close()
+    
+    logger.info(f"Successfully streamed {loader.total_inserted} objects into normalized tables")
+
+def _parse_args(argv=None):
+    """Return parsed command-line arguments."""
+    
+    parser = argparse.ArgumentParser(description="Seed Met Museum data into PostgreSQL.")
+    parser.add_argument(
+        "--input",
+        default="db_migrations/raw_data/objects.json",
+        help="JSON array file, or directory of NDJSON shards with a manifest.json",
+    )
+    parser.add_argument("--batch-size", default=1000, type=int, help="Objects per insert transaction")
+    parser.add_argument(
+        "--workers", default=4, type=int,
+        help="Parallel shard or partition loaders; 1 loads a JSON file in one sequential transaction stream",
+    )
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM (ANALYZE) each partition after loading")
+    
+    parser.add_argument("--profile", action="store_true", help="Print per-phase time and memory when done")
+    parser.add_argument("--profile-dir", default=None, help="Profile, and also write cProfile stats to this directory")
+    
+    stream = parser.add_argument_group("streaming pipeline (--stream)")
+    stream.add_argument("--stream", action="store_true", help="Fetch from the Met API and upsert as objects arrive")
+    stream.add_argument("--ids-file", help="JSON list of object IDs to fetch")
+    stream.add_argument("--search-first", action="store_true", help="Use the highlight+hasImages search IDs")
+    stream.add_argument("--tee-out", default=None, help="Also write the scraper output file (optional)")
+    stream.add_argument("--checkpoint", default="db_migrations/raw_data/streamed_ids.log", help="Scraper checkpoint log")
+    stream.add_argument("--concurrency", default=4, type=int, help="Max requests in flight")
+    stream.add_argument("--rate-limit", default=80.0, type=float, help="Requests/minute")
+    stream.add_argument("--max-latency", default=2.0, type=float, help="Seconds before a partial batch is committed")
+    stream.add_argument("--sync-state", default=None, help="Delta-sync watermark file")
+    stream.add_argument("--cache", default=None, help="Scraper response cache")
+    stream.add_argument("--api-base-url", default=None, help="Override the Met API base URL")
+    return parser.parse_args(argv)
 
 def main():
     """Main function to run the data seeding."""
     
-    json_file_path = "db_migrations/raw_data/objects.json"
+    args = _parse_args()
+    profiler = PhaseProfiler.from_env("seed_db", args.profile_dir or ("1" if args.profile else None))
     
     try:
-        load_and_insert_data(json_file_path)
-        logger.info("Data seeding completed successfully!")
+        with profiler.run():
+            if args.stream:
+                with profiler.phase("stream"):
+                    stream_from_scraper(
+                        {
+                            "ids_file": args.ids_file,
+                            "search_first": args.search_first,
+                            "search_out_file": "db_migrations/raw_data/search_results.json",
+                            "out_file": args.tee_out,
+                            "checkpoint_file": args.checkpoint,
+                            "concurrency": args.concurrency,
+                            "requests_per_minute": args.rate_limit,
+                            "sync_state_file": args.sync_state,
+                            "cache_file": args.cache,
+                            "api_base_url": args.api_base_url,
+                        },
+                        batch_size=args.batch_size,
+                        max_latency_sec=args.max_latency,
+                    )
+            elif os.path.isdir(args.input):
+                load_and_insert_shards(args.input, batch_size=args.batch_size, workers=args.workers,
+                                       profiler=profiler)
+            else:
+                load_and_insert_data(args.input, batch_size=args.batch_size, workers=args.workers,
+                                     profiler=profiler)
+            logger.info("Data seeding completed successfully!")
         
-        # Print some statistics
-        with ConnectionPool(conninfo=DB_CONFIG, **POOL_CONFIG) as pool:
-            with pool.connection() as conn:
-                with conn.cursor() as cur:
-                    # Count objects in main table
-                    cur.execute("SELECT COUNT(*) FROM object")
-                    total_count = cur.fetchone()[0]
-                    
-                    # Count public domain objects
-                    cur.execute("SELECT COUNT(*) FROM object_copyright WHERE is_public_domain = true")
-                    public_domain_count = cur.fetchone()[0]
-                    
-                    # Top departments
-                    cur.execute("""
-                        SELECT department, COUNT(*) 
-                        FROM object_gallery_info 
-                        WHERE department IS NOT NULL 
-                        GROUP BY department 
-                        ORDER BY COUNT(*) DESC 
-                        LIMIT 5
-                    """)
-                    top_departments = cur.fetchall()
+            if args.vacuum:
+                with profiler.phase("vacuum"):
+                    maintain_partitions("vacuum", jobs=args.workers, conninfo=DB_CONFIG)
+        
+            # Print some statistics
+            with ConnectionPool(conninfo=DB_CONFIG, **POOL_CONFIG) as pool:
+                with profiler.phase("refresh_views"):
+                    refresh_summary_views(pool)
+                with pool.connection() as conn:
+                    with conn.cursor() as cur:
+                        # Object counts, precomputed by the summary view
+                        cur.execute("""
+                            SELECT total_objects, public_domain_objects, objects_with_images
+                            FROM object_summary_stats
+                        """)
+                        total_count, public_domain_count, objects_with_images = cur.fetchone()
                     
-                    # Objects with images
-                    cur.execute("SELECT COUNT(*) FROM object_images WHERE primary_image IS NOT NULL")
-                    objects_with_images = cur.fetchone()[0]
+                        # Top departments
+                        cur.execute("""
+                            SELECT department, object_count 
+                            FROM department_object_counts 
+                            ORDER BY object_count DESC 
+                            LIMIT 5
+                        """)
+                        top_departments = cur.fetchall()
                     
-                    logger.info(f"Database statistics:")
-                    logger.info(f"  Total objects: {total_count}")
-                    logger.info(f"  Public domain objects: {public_domain_count}")
-                    logger.info(f"  Objects with images: {objects_with_images}")
-                    logger.info(f"  Top departments:")
-                    for dept, count in top_departments:
-                        logger.info(f"    {dept}: {count}")
+                        logger.info(f"Database statistics:")
+                        logger.info(f"  Total objects: {total_count}")
+                        logger.info(f"  Public domain objects: {public_domain_count}")
+                        logger.info(f"  Objects with images: {objects_with_images}")
+                        logger.info(f"  Top departments:")
+                        for dept, count in top_departments:
+                            logger.info(f"    {dept}: {count}")
                         
     except Exception as e:
         logger.error(f"Error during data seeding: {e}")
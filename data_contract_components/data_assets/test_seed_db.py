@@ -0,0 +1,185 @@
+import contextlib
+import json
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# seed_db is run as a script from this directory and imports its siblings by top-level name
+data_assets_directory = pathlib.Path(__file__).resolve().parent
+if str(data_assets_directory) not in sys.path:
+    sys.path.insert(0, str(data_assets_directory))
+
+import seed_db  # noqa: E402
+from data_contract_components.data_assets.db_migrations.raw_data.test_get_data_subset_from_met_api import (  # noqa: E402
+    StubMetApi,
+)
+
+# Generous upper bound for anything the consumer thread should do "promptly"
+WAIT_SEC = 5.0
+
+
+class FakeDatabase:
+    """
+    Stand-in for the connection pool, recording which object IDs each COMMIT made durable.
+
+    Like Postgres, a failed statement aborts the transaction: later statements fail,
+    and COMMIT ends it as a rollback without raising. Objects in `failing` make
+    their first insert fail.
+    """
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.commits = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield FakeConnection(self)
+
+    def committed_ids(self):
+        with self._lock:
+            return {object_id for _, object_ids in self.commits for object_id in object_ids}
+
+    def wait_for_commits(self, count):
+        deadline = time.monotonic() + WAIT_SEC
+        while len(self.commits) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return list(self.commits)
+
+
+class FakeConnection:
+
+    def __init__(self, database):
+        self.database = database
+        self.pending = []
+        self.aborted = False
+
+    @contextlib.contextmanager
+    def cursor(self):
+        yield self
+
+    def execute(self, sql, params=None):
+        if self.aborted:
+            raise RuntimeError("current transaction is aborted")
+        object_id = params[0]
+        if object_id in self.database.failing:
+            self.aborted = True
+            raise RuntimeError(f"cannot insert object {object_id}")
+        if object_id not in self.pending:
+            self.pending.append(object_id)
+
+    def commit(self):
+        if not self.aborted and self.pending:
+            with self.database._lock:
+                self.database.commits.append((time.monotonic(), list(self.pending)))
+        self.pending = []
+        self.aborted = False
+
+    def rollback(self):
+        self.pending = []
+        self.aborted = False
+
+
+class TestStreamingLoader(unittest.TestCase):
+
+    def make_loader(self, database, batch_size=3, max_latency_sec=60.0):
+        loader = seed_db.StreamingLoader(database, batch_size=batch_size, max_latency_sec=max_latency_sec)
+        loader.start()
+        self.addCleanup(self.close_loader, loader)
+        return loader
+
+    @staticmethod
+    def close_loader(loader):
+        # A test that failed the loader has already checked what close() raises
+        with contextlib.suppress(RuntimeError):
+            loader.close()
+
+    def put_objects(self, loader, object_ids):
+        for object_id in object_ids:
+            loader.put({"objectID": object_id})
+
+    def test_commits_each_full_batch(self):
+        database = FakeDatabase()
+        loader = self.make_loader(database, batch_size=3)
+        self.put_objects(loader, range(1, 8))
+
+        commits = database.wait_for_commits(2)
+        time.sleep(0.1)
+        # The seventh object waits for its batch to fill (or for its latency to run out)
+        self.assertEqual([object_ids for _, object_ids in database.commits], [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(len(commits), 2)
+
+        loader.close()
+        self.assertEqual([object_ids for _, object_ids in database.commits], [[1, 2, 3], [4, 5, 6], [7]])
+        self.assertEqual(loader.total_inserted, 7)
+
+    def test_commits_partial_batch_after_max_latency(self):
+        database = FakeDatabase()
+        loader = self.make_loader(database, batch_size=100, max_latency_sec=0.2)
+        put_at = time.monotonic()
+        self.put_objects(loader, [1, 2])
+
+        commits = database.wait_for_commits(1)
+        self.assertEqual([object_ids for _, object_ids in commits], [[1, 2]])
+        self.assertGreaterEqual(commits[0][0] - put_at, 0.2 - 0.01)
+
+    def test_flush_returns_once_everything_put_is_committed(self):
+        database = FakeDatabase()
+        loader = self.make_loader(database, batch_size=100)
+        self.put_objects(loader, range(1, 6))
+
+        loader.flush()
+        self.assertEqual(database.committed_ids(), set(range(1, 6)))
+
+        # Objects put after a flush go into the next commit
+        self.put_objects(loader, [6])
+        loader.flush()
+        self.assertEqual([object_ids for _, object_ids in database.commits], [[1, 2, 3, 4, 5], [6]])
+
+    def test_failed_object_fails_its_batch_and_flush(self):
+        database = FakeDatabase(failing={2})
+        loader = self.make_loader(database, batch_size=100)
+        self.put_objects(loader, [1, 2, 3])
+
+        with self.assertLogs(level="ERROR"), self.assertRaises(RuntimeError) as raised:
+            loader.flush()
+        self.assertIn("cannot insert object 2", str(raised.exception.__cause__))
+        # Nothing of the batch is durable, and nothing is counted as inserted
+        self.assertEqual(database.commits, [])
+        self.assertEqual(loader.total_inserted, 0)
+        with self.assertRaises(RuntimeError):
+            loader.put({"objectID": 4})
+        with self.assertRaises(RuntimeError):
+            loader.close()
+
+    def test_failed_object_is_not_checkpointed(self):
+        database = FakeDatabase(failing={3})
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = pathlib.Path(tmp)
+            (directory / "ids.json").write_text(json.dumps(list(range(1, 11))))
+            checkpoint_path = directory / "processed_ids.log"
+            loader = self.make_loader(database, batch_size=100)
+
+            with StubMetApi() as stub, self.assertLogs(level="ERROR"), self.assertRaises(RuntimeError):
+                seed_db.MetScraper(
+                    ids_file=str(directory / "ids.json"),
+                    out_file=None,
+                    checkpoint_file=str(checkpoint_path),
+                    flush_every=5,
+                    concurrency=0,
+                    rate_delay_sec=0,
+                    api_base_url=stub.base_url,
+                    sink=loader.put,
+                    sink_flush=loader.flush,
+                ).run()
+
+            checkpointed = checkpoint_path.read_text().split() if checkpoint_path.exists() else []
+        self.assertNotIn("3", checkpointed)
+        self.assertTrue({int(object_id) for object_id in checkpointed if object_id.isdigit()} <= database.committed_ids())
+
+
+if __name__ == "__main__":
+    unittest.main()
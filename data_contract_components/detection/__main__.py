@@ -0,0 +1,478 @@
+"""
+Command line entry point for contract detection:
+
+    python -m data_contract_components.detection list
+    python -m data_contract_components.detection coverage --catalog snapshot:catalog.parquet
+    python -m data_contract_components.detection violations --jobs 4 --format json
+    python -m data_contract_components.detection all --contract object_images_contract_spec --format github
+    python -m data_contract_components.detection --changed-table object_images all
+
+coverage checks that the contracted tables exist in the data catalog, violations
+compares the column constraints with the catalog, data checks the table rows,
+indexes checks the declared indexes, plans checks the plans of the declared
+consumer queries (--analyze analyzes the scanned tables that have no statistics
+yet), storage checks the declared size and bloat budgets (and records each
+measurement, so breaches show the growth since the previous run), statistics
+checks the declared thresholds against the planner statistics (--analyze refreshes
+them first), freshness checks the age and lag of the declared timestamp columns,
+and all runs the catalog checks plus the data, index, plan, storage, statistics
+and freshness checks when the catalog is live (the same checks as the prevention
+suite).
+
+--changed-table checks only the contracts that cover a table, e.g. the tables a
+migration touches; the contracts and their specs come from the contract registry.
+
+Exit codes: 0 when nothing is found, 1 when there are violations, 2 on usage or
+runtime errors (unknown contract, unreachable database, ...).
+
+Only the standard library is imported at start-up.  pandas, psycopg and the
+detectors are imported by the checks that use them, so --help and list cost
+little more than starting the interpreter, e.g. in a pre-commit hook.
+
+--profile (or DATA_CONTRACT_PROFILE, see _phase_profiler) prints the time and
+memory of each phase (imports, spec load, catalog query, merge, comparison,
+report) summed over all checks; --profile-dir also writes a cProfile dump.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_CONTRACT_DIRECTORY = "data_contract_components/contract_definition"
+CHECKS = ("coverage", "violations", "data", "indexes", "plans", "storage", "statistics", "freshness")
+# Checks that take the --analyze option
+ANALYZE_CHECKS = ("plans", "statistics")
+FORMATS = ("text", "json", "github")
+
+EXIT_OK = 0
+EXIT_VIOLATIONS = 1
+EXIT_ERROR = 2
+
+
+def _check_coverage(
+    contract_directory: str, contract_names: List[str], catalog_source: Callable, profiler,
+    contract_specs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Contracted tables missing from the data catalog, as violation dictionaries."""
+    from data_contract_components.detection.contract_coverage_detector import ContractCoverageDetector
+
+    detector = ContractCoverageDetector(
+        contract_directory, catalog_source=catalog_source, contract_names=contract_names,
+        contract_specs=contract_specs, profiler=profiler,
+    )
+    missing_table_names = set(detector.detect_coverage_in_data_catalog())
+    return [
+        {
+            "contract_name": coverage["contract_name"],
+            "table_name": coverage["table_name"],
+            "column_name": None,
+            "violations": f"Table '{coverage['table_schema']}.{coverage['table_name']}' is under contract but missing from data catalog",
+        }
+        for coverage in detector.get_contract_spec_coverage()
+        if coverage["table_name"] in missing_table_names
+    ]
+
+
+def _check_violations(
+    contract_directory: str, contract_names: List[str], catalog_source: Callable, profiler,
+    contract_specs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Column constraints that do not match the data catalog."""
+    from data_contract_components.detection.contract_violation_detector import ContractViolationDetector
+
+    detector = ContractViolationDetector(
+        contract_directory, catalog_source=catalog_source, contract_names=contract_names,
+        contract_specs=contract_specs, profiler=profiler,
+    )
+    return detector.detect_constraint_violations()
+
+
+def _check_data(
+    contract_directory: str, contract_names: List[str], catalog_source: Callable, profiler,
+    contract_specs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Table rows that break the contract constraints (needs the live database)."""
+    from data_contract_components.detection.contract_data_violation_detector import ContractDataViolationDetector
+
+    detector = ContractDataViolationDetector(contract_directory, contract_names=contract_names, contract_specs=contract_specs)
+    with profiler.phase("table_data_scan"):
+        return detector.detect_data_violations()
+
+
+def _check_indexes(
+    contract_directory: str, contract_names: List[str], catalog_source: Callable, profiler,
+    contract_specs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Declared indexes that are missing, invalid or different (needs the live database)."""
+    from data_contract_components.detection.contract_index_detector import ContractIndexDetector
+
+    detector = ContractIndexDetector(contract_directory, contract_names=contract_names, contract_specs=contract_specs)
+    with profiler.phase("index_catalog_query"):
+        return detector.detect_index_violations()
+
+
+def _check_plans(
+    contract_directory: str, contract_names: List[str], catalog_source: Callable, profiler,
+    contract_specs: Optional[Dict[str, Any]] = None, analyze: bool = False,
+) -> List[Dict[str, Any]]:
+    """Declared consumer queries whose plans miss their expectations (needs the live database)."""
+    from data_contract_components.detection.contract_query_plan_detector import ContractQueryPlanDetector
+
+    detector = ContractQueryPlanDetector(
+        contract_directory, analyze=analyze, contract_names=contract_names, contract_specs=contract_specs
+    )
+    with profiler.phase("explain"):
+        return detector.detect_query_plan_violations()
+
+
+def _check_storage(
+    contract_directory: str, contract_names: List[str], catalog_source: Callable, profiler,
+    contract_specs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Tables over their declared size or dead-tuple budgets (needs the live database)."""
+    from data_contract_components.detection.contract_storage_detector import ContractStorageDetector
+
+    detector = ContractStorageDetector(contract_directory, contract_names=contract_names, contract_specs=contract_specs)
+    with profiler.phase("storage_measurement"):
+        return detector.detect_storage_violations()
+
+
+def _check_statistics(
+    contract_directory: str, contract_names: List[str], catalog_source: Callable, profiler,
+    contract_specs: Optional[Dict[str, Any]] = None, analyze: bool = False,
+) -> List[Dict[str, Any]]:
+    """Planner statistics outside the declared thresholds (needs the live database)."""
+    from data_contract_components.detection.contract_statistics_detector import ContractStatisticsDetector
+
+    detector = ContractStatisticsDetector(
+        contract_directory, analyze=analyze, contract_names=contract_names, contract_specs=contract_specs
+    )
+    with profiler.phase("statistics_query"):
+        return detector.detect_statistics_violations()
+
+
+def _check_freshness(
+    contract_directory: str, contract_names: List[str], catalog_source: Callable, profiler,
+    contract_specs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Timestamp columns older or further behind than declared (needs the live database)."""
+    from data_contract_components.detection.contract_freshness_detector import ContractFreshnessDetector
+
+    detector = ContractFreshnessDetector(contract_directory, contract_names=contract_names, contract_specs=contract_specs)
+    with profiler.phase("freshness_query"):
+        return detector.detect_freshness_violations()
+
+
+CHECK_FUNCTIONS = {
+    "coverage": _check_coverage,
+    "violations": _check_violations,
+    "data": _check_data,
+    "indexes": _check_indexes,
+    "plans": _check_plans,
+    "storage": _check_storage,
+    "statistics": _check_statistics,
+    "freshness": _check_freshness,
+}
+
+
+# Imported when a check runs, inside the "imports" phase of a profiled run
+CHECK_MODULES = {
+    "coverage": "data_contract_components.detection.contract_coverage_detector",
+    "violations": "data_contract_components.detection.contract_violation_detector",
+    "data": "data_contract_components.detection.contract_data_violation_detector",
+    "indexes": "data_contract_components.detection.contract_index_detector",
+    "plans": "data_contract_components.detection.contract_query_plan_detector",
+    "storage": "data_contract_components.detection.contract_storage_detector",
+    "statistics": "data_contract_components.detection.contract_statistics_detector",
+    "freshness": "data_contract_components.detection.contract_freshness_detector",
+}
+
+
+def _cached_catalog_source(catalog: str) -> Callable:
+    """Resolve a catalog source that is read at most once, however many checks and jobs use it."""
+    from functools import lru_cache
+    from data_contract_components.detection._get_offline_data_catalog import resolve_catalog_source
+
+    return lru_cache(maxsize=None)(resolve_catalog_source(catalog))
+
+
+def run_checks(
+    checks: List[str],
+    contract_directory: str,
+    contract_names: List[str],
+    catalog: str = "live",
+    jobs: int = 1,
+    profiler=None,
+    analyze: bool = False,
+    contract_specs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run detection checks over a set of contracts.
+
+    Args:
+        checks: Names from CHECKS to run
+        contract_directory: Path to the directory containing contract specification JSON files
+        contract_names: Contracts (file stems) to check
+        catalog: Catalog source for the coverage and violations checks (see resolve_catalog_source)
+        jobs: Number of contract batches checked in parallel; the catalog is shared by all of them
+        profiler: PhaseProfiler shared by the detectors (defaults to DATA_CONTRACT_PROFILE)
+        analyze: Let the ANALYZE_CHECKS refresh the planner statistics of the declared tables first
+        contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+
+    Returns:
+        Violation dictionaries with keys check, contract_name, table_name, column_name and
+        violations, ordered by check and contract
+    """
+    if not contract_names:
+        return []
+    if profiler is None:
+        from data_contract_components.data_assets._phase_profiler import PhaseProfiler
+        profiler = PhaseProfiler.from_env("detection")
+
+    catalog_source = None
+    with profiler.phase("imports"):
+        for check in checks:
+            importlib.import_module(CHECK_MODULES[check])
+        if any(check in ("coverage", "violations") for check in checks):
+            catalog_source = _cached_catalog_source(catalog)
+    if catalog_source is not None:
+        # Load the catalog before fanning out, so the jobs do not race to read it
+        with profiler.phase("catalog_query"):
+            catalog_source()
+
+    jobs = max(1, min(jobs, len(contract_names)))
+    batches = [contract_names[index::jobs] for index in range(jobs)]
+    tasks = [(check, batch) for check in checks for batch in batches]
+
+    def run_task(task):
+        check, batch = task
+        options = {"contract_specs": contract_specs}
+        if check in ANALYZE_CHECKS:
+            options["analyze"] = analyze
+        return [
+            {"check": check, **violation}
+            for violation in CHECK_FUNCTIONS[check](contract_directory, batch, catalog_source, profiler, **options)
+        ]
+
+    if jobs == 1:
+        results = [run_task(task) for task in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(run_task, tasks))
+
+    order = {contract_name: index for index, contract_name in enumerate(contract_names)}
+    violations = [violation for result in results for violation in result]
+    return sorted(violations, key=lambda violation: (checks.index(violation["check"]), order[violation["contract_name"]]))
+
+
+def format_violations(violations: List[Dict[str, Any]], output_format: str) -> str:
+    """Render violations as text, JSON or GitHub Actions error annotations."""
+    if output_format == "json":
+        return json.dumps(violations, indent=2, default=str)
+
+    if output_format == "github":
+        # Workflow commands are one line each, so newlines in a message are escaped
+        def escape(message: str) -> str:
+            return message.replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+
+        return "\n".join(
+            f"::error title=Data contract {violation['contract_name']} ({violation['check']})::"
+            + escape(".".join(filter(None, (violation.get("table_name"), violation.get("column_name"))))
+                     + f": {violation['violations']}")
+            for violation in violations
+        )
+
+    if not violations:
+        return "No violations found"
+    lines = []
+    for i, violation in enumerate(violations, 1):
+        lines.append(f"{i}. Contract: {violation.get('contract_name') or 'N/A'} ({violation['check']})")
+        lines.append(f"   Table: {violation.get('table_name') or 'N/A'}")
+        lines.append(f"   Column: {violation.get('column_name') or 'N/A'}")
+        lines.append(f"   Issue: {violation.get('violations') or 'N/A'}")
+        lines.append("")
+    lines.append(f"{len(violations)} violation(s) found")
+    return "\n".join(lines)
+
+
+def list_contracts(
+    contract_directory: str,
+    contract_names: List[str],
+    output_format: str,
+    contract_specs: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Describe the contracts from their specs alone (no pandas, and no database unless they come from the registry)."""
+    from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+
+    contracts = []
+    specs = resolve_data_contract_specs(contract_directory, contract_names, contract_specs)
+    for contract_name, contract_spec in sorted(specs.items()):
+        schema = contract_spec.get("schema", {})
+        contracts.append({
+            "contract_name": contract_name,
+            "table_schema": schema.get("table_schema"),
+            "table_name": schema.get("table_name"),
+            "column_count": len(schema.get("properties", {})),
+            "owner": contract_spec.get("owner", {}).get("name"),
+        })
+
+    if output_format == "json":
+        return json.dumps(contracts, indent=2)
+    return "\n".join(
+        f"{contract['contract_name']}\t{contract['table_schema']}.{contract['table_name']}"
+        f"\t{contract['column_count']} columns\t{contract['owner'] or ''}"
+        for contract in contracts
+    )
+
+
+def find_changed_table_contracts(changed_tables: List[str]) -> Dict[str, Any]:
+    """
+    Look up the current registry specs of the contracts covering any of the changed tables.
+
+    Args:
+        changed_tables: Table names, schema-qualified unless they are in public
+
+    Returns:
+        {contract_name: spec}, as passed to the detectors as contract_specs
+    """
+    from data_contract_components.detection.contract_registry import ContractRegistry
+
+    registry = ContractRegistry()
+    contract_specs = {}
+    for changed_table in changed_tables:
+        table_schema, _, table_name = changed_table.rpartition(".")
+        contract_specs.update(registry.find_by_table(table_name, table_schema or "public"))
+    return contract_specs
+
+
+def _select_contracts(args) -> tuple:
+    """Resolve --contract and --changed-table to (contract_names, contract_specs); specs are None for the files."""
+    if not args.changed_tables:
+        return args.contract_names, None
+    contract_specs = find_changed_table_contracts(args.changed_tables)
+    if args.contract_names is not None:
+        contract_specs = {name: spec for name, spec in contract_specs.items() if name in args.contract_names}
+    return sorted(contract_specs), contract_specs
+
+
+def _shared_options(suppress_defaults: bool = False) -> argparse.ArgumentParser:
+    """
+    Options accepted both before and after the command.
+
+    The copy given to the subcommands has no defaults, so it only overrides what
+    was given before the command instead of resetting it.
+    """
+    def default(value):
+        return argparse.SUPPRESS if suppress_defaults else value
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--contract-directory", default=default(DEFAULT_CONTRACT_DIRECTORY),
+        help=f"Directory of contract spec files (default: {DEFAULT_CONTRACT_DIRECTORY})",
+    )
+    parser.add_argument(
+        "--contract", action="append", dest="contract_names", metavar="NAME", default=default(None),
+        help="Only check this contract (file stem); repeat for several (default: all)",
+    )
+    parser.add_argument(
+        "--changed-table", action="append", dest="changed_tables", metavar="[SCHEMA.]TABLE", default=default(None),
+        help="Only check the contracts covering this table, looked up in the contract registry "
+             "(run 'contract_registry sync' first); repeat for several",
+    )
+    parser.add_argument("--format", choices=FORMATS, default=default("text"), help="Output format (default: text)")
+    parser.add_argument(
+        "--profile", action="store_true", default=default(False), help="Print per-phase time and memory to stderr"
+    )
+    parser.add_argument(
+        "--profile-dir", metavar="DIR", default=default(None),
+        help="Profile, and also write cProfile stats and the phases to DIR",
+    )
+    return parser
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m data_contract_components.detection",
+        description="Check data contracts against the data catalog and the table data.",
+        epilog="Exit codes: 0 no violations, 1 violations found, 2 usage or runtime error.",
+        parents=[_shared_options()],
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    command_options = _shared_options(suppress_defaults=True)
+    subparsers.add_parser("list", help="List the contracts and the tables they cover", parents=[command_options])
+    for command, help_text in (
+        ("coverage", "Check that the contracted tables exist in the data catalog"),
+        ("violations", "Check the column constraints against the data catalog"),
+        ("data", "Check the table rows against the contract constraints (live database)"),
+        ("indexes", "Check the indexes the contracts declare (live database)"),
+        ("plans", "EXPLAIN the consumer queries the contracts declare (live database)"),
+        ("storage", "Check the size and bloat budgets the contracts declare (live database)"),
+        ("statistics", "Check the statistics thresholds the contracts declare (live database)"),
+        ("freshness", "Check the freshness expectations the contracts declare (live database)"),
+        ("all", "Run coverage and violations, plus the live database checks when the catalog is live"),
+    ):
+        check_parser = subparsers.add_parser(command, help=help_text, parents=[command_options])
+        check_parser.add_argument(
+            "--catalog", default="live",
+            help="Catalog source: live, migrations[:<revision>], pg_dump:<path> or snapshot:<path> (default: live)",
+        )
+        check_parser.add_argument(
+            "--jobs", "-j", type=int, default=1,
+            help="Contract batches checked in parallel (default: 1)",
+        )
+        check_parser.add_argument(
+            "--analyze", action="store_true",
+            help="ANALYZE the tables the plans and statistics checks read before checking them",
+        )
+    return parser
+
+
+def main(argv=None) -> int:
+    """Run the command line; returns the exit code."""
+
+    args = _build_parser().parse_args(argv)
+
+    try:
+        if args.command == "list":
+            contract_names, contract_specs = _select_contracts(args)
+            print(list_contracts(args.contract_directory, contract_names, args.format, contract_specs))
+            return EXIT_OK
+
+        if args.jobs < 1:
+            raise ValueError("--jobs must be at least 1")
+        if args.command == "all":
+            checks = ["coverage", "violations"] + (["data", "indexes", "plans", "storage", "statistics", "freshness"] if args.catalog == "live" else [])
+        else:
+            checks = [args.command]
+
+        from data_contract_components.data_assets._phase_profiler import PhaseProfiler
+        from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+
+        profile_setting = args.profile_dir or ("1" if args.profile else None)
+        profiler = PhaseProfiler.from_env(f"detection-{args.command}", profile_setting)
+        with profiler.run():
+            with profiler.phase("spec_load"):
+                contract_names, contract_specs = _select_contracts(args)
+                # Reading the specs up front also fails early on an unknown --contract
+                contract_names = sorted(resolve_data_contract_specs(args.contract_directory, contract_names, contract_specs))
+            violations = run_checks(
+                checks, args.contract_directory, contract_names, args.catalog, args.jobs, profiler, args.analyze,
+                contract_specs,
+            )
+            with profiler.phase("report"):
+                output = format_violations(violations, args.format)
+                if output:
+                    print(output)
+    except Exception as error:
+        print(f"error: {error}", file=sys.stderr)
+        return EXIT_ERROR
+
+    return EXIT_VIOLATIONS if violations else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import pandas as pd
+from typing import Any, Dict, Optional
+
+
+# Attributes that locate a column rather than describe it: dtd_identifier is the
+# column's attribute number, which shifts when an earlier column is dropped.
+POSITIONAL_ATTRIBUTES = ("dtd_identifier", "element_collection_type_identifier")
+KEY_ATTRIBUTES = ("table_schema", "table_name", "column_name")
+
+
+def table_key(table_schema: str, table_name: str) -> str:
+    """Key tables are fingerprinted and diffed under: "schema.table"."""
+    return f"{table_schema}.{table_name}"
+
+
+def table_keys(catalog_df: pd.DataFrame) -> pd.Series:
+    """The table key of every catalog row (works on categorical columns too)."""
+    return pd.Series(
+        [table_key(schema, name) for schema, name in zip(catalog_df["table_schema"], catalog_df["table_name"])],
+        index=catalog_df.index,
+        dtype=object,
+    )
+
+
+def _normalize(value: Any) -> Optional[Any]:
+    """Make a catalog value compare equal across sources: NaN/None -> None, 32.0 -> 32."""
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if hasattr(value, "item"):
+        return _normalize(value.item())
+    return value
+
+
+def get_column_attributes(catalog_df: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Collapse the data catalog into one attribute dictionary per column.
+
+    The catalog has one row per column and constraint; the constraint types of a
+    column are merged into a single comma-separated constraint_type.
+
+    Args:
+        catalog_df: DataFrame as returned by get_data_catalog()
+
+    Returns:
+        {"schema.table": {column_name: {attribute: value}}}
+    """
+    attribute_names = [
+        name for name in catalog_df.columns
+        if name not in KEY_ATTRIBUTES and name not in POSITIONAL_ATTRIBUTES
+    ]
+    tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    for row in catalog_df.to_dict("records"):
+        columns = tables.setdefault(table_key(row["table_schema"], row["table_name"]), {})
+        attributes = {name: _normalize(row[name]) for name in attribute_names}
+        existing = columns.get(row["column_name"])
+        if existing is None:
+            columns[row["column_name"]] = attributes
+        elif attributes["constraint_type"] is not None:
+            constraint_types = set(filter(None, (existing["constraint_type"] or "").split(", ")))
+            constraint_types.add(attributes["constraint_type"])
+            existing["constraint_type"] = ", ".join(sorted(constraint_types))
+
+    return tables
+
+
+def fingerprint_column(attributes: Dict[str, Any]) -> str:
+    """SHA-256 of a column's attributes."""
+    return hashlib.sha256(json.dumps(attributes, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def fingerprint_table(column_fingerprints: Dict[str, str]) -> str:
+    """SHA-256 of a table's column names and column fingerprints (independent of column order)."""
+    digest = hashlib.sha256()
+    for column_name in sorted(column_fingerprints):
+        digest.update(f"{column_name}\t{column_fingerprints[column_name]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def compute_column_fingerprints(catalog_df: pd.DataFrame) -> Dict[str, Dict[str, str]]:
+    """Return {"schema.table": {column_name: fingerprint}} for a data catalog."""
+    return {
+        key: {column_name: fingerprint_column(attributes) for column_name, attributes in columns.items()}
+        for key, columns in get_column_attributes(catalog_df).items()
+    }
+
+
+def compute_table_fingerprints(catalog_df: pd.DataFrame) -> Dict[str, str]:
+    """Return {"schema.table": fingerprint} for a data catalog."""
+    return {
+        key: fingerprint_table(column_fingerprints)
+        for key, column_fingerprints in compute_column_fingerprints(catalog_df).items()
+    }
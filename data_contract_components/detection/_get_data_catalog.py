@@ -1,15 +1,13 @@
+import numpy as np
 import pandas as pd
+from array import array
+from typing import Iterable, List, Optional, Tuple
 from data_contract_components.data_assets._query_postgres_helper import PostgresDB
 
 
-def get_data_catalog() -> pd.DataFrame:
-    """    
-    This function queries the PostgreSQL information_schema to get detailed
-    information about all columns in public tables, including their metadata
-    and any associated comments.
-    """
-    sql = PostgresDB()
-    sql_query_str = """
+# Catalog query over the PostgreSQL information_schema: one row per column of the
+# public tables, with its metadata, comment, array element type and constraint.
+DATA_CATALOG_SQL = """
 
     -- https://www.postgresql.org/docs/17/infoschema-columns.html
     -- You can extract the schema of columns from the information_schema.columns table.
@@ -140,4 +138,207 @@ def get_data_catalog() -> pd.DataFrame:
         columns_data.ordinal_position
     """
 
-    return sql.query(sql_query_str)
+
+# Columns of the catalog query, in order.
+DATA_CATALOG_COLUMNS = [
+    "table_catalog",
+    "table_schema",
+    "table_name",
+    "column_name",
+    "col_description",
+    "column_default",
+    "is_nullable",
+    "data_type",
+    "character_maximum_length",
+    "numeric_precision",
+    "datetime_precision",
+    "interval_type",
+    "udt_name",
+    "is_updatable",
+    "dtd_identifier",
+    "element_collection_type_identifier",
+    "element_data_type",
+    "element_character_maximum_length",
+    "element_numeric_precision",
+    "element_datetime_precision",
+    "element_interval_type",
+    "element_udt_name",
+    "constraint_type",
+]
+
+# Text columns with few distinct values (or heavily repeated ones, like table and
+# column names) are stored as categoricals: one small integer code per row instead
+# of a separate Python string object per row. col_description and column_default
+# are close to unique per row and stay plain objects.
+CATEGORICAL_COLUMNS = [
+    "table_catalog",
+    "table_schema",
+    "table_name",
+    "column_name",
+    "is_nullable",
+    "data_type",
+    "interval_type",
+    "udt_name",
+    "is_updatable",
+    "dtd_identifier",
+    "element_collection_type_identifier",
+    "element_data_type",
+    "element_interval_type",
+    "element_udt_name",
+    "constraint_type",
+]
+
+# Lengths and precisions as nullable integers rather than NaN-padded float64.
+INTEGER_COLUMNS = {
+    "character_maximum_length": "Int32",
+    "numeric_precision": "Int16",
+    "datetime_precision": "Int16",
+    "element_character_maximum_length": "Int32",
+    "element_numeric_precision": "Int16",
+    "element_datetime_precision": "Int16",
+}
+
+
+def compact_data_catalog(catalog_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a catalog DataFrame to its compact dtypes (categoricals and nullable integers).
+
+    Columns the catalog does not have are skipped, so this also works on a column
+    subset. Converting an already compact catalog is a no-op.
+    """
+    dtypes = {column: "category" for column in CATEGORICAL_COLUMNS if column in catalog_df.columns}
+    dtypes.update({column: dtype for column, dtype in INTEGER_COLUMNS.items() if column in catalog_df.columns})
+    return catalog_df.astype(dtypes)
+
+
+def build_compact_data_catalog(
+    chunks: Iterable[Tuple[List[str], List[tuple]]],
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Build a compact catalog DataFrame from chunks of fetched rows.
+
+    Categorical columns are interned as they stream in: each value is looked up in
+    a per-column dictionary and only its integer code is kept, so neither the full
+    list of fetched rows nor an object-dtype copy of the catalog ever exists.
+
+    Args:
+        chunks: (column_names, rows) pairs, e.g. from PostgresDB.query_chunks
+        columns: Column names to use when there are no rows at all
+
+    Returns:
+        The catalog in compact dtypes
+    """
+    column_names = None
+    categories, codes, values = {}, {}, {}
+
+    for chunk_columns, rows in chunks:
+        if column_names is None:
+            column_names = chunk_columns
+            for name in column_names:
+                if name in CATEGORICAL_COLUMNS:
+                    categories[name], codes[name] = {}, array("i")
+                else:
+                    values[name] = []
+
+        for index, name in enumerate(column_names):
+            if name in categories:
+                lookup = categories[name]
+                codes[name].extend(
+                    -1 if row[index] is None else lookup.setdefault(row[index], len(lookup))
+                    for row in rows
+                )
+            else:
+                values[name].extend(row[index] for row in rows)
+
+    if column_names is None:
+        return compact_data_catalog(pd.DataFrame(columns=columns or DATA_CATALOG_COLUMNS))
+
+    return compact_data_catalog(pd.DataFrame({
+        name: (
+            pd.Categorical.from_codes(np.frombuffer(codes[name], dtype=np.int32), categories=list(categories[name]))
+            if name in categories else values[name]
+        )
+        for name in column_names
+    }))
+
+
+def merge_on_codes(left: pd.DataFrame, right: pd.DataFrame, on: List[str], **merge_kwargs) -> pd.DataFrame:
+    """
+    Merge two DataFrames on integer codes of their key columns.
+
+    Merging on the key columns directly would convert categorical keys whose
+    categories differ between the two frames back to Python objects. Instead,
+    every key column is encoded against the categories of both sides and the codes
+    are folded into a single integer key. The key columns of `left` are kept; those
+    of `right` are dropped.
+
+    Args:
+        left: Left DataFrame
+        right: Right DataFrame
+        on: Key columns present in both frames
+        **merge_kwargs: Passed to DataFrame.merge (how, suffixes, indicator, ...)
+
+    Returns:
+        The merged DataFrame
+    """
+    left_key = np.zeros(len(left), dtype=np.int64)
+    right_key = np.zeros(len(right), dtype=np.int64)
+
+    for column in on:
+        categories = pd.Index(pd.unique(pd.concat([
+            pd.Series(left[column].dropna().unique()),
+            pd.Series(right[column].dropna().unique()),
+        ], ignore_index=True).astype(object)))
+        # Missing keys get code -1 on both sides and so still match each other
+        left_codes = pd.Categorical(left[column], categories=categories).codes.astype(np.int64) + 1
+        right_codes = pd.Categorical(right[column], categories=categories).codes.astype(np.int64) + 1
+
+        # Re-factorize after folding in each column so the combined key stays small
+        combined, _ = pd.factorize(np.concatenate([
+            left_key * (len(categories) + 1) + left_codes,
+            right_key * (len(categories) + 1) + right_codes,
+        ]))
+        left_key, right_key = combined[:len(left)], combined[len(left):]
+
+    merged = left.assign(_merge_code=left_key).merge(
+        right.drop(columns=on).assign(_merge_code=right_key),
+        on="_merge_code",
+        **merge_kwargs,
+    )
+    return merged.drop(columns="_merge_code")
+
+
+def get_data_catalog(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """    
+    This function queries the PostgreSQL information_schema to get detailed
+    information about all columns in public tables, including their metadata
+    and any associated comments.
+
+    Pass `columns` to fetch only the catalog fields a check needs; the result is
+    returned in compact dtypes (see compact_data_catalog).
+    """
+    sql = PostgresDB()
+    if columns is None:
+        return build_compact_data_catalog(sql.query_chunks(DATA_CATALOG_SQL))
+
+    select_list = ", ".join(f"catalog.{column}" for column in columns)
+    return build_compact_data_catalog(
+        sql.query_chunks(f"SELECT {select_list} FROM ({DATA_CATALOG_SQL}) AS catalog"),
+        columns,
+    )
+
+
+def get_data_catalog_from_connection(connection) -> pd.DataFrame:
+    """
+    Run the catalog query on an existing SQLAlchemy connection.
+
+    Used by the alembic contract gate: reading the catalog inside the migration
+    transaction is the only way to see DDL that has not been committed yet.
+    """
+    result = connection.execution_options(stream_results=True).exec_driver_sql(DATA_CATALOG_SQL)
+    column_names = list(result.keys())
+    return build_compact_data_catalog(
+        ((column_names, rows) for rows in result.partitions(10000)),
+        column_names,
+    )
@@ -2,14 +2,34 @@ import json
 from pathlib import Path
 
 
-def get_data_contract_specs(contract_directory):
+def get_data_contract_specs(contract_directory, contract_names=None):
     contract_specs = {}
     
     contract_dir = Path(contract_directory)
-    for file_path in contract_dir.glob("*.json"):
+    if contract_names is None:
+        file_paths = contract_dir.glob("*.json")
+    else:
+        # Only read the requested contracts, e.g. one shard of the prevention suite
+        file_paths = [contract_dir / f"{contract_name}.json" for contract_name in contract_names]
+
+    for file_path in file_paths:
         with open(file_path, 'r') as file:
             contract_spec = json.load(file)
             contract_name = file_path.stem
             contract_specs[contract_name] = contract_spec
             
-    return contract_specs
\ No newline at end of file
+    return contract_specs
+
+def resolve_data_contract_specs(contract_directory, contract_names=None, contract_specs=None):
+    """
+    Return the specs a detector checks, {contract_name: spec}.
+
+    contract_specs are specs that were already loaded, e.g. by a ContractRegistry
+    lookup; when given they are checked instead of the files in contract_directory.
+    Either way contract_names (None for all) selects which of them are checked.
+    """
+    if contract_specs is None:
+        return get_data_contract_specs(contract_directory, contract_names)
+    if contract_names is None:
+        return contract_specs
+    return {contract_name: contract_specs[contract_name] for contract_name in contract_names}
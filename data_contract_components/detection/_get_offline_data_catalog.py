@@ -0,0 +1,598 @@
+import io
+import re
+import pandas as pd
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from data_contract_components.detection._get_data_catalog import DATA_CATALOG_COLUMNS, compact_data_catalog, get_data_catalog
+
+
+DEFAULT_MIGRATIONS_DIRECTORY = Path(__file__).resolve().parents[1] / "data_assets" / "db_migrations"
+
+# SQL type name -> (information_schema data_type, udt_name, numeric_precision,
+# datetime_precision). Types taking a length or precision are handled in
+# _resolve_type.
+_SIMPLE_TYPES: Dict[str, Tuple[str, str, Optional[int], Optional[int]]] = {
+    "smallint": ("smallint", "int2", 16, None),
+    "int2": ("smallint", "int2", 16, None),
+    "integer": ("integer", "int4", 32, None),
+    "int": ("integer", "int4", 32, None),
+    "int4": ("integer", "int4", 32, None),
+    "bigint": ("bigint", "int8", 64, None),
+    "int8": ("bigint", "int8", 64, None),
+    "real": ("real", "float4", 24, None),
+    "float4": ("real", "float4", 24, None),
+    "double precision": ("double precision", "float8", 53, None),
+    "float": ("double precision", "float8", 53, None),
+    "float8": ("double precision", "float8", 53, None),
+    "text": ("text", "text", None, None),
+    "boolean": ("boolean", "bool", None, None),
+    "bool": ("boolean", "bool", None, None),
+    "json": ("json", "json", None, None),
+    "jsonb": ("jsonb", "jsonb", None, None),
+    "uuid": ("uuid", "uuid", None, None),
+    "bytea": ("bytea", "bytea", None, None),
+    "date": ("date", "date", None, 0),
+}
+
+_SERIAL_TYPES = {"smallserial": "smallint", "serial": "integer", "bigserial": "bigint"}
+
+_TABLE_CONSTRAINT_KEYWORDS = ("constraint", "primary", "unique", "foreign", "check", "exclude", "like")
+
+
+def _split_statements(sql_text: str) -> List[str]:
+    """
+    Split a SQL script into statements on top-level semicolons.
+
+    Quoted strings, quoted identifiers, dollar-quoted bodies and comments are
+    skipped over, so semicolons inside them do not end a statement. Comments are
+    dropped from the returned statements.
+    """
+    statements = []
+    current = []
+    i = 0
+    while i < len(sql_text):
+        char = sql_text[i]
+        if sql_text.startswith("--", i):
+            end = sql_text.find("\n", i)
+            i = len(sql_text) if end == -1 else end
+            continue
+        if sql_text.startswith("/*", i):
+            end = sql_text.find("*/", i + 2)
+            i = len(sql_text) if end == -1 else end + 2
+            continue
+        if char in ("'", '"'):
+            end = i + 1
+            while end < len(sql_text):
+                if sql_text[end] == char:
+                    if sql_text[end + 1:end + 2] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql_text[i:end + 1])
+            i = end + 1
+            continue
+        dollar = re.match(r"\$[A-Za-z_]*\$", sql_text[i:])
+        if dollar:
+            tag = dollar.group(0)
+            end = sql_text.find(tag, i + len(tag))
+            end = len(sql_text) if end == -1 else end + len(tag)
+            current.append(sql_text[i:end])
+            i = end
+            continue
+        if char == ";":
+            statements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+
+    statements.append("".join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+def _split_top_level(text: str, separator: str = ",") -> List[str]:
+    """Split on a separator that is not inside parentheses or quotes."""
+    parts, current, depth, quote = [], [], 0, None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def _parenthesized(text: str, start: int) -> Tuple[str, int]:
+    """Return the contents of the parenthesis group opening at text[start] and the index after it."""
+    depth, quote = 0, None
+    for i in range(start, len(text)):
+        char = text[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i], i + 1
+    raise ValueError(f"Unbalanced parentheses in: {text[start:start + 80]}")
+
+
+def _identifier(name: str) -> str:
+    """Normalize an identifier the way Postgres does: quoted names keep their case."""
+    name = name.strip()
+    if name.startswith('"') and name.endswith('"'):
+        return name[1:-1].replace('""', '"')
+    return name.lower()
+
+
+_NAME = r'(?:"(?:[^"]|"")+"|[A-Za-z_][\w$]*)'
+_QUALIFIED_NAME = rf"{_NAME}(?:\s*\.\s*{_NAME})*"
+
+
+def _qualified(name: str) -> Tuple[str, str]:
+    """Resolve a possibly schema-qualified table name to (schema, table); the default schema is public."""
+    parts = [_identifier(part) for part in re.findall(_NAME, name)]
+    if len(parts) == 1:
+        return ("public", parts[0])
+    return (parts[-2], parts[-1])
+
+
+def _column_list(text: str) -> List[str]:
+    return [_identifier(column) for column in _split_top_level(text)]
+
+
+def _unquote_literal(text: str) -> Optional[str]:
+    text = text.strip()
+    if text.upper() == "NULL":
+        return None
+    if text[:1].upper() == "E" and text[1:2] == "'":
+        text = text[1:]
+    return text[1:-1].replace("''", "'")
+
+
+def _normalize_default(default: str) -> str:
+    """
+    Render a default expression the way information_schema shows it.
+
+    Regclass literals are printed relative to the search_path, so pg_dump's
+    'public.object_object_id_seq'::regclass reads 'object_object_id_seq'::regclass.
+    """
+    return re.sub(r"'public\.([^']*)'::regclass", r"'\1'::regclass", default.strip())
+
+
+def _resolve_type(type_sql: str) -> Dict[str, Optional[object]]:
+    """
+    Map a SQL type as written in DDL to the information_schema fields of a column.
+
+    Returns:
+        Dictionary with data_type, udt_name, character_maximum_length,
+        numeric_precision, datetime_precision and, for arrays, element_data_type
+        and element_udt_name
+    """
+    written_type = type_sql.strip()
+    type_sql = re.sub(r"\s+", " ", written_type.lower())
+    type_sql = re.sub(r"^pg_catalog\.", "", type_sql)
+
+    array_match = re.match(r"^(.*?)\s*((?:\[\d*\])+|\s+array(?:\[\d*\])?)$", type_sql)
+    if array_match:
+        element = _resolve_type(array_match.group(1))
+        return {
+            "data_type": "ARRAY",
+            "udt_name": "_" + element["udt_name"],
+            "character_maximum_length": None,
+            "numeric_precision": None,
+            "datetime_precision": None,
+            "element_data_type": element["data_type"],
+            "element_udt_name": element["udt_name"],
+        }
+
+    resolved = {
+        "character_maximum_length": None,
+        "numeric_precision": None,
+        "datetime_precision": None,
+        "element_data_type": None,
+        "element_udt_name": None,
+    }
+    modifier_match = re.match(r"^([a-z ]+?)\s*\(([^)]*)\)\s*(.*)$", type_sql)
+    base, modifiers, suffix = (
+        (modifier_match.group(1), modifier_match.group(2), modifier_match.group(3))
+        if modifier_match else (type_sql, None, "")
+    )
+    base = f"{base} {suffix}".strip()
+    first_modifier = int(modifiers.split(",")[0]) if modifiers else None
+
+    if base in _SIMPLE_TYPES:
+        data_type, udt_name, numeric_precision, datetime_precision = _SIMPLE_TYPES[base]
+        resolved.update(data_type=data_type, udt_name=udt_name,
+                        numeric_precision=numeric_precision, datetime_precision=datetime_precision)
+    elif base in ("varchar", "character varying"):
+        resolved.update(data_type="character varying", udt_name="varchar", character_maximum_length=first_modifier)
+    elif base in ("char", "character", "bpchar"):
+        resolved.update(data_type="character", udt_name="bpchar",
+                        character_maximum_length=first_modifier if first_modifier is not None else 1)
+    elif base in ("numeric", "decimal"):
+        resolved.update(data_type="numeric", udt_name="numeric", numeric_precision=first_modifier)
+    elif base in ("timestamp", "timestamp without time zone"):
+        resolved.update(data_type="timestamp without time zone", udt_name="timestamp",
+                        datetime_precision=6 if first_modifier is None else first_modifier)
+    elif base in ("timestamptz", "timestamp with time zone"):
+        resolved.update(data_type="timestamp with time zone", udt_name="timestamptz",
+                        datetime_precision=6 if first_modifier is None else first_modifier)
+    elif base in ("time", "time without time zone"):
+        resolved.update(data_type="time without time zone", udt_name="time",
+                        datetime_precision=6 if first_modifier is None else first_modifier)
+    elif base in ("timetz", "time with time zone"):
+        resolved.update(data_type="time with time zone", udt_name="timetz",
+                        datetime_precision=6 if first_modifier is None else first_modifier)
+    elif base.startswith("interval"):
+        resolved.update(data_type="interval", udt_name="interval",
+                        datetime_precision=6 if first_modifier is None else first_modifier)
+    else:
+        # Enums, domains and other user-defined types
+        resolved.update(data_type="USER-DEFINED", udt_name=_qualified(written_type)[1])
+
+    return resolved
+
+
+class _SchemaModel:
+    """
+    In-memory model of the tables a DDL script creates.
+
+    Tables are keyed by (schema, table) and hold their columns in attribute order
+    plus their PRIMARY KEY / UNIQUE constraints. Statements that do not change
+    table columns or key constraints (indexes, views, sequences, DO blocks, DML)
+    are ignored.
+    """
+
+    def __init__(self) -> None:
+        self.tables: Dict[Tuple[str, str], Dict] = {}
+
+    def apply(self, statement: str) -> None:
+        """Apply one DDL statement to the model."""
+        normalized = re.sub(r"\s+", " ", statement).strip()
+        upper = normalized.upper()
+
+        if re.match(r"^CREATE (?:(?:GLOBAL |LOCAL )?(?:TEMPORARY |TEMP )|UNLOGGED )?TABLE ", upper):
+            self._create_table(normalized)
+        elif upper.startswith("ALTER TABLE "):
+            self._alter_table(normalized)
+        elif upper.startswith("DROP TABLE "):
+            self._drop_table(normalized)
+        elif upper.startswith("COMMENT ON COLUMN "):
+            self._comment_on_column(normalized)
+
+    def _new_table(self, key: Tuple[str, str]) -> Dict:
+        table = {"columns": {}, "constraints": [], "next_attnum": 1}
+        self.tables[key] = table
+        return table
+
+    def _add_column(self, table: Dict, definition: str, table_name: str) -> None:
+        match = re.match(rf"^({_NAME})\s+(.*)$", definition)
+        column_name = _identifier(match.group(1))
+        rest = match.group(2)
+
+        # The type runs up to the first column constraint keyword
+        keyword = re.search(
+            r"\s(?:COLLATE|DEFAULT|NOT NULL|NULL|PRIMARY KEY|UNIQUE|REFERENCES|CHECK|CONSTRAINT|GENERATED)\b",
+            " " + rest, flags=re.IGNORECASE,
+        )
+        type_sql = rest if keyword is None else (" " + rest)[:keyword.start()].strip()
+        constraints = "" if keyword is None else (" " + rest)[keyword.start():]
+
+        default = None
+        default_match = re.search(
+            r"\bDEFAULT\s+(.+?)(?=\s+(?:NOT NULL|NULL|PRIMARY KEY|UNIQUE|REFERENCES|CHECK|CONSTRAINT|COLLATE)\b|$)",
+            constraints, flags=re.IGNORECASE,
+        )
+        if default_match:
+            default = _normalize_default(default_match.group(1))
+
+        not_null = bool(re.search(r"\bNOT NULL\b", constraints, flags=re.IGNORECASE))
+        serial = _SERIAL_TYPES.get(type_sql.lower())
+        if serial:
+            type_sql = serial
+            not_null = True
+            default = f"nextval('{table_name}_{column_name}_seq'::regclass)"
+
+        table["columns"][column_name] = {
+            "type": _resolve_type(type_sql),
+            "not_null": not_null,
+            "default": default,
+            "comment": None,
+            "attnum": table["next_attnum"],
+        }
+        table["next_attnum"] += 1
+
+        if re.search(r"\bPRIMARY KEY\b", constraints, flags=re.IGNORECASE):
+            self._add_constraint(table, "PRIMARY KEY", [column_name])
+        elif re.search(r"\bUNIQUE\b", constraints, flags=re.IGNORECASE):
+            self._add_constraint(table, "UNIQUE", [column_name])
+
+    def _add_constraint(self, table: Dict, constraint_type: str, columns: List[str]) -> None:
+        table["constraints"].append({"type": constraint_type, "columns": columns})
+        if constraint_type == "PRIMARY KEY":
+            for column_name in columns:
+                table["columns"][column_name]["not_null"] = True
+
+    def _table_constraint(self, table: Dict, definition: str) -> None:
+        definition = re.sub(rf"^CONSTRAINT\s+{_NAME}\s+", "", definition, flags=re.IGNORECASE)
+        key_match = re.match(r"^(PRIMARY KEY|UNIQUE)\s*(?:NULLS (?:NOT )?DISTINCT\s*)?\(", definition, flags=re.IGNORECASE)
+        if key_match:
+            columns, _ = _parenthesized(definition, key_match.end() - 1)
+            self._add_constraint(table, key_match.group(1).upper(), _column_list(columns))
+
+    def _create_table(self, statement: str) -> None:
+        match = re.match(
+            rf"^CREATE (?:[A-Z ]+ )?TABLE (?:IF NOT EXISTS )?({_QUALIFIED_NAME})\s*(.*)$",
+            statement, flags=re.IGNORECASE,
+        )
+        key = _qualified(match.group(1))
+        rest = match.group(2)
+        if key in self.tables and re.search(r"\bIF NOT EXISTS\b", statement[:match.start(1)], flags=re.IGNORECASE):
+            return
+
+        partition_match = re.match(rf"^PARTITION OF ({_QUALIFIED_NAME})", rest, flags=re.IGNORECASE)
+        if partition_match:
+            parent = self.tables[_qualified(partition_match.group(1))]
+            table = self._new_table(key)
+            for column_name, column in parent["columns"].items():
+                table["columns"][column_name] = {**column, "comment": None, "attnum": table["next_attnum"]}
+                table["next_attnum"] += 1
+            return
+
+        table = self._new_table(key)
+        body, _ = _parenthesized(rest, rest.index("("))
+        for definition in _split_top_level(body):
+            first_word = definition.split()[0].lower()
+            if first_word == "like":
+                self._create_like(table, definition)
+            elif first_word in _TABLE_CONSTRAINT_KEYWORDS:
+                self._table_constraint(table, definition)
+            else:
+                self._add_column(table, definition, key[1])
+
+    def _create_like(self, table: Dict, definition: str) -> None:
+        match = re.match(rf"^LIKE\s+({_QUALIFIED_NAME})(.*)$", definition, flags=re.IGNORECASE)
+        source = self.tables[_qualified(match.group(1))]
+        options = match.group(2).upper()
+        including_all = "INCLUDING ALL" in options
+        for column_name, column in source["columns"].items():
+            table["columns"][column_name] = {
+                **column,
+                "default": column["default"] if including_all or "INCLUDING DEFAULTS" in options else None,
+                "comment": column["comment"] if including_all or "INCLUDING COMMENTS" in options else None,
+                "attnum": table["next_attnum"],
+            }
+            table["next_attnum"] += 1
+        if including_all or "INCLUDING INDEXES" in options:
+            table["constraints"].extend(dict(constraint) for constraint in source["constraints"])
+
+    def _alter_table(self, statement: str) -> None:
+        match = re.match(
+            rf"^ALTER TABLE (?:IF EXISTS )?(?:ONLY )?({_QUALIFIED_NAME})\s+(.*)$",
+            statement, flags=re.IGNORECASE,
+        )
+        key = _qualified(match.group(1))
+        if key not in self.tables:
+            return
+        table = self.tables[key]
+
+        for action in _split_top_level(match.group(2)):
+            rename_table = re.match(rf"^RENAME TO ({_NAME})$", action, flags=re.IGNORECASE)
+            rename_column = re.match(rf"^RENAME (?:COLUMN )?({_NAME}) TO ({_NAME})$", action, flags=re.IGNORECASE)
+            set_schema = re.match(rf"^SET SCHEMA ({_NAME})$", action, flags=re.IGNORECASE)
+            add_column = re.match(r"^ADD (?:COLUMN )?(?:IF NOT EXISTS )?(.*)$", action, flags=re.IGNORECASE)
+            drop_column = re.match(rf"^DROP (?:COLUMN )?(?:IF EXISTS )?({_NAME})(?: CASCADE| RESTRICT)?$", action, flags=re.IGNORECASE)
+            alter_column = re.match(rf"^ALTER (?:COLUMN )?({_NAME}) (.*)$", action, flags=re.IGNORECASE)
+            drop_constraint = re.match(r"^DROP CONSTRAINT ", action, flags=re.IGNORECASE)
+
+            if rename_table:
+                self.tables[(key[0], _identifier(rename_table.group(1)))] = self.tables.pop(key)
+                return
+            elif set_schema:
+                self.tables[(_identifier(set_schema.group(1)), key[1])] = self.tables.pop(key)
+                return
+            elif rename_column:
+                old, new = _identifier(rename_column.group(1)), _identifier(rename_column.group(2))
+                table["columns"] = {new if name == old else name: column for name, column in table["columns"].items()}
+                for constraint in table["constraints"]:
+                    constraint["columns"] = [new if name == old else name for name in constraint["columns"]]
+            elif drop_constraint:
+                # Constraint names are not modelled; the only named constraints
+                # migrations drop here are keys that get recreated right after.
+                if re.search(r"_pkey\b", action, flags=re.IGNORECASE):
+                    table["constraints"] = [c for c in table["constraints"] if c["type"] != "PRIMARY KEY"]
+            elif add_column and re.match(r"^(CONSTRAINT|PRIMARY|UNIQUE|FOREIGN|CHECK|EXCLUDE)\b", add_column.group(1), flags=re.IGNORECASE):
+                self._table_constraint(table, add_column.group(1))
+            elif add_column:
+                self._add_column(table, add_column.group(1), key[1])
+            elif drop_column:
+                column_name = _identifier(drop_column.group(1))
+                table["columns"].pop(column_name, None)
+                table["constraints"] = [c for c in table["constraints"] if column_name not in c["columns"]]
+            elif alter_column:
+                self._alter_column(table, _identifier(alter_column.group(1)), alter_column.group(2))
+
+    def _alter_column(self, table: Dict, column_name: str, action: str) -> None:
+        column = table["columns"][column_name]
+        upper = action.upper()
+        type_match = re.match(r"^(?:SET DATA )?TYPE (.+?)(?: COLLATE .*| USING .*)?$", action, flags=re.IGNORECASE)
+        if type_match:
+            column["type"] = _resolve_type(type_match.group(1))
+        elif upper == "SET NOT NULL":
+            column["not_null"] = True
+        elif upper == "DROP NOT NULL":
+            column["not_null"] = False
+        elif upper.startswith("SET DEFAULT "):
+            column["default"] = _normalize_default(action[len("SET DEFAULT "):])
+        elif upper == "DROP DEFAULT":
+            column["default"] = None
+
+    def _drop_table(self, statement: str) -> None:
+        names = re.sub(r"^DROP TABLE (?:IF EXISTS )?", "", statement, flags=re.IGNORECASE)
+        names = re.sub(r"\s+(?:CASCADE|RESTRICT)$", "", names, flags=re.IGNORECASE)
+        for name in _split_top_level(names):
+            self.tables.pop(_qualified(name), None)
+
+    def _comment_on_column(self, statement: str) -> None:
+        match = re.match(rf"^COMMENT ON COLUMN ({_QUALIFIED_NAME}) IS (.*)$", statement, flags=re.IGNORECASE | re.DOTALL)
+        parts = [_identifier(part) for part in re.findall(_NAME, match.group(1))]
+        key = ("public", parts[0]) if len(parts) == 2 else (parts[-3], parts[-2])
+        if key in self.tables and parts[-1] in self.tables[key]["columns"]:
+            self.tables[key]["columns"][parts[-1]]["comment"] = _unquote_literal(match.group(2))
+
+    def to_data_catalog(self, table_catalog: str, table_schema: str = "public") -> pd.DataFrame:
+        """Render the modelled tables of one schema as a get_data_catalog() DataFrame."""
+        rows = []
+        for (schema, table_name), table in sorted(self.tables.items(), key=lambda item: item[0][1]):
+            if schema != table_schema:
+                continue
+            for column_name, column in sorted(table["columns"].items(), key=lambda item: item[1]["attnum"]):
+                column_type = column["type"]
+                dtd_identifier = str(column["attnum"])
+                is_array = column_type["data_type"] == "ARRAY"
+                constraint_types = [
+                    constraint["type"] for constraint in table["constraints"]
+                    if column_name in constraint["columns"]
+                ] or [None]
+                for constraint_type in constraint_types:
+                    rows.append((
+                        table_catalog,
+                        schema,
+                        table_name,
+                        column_name,
+                        column["comment"],
+                        column["default"],
+                        "NO" if column["not_null"] else "YES",
+                        column_type["data_type"],
+                        column_type["character_maximum_length"],
+                        column_type["numeric_precision"],
+                        column_type["datetime_precision"],
+                        None,
+                        column_type["udt_name"],
+                        "YES",
+                        dtd_identifier,
+                        dtd_identifier if is_array else None,
+                        column_type["element_data_type"],
+                        None,
+                        None,
+                        None,
+                        None,
+                        column_type["element_udt_name"],
+                        constraint_type,
+                    ))
+        return compact_data_catalog(pd.DataFrame(rows, columns=DATA_CATALOG_COLUMNS))
+
+
+def get_data_catalog_from_sql(sql_text: str, table_catalog: str = "postgres") -> pd.DataFrame:
+    """
+    Build the data catalog from a DDL script instead of a live database.
+
+    Accepts both alembic's offline (--sql) output and pg_dump --schema-only output.
+    Column types, nullability, defaults, comments and PRIMARY KEY / UNIQUE
+    constraints are modelled; views, CHECK and FOREIGN KEY constraints are not.
+
+    Args:
+        sql_text: The DDL script
+        table_catalog: Database name reported as table_catalog
+
+    Returns:
+        DataFrame with the same columns as get_data_catalog()
+    """
+    model = _SchemaModel()
+    for statement in _split_statements(sql_text):
+        model.apply(statement)
+    return model.to_data_catalog(table_catalog)
+
+
+def get_data_catalog_from_pg_dump(dump_path: str, table_catalog: str = "postgres") -> pd.DataFrame:
+    """Build the data catalog from a pg_dump --schema-only file."""
+    return get_data_catalog_from_sql(Path(dump_path).read_text(encoding="utf-8"), table_catalog)
+
+
+def render_migrations_sql(
+    revision: str = "head",
+    migrations_directory: Path = DEFAULT_MIGRATIONS_DIRECTORY,
+) -> str:
+    """
+    Render the alembic migrations up to a revision as SQL, without a database.
+
+    Uses alembic's offline mode (the same as `alembic upgrade head --sql`), which
+    runs every migration script against a SQL emitter instead of a connection.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    output = io.StringIO()
+    config = Config(output_buffer=output)
+    config.set_main_option("script_location", str(migrations_directory))
+    config.set_main_option("sqlalchemy.url", "postgresql://")
+    command.upgrade(config, revision, sql=True)
+    return output.getvalue()
+
+
+def get_data_catalog_from_migrations(
+    revision: str = "head",
+    migrations_directory: Path = DEFAULT_MIGRATIONS_DIRECTORY,
+    table_catalog: str = "postgres",
+) -> pd.DataFrame:
+    """
+    Build the data catalog the alembic migrations produce, without a database.
+
+    Args:
+        revision: Revision to render up to
+        migrations_directory: The alembic script directory
+        table_catalog: Database name reported as table_catalog
+
+    Returns:
+        DataFrame with the same columns as get_data_catalog()
+    """
+    return get_data_catalog_from_sql(render_migrations_sql(revision, migrations_directory), table_catalog)
+
+
+def resolve_catalog_source(source: str) -> Callable[[], pd.DataFrame]:
+    """
+    Turn a catalog source description into a catalog_source callable for the detectors.
+
+    Supported sources:
+        live                     query the database (get_data_catalog)
+        migrations[:<revision>]  render the alembic migrations (default revision: head)
+        pg_dump:<path>           parse a pg_dump --schema-only file
+        snapshot:<path>          load a catalog_snapshot Parquet file
+
+    Args:
+        source: The source description
+
+    Returns:
+        Callable returning the data catalog DataFrame
+    """
+    kind, _, argument = source.partition(":")
+    if kind == "live":
+        return get_data_catalog
+    if kind == "migrations":
+        return lambda: get_data_catalog_from_migrations(argument or "head")
+    if kind == "pg_dump" and argument:
+        return lambda: get_data_catalog_from_pg_dump(argument)
+    if kind == "snapshot" and argument:
+        # Imported here because catalog_snapshot builds on this module
+        from data_contract_components.detection.catalog_snapshot import load_catalog_snapshot
+        return lambda: load_catalog_snapshot(argument)
+    raise ValueError(
+        f"Unknown catalog source '{source}' "
+        "(expected live, migrations[:<revision>], pg_dump:<path> or snapshot:<path>)"
+    )
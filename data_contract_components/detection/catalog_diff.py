@@ -0,0 +1,173 @@
+"""
+Structural diff between two data catalogs.
+
+Every table and column of a catalog is fingerprinted (see _catalog_fingerprints),
+and only the tables whose fingerprints differ are compared column by column.
+Catalog snapshots carry their table fingerprints in the file metadata, so
+diffing two snapshots reads just the rows of the changed tables:
+
+    python -m data_contract_components.detection.catalog_diff snapshot:before.parquet live
+    python -m data_contract_components.detection.catalog_diff snapshot:before.parquet migrations --json
+
+Both sides accept any catalog source (see resolve_catalog_source).  The changed
+tables of a diff are what needs re-validating, e.g. with
+ContractRegistry.find_by_table().
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+import pandas as pd
+from data_contract_components.detection._catalog_fingerprints import (
+    compute_column_fingerprints,
+    compute_table_fingerprints,
+    get_column_attributes,
+    table_keys,
+)
+from data_contract_components.detection._get_offline_data_catalog import resolve_catalog_source
+
+
+class CatalogSide:
+    """
+    One side of a diff: its table fingerprints, and a way to load the rows of some tables.
+
+    Built from a DataFrame, or from a snapshot file without loading its rows.
+    """
+
+    def __init__(self, table_fingerprints: Dict[str, str], load_tables: Callable[[Iterable[str]], pd.DataFrame]) -> None:
+        self.table_fingerprints = table_fingerprints
+        self.load_tables = load_tables
+
+    @classmethod
+    def from_catalog(cls, catalog_df: pd.DataFrame) -> "CatalogSide":
+        """Fingerprint a catalog that is already in memory."""
+        table_keys_of_rows = table_keys(catalog_df)
+
+        def load_tables(keys: Iterable[str]) -> pd.DataFrame:
+            return catalog_df[table_keys_of_rows.isin(set(keys))]
+
+        return cls(compute_table_fingerprints(catalog_df), load_tables)
+
+    @classmethod
+    def from_source(cls, source: str) -> "CatalogSide":
+        """Resolve a catalog source; snapshots are read lazily."""
+        kind, _, path = source.partition(":")
+        if kind == "snapshot" and path:
+            from data_contract_components.detection.catalog_snapshot import read_snapshot_tables, read_table_fingerprints
+            return cls(read_table_fingerprints(path), lambda keys: read_snapshot_tables(path, keys))
+        return cls.from_catalog(resolve_catalog_source(source)())
+
+
+def _diff_table(old_df: pd.DataFrame, new_df: pd.DataFrame) -> Dict[str, Any]:
+    """Compare the columns of one table on both sides."""
+    old_columns = next(iter(get_column_attributes(old_df).values()))
+    new_columns = next(iter(get_column_attributes(new_df).values()))
+    old_fingerprints = next(iter(compute_column_fingerprints(old_df).values()))
+    new_fingerprints = next(iter(compute_column_fingerprints(new_df).values()))
+
+    altered_columns = {}
+    for column_name in sorted(set(old_columns) & set(new_columns)):
+        if old_fingerprints[column_name] == new_fingerprints[column_name]:
+            continue
+        old_attributes, new_attributes = old_columns[column_name], new_columns[column_name]
+        altered_columns[column_name] = {
+            attribute: {"old": old_attributes.get(attribute), "new": new_attributes.get(attribute)}
+            for attribute in sorted(set(old_attributes) | set(new_attributes))
+            if old_attributes.get(attribute) != new_attributes.get(attribute)
+        }
+
+    return {
+        "added_columns": {name: new_columns[name] for name in sorted(set(new_columns) - set(old_columns))},
+        "dropped_columns": {name: old_columns[name] for name in sorted(set(old_columns) - set(new_columns))},
+        "altered_columns": altered_columns,
+    }
+
+
+def diff_catalog_sides(old: CatalogSide, new: CatalogSide) -> Dict[str, Any]:
+    """
+    Diff two catalog sides, loading only the tables whose fingerprints differ.
+
+    Returns:
+        Dictionary with keys:
+        - added_tables: {"schema.table": {column_name: attributes}}
+        - dropped_tables: {"schema.table": {column_name: attributes}}
+        - altered_tables: {"schema.table": {"added_columns", "dropped_columns", "altered_columns"}},
+          where altered_columns maps a column to {attribute: {"old": ..., "new": ...}}
+        - unchanged_table_count: Number of tables with identical fingerprints
+    """
+    old_keys, new_keys = set(old.table_fingerprints), set(new.table_fingerprints)
+    added = sorted(new_keys - old_keys)
+    dropped = sorted(old_keys - new_keys)
+    altered = sorted(key for key in old_keys & new_keys if old.table_fingerprints[key] != new.table_fingerprints[key])
+
+    old_rows = old.load_tables(dropped + altered)
+    new_rows = new.load_tables(added + altered)
+    old_tables = {key: rows for key, rows in old_rows.groupby(table_keys(old_rows))}
+    new_tables = {key: rows for key, rows in new_rows.groupby(table_keys(new_rows))}
+
+    return {
+        "added_tables": {key: get_column_attributes(new_tables[key])[key] for key in added},
+        "dropped_tables": {key: get_column_attributes(old_tables[key])[key] for key in dropped},
+        "altered_tables": {key: _diff_table(old_tables[key], new_tables[key]) for key in altered},
+        "unchanged_table_count": len(old_keys & new_keys) - len(altered),
+    }
+
+
+def diff_catalogs(old_catalog_df: pd.DataFrame, new_catalog_df: pd.DataFrame) -> Dict[str, Any]:
+    """Diff two data catalog DataFrames (see diff_catalog_sides for the result format)."""
+    return diff_catalog_sides(CatalogSide.from_catalog(old_catalog_df), CatalogSide.from_catalog(new_catalog_df))
+
+
+def diff_catalog_sources(old_source: str, new_source: str) -> Dict[str, Any]:
+    """Diff two catalog sources, e.g. "snapshot:before.parquet" and "live"."""
+    return diff_catalog_sides(CatalogSide.from_source(old_source), CatalogSide.from_source(new_source))
+
+
+def get_changed_tables(diff: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Return the (schema, table) pairs a diff touches, i.e. the tables to re-validate."""
+    keys = set(diff["added_tables"]) | set(diff["dropped_tables"]) | set(diff["altered_tables"])
+    return sorted(tuple(key.split(".", 1)) for key in keys)
+
+
+def format_catalog_diff(diff: Dict[str, Any]) -> str:
+    """Render a diff for a migration review."""
+    lines = []
+    for key in diff["added_tables"]:
+        lines.append(f"+ table {key}")
+        for column_name, attributes in diff["added_tables"][key].items():
+            lines.append(f"    + {column_name} {attributes['data_type']}")
+    for key in diff["dropped_tables"]:
+        lines.append(f"- table {key}")
+    for key, table_diff in diff["altered_tables"].items():
+        lines.append(f"~ table {key}")
+        for column_name, attributes in table_diff["added_columns"].items():
+            lines.append(f"    + {column_name} {attributes['data_type']}")
+        for column_name in table_diff["dropped_columns"]:
+            lines.append(f"    - {column_name}")
+        for column_name, changes in table_diff["altered_columns"].items():
+            for attribute, change in changes.items():
+                lines.append(f"    ~ {column_name}.{attribute}: {change['old']!r} -> {change['new']!r}")
+
+    if not lines:
+        return f"No changes ({diff['unchanged_table_count']} tables compared)"
+    lines.append(f"{diff['unchanged_table_count']} tables unchanged")
+    return "\n".join(lines)
+
+
+def main():
+    """Diff two catalog sources from the command line; exits 1 when they differ."""
+
+    parser = argparse.ArgumentParser(description="Diff two data catalogs.")
+    parser.add_argument("old", help="Old catalog source, e.g. snapshot:before.parquet")
+    parser.add_argument("new", help="New catalog source (default: live)", nargs="?", default="live")
+    parser.add_argument("--json", action="store_true", help="Print the structured diff as JSON")
+    args = parser.parse_args()
+
+    diff = diff_catalog_sources(args.old, args.new)
+    print(json.dumps(diff, indent=2, default=str) if args.json else format_catalog_diff(diff))
+    sys.exit(1 if get_changed_tables(diff) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Portable snapshots of the data catalog.
+
+A snapshot is the get_data_catalog() DataFrame written to a zstd-compressed
+Parquet file, with a schema fingerprint, the creation time and the source it
+was read from stored in the file metadata.  One job extracts the catalog once
+and every parallel validation job reads the file instead of querying Postgres:
+
+    python -m data_contract_components.detection.catalog_snapshot export catalog.parquet
+    python -m data_contract_components.detection.catalog_snapshot export catalog.parquet --source migrations
+    python -m data_contract_components.detection.catalog_snapshot show catalog.parquet
+    DATA_CONTRACT_CATALOG=snapshot:catalog.parquet python -m unittest ...
+
+The fingerprint only depends on the catalog rows, so two snapshots of the same
+schema share it regardless of when they were taken.  Per-table fingerprints are
+stored as well, so catalog_diff can find the changed tables from the metadata
+alone and read just their rows.
+"""
+
+import argparse
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from data_contract_components.detection._catalog_fingerprints import compute_table_fingerprints, table_keys
+from data_contract_components.detection._get_data_catalog import compact_data_catalog
+from data_contract_components.detection._get_offline_data_catalog import resolve_catalog_source
+
+SNAPSHOT_FORMAT_VERSION = "1"
+METADATA_PREFIX = "data_contract."
+# The catalog is ordered by table, so row groups of this size let table filters
+# skip most of a large snapshot (read_snapshot_tables).
+SNAPSHOT_ROW_GROUP_SIZE = 10_000
+
+
+def compute_schema_fingerprint(catalog_df: pd.DataFrame) -> str:
+    """
+    Compute a SHA-256 fingerprint of a data catalog.
+
+    Rows are serialized with nulls normalized and then sorted, so the fingerprint
+    does not depend on row order or on how a missing value is represented.
+
+    Args:
+        catalog_df: DataFrame as returned by get_data_catalog()
+
+    Returns:
+        Hex digest of the catalog contents
+    """
+    columns = sorted(catalog_df.columns)
+    rows = sorted(
+        json.dumps([None if pd.isna(value) else str(value) for value in row])
+        for row in catalog_df[columns].itertuples(index=False, name=None)
+    )
+    digest = hashlib.sha256(json.dumps(columns).encode("utf-8"))
+    for row in rows:
+        digest.update(b"\n" + row.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def export_catalog_snapshot(
+    path: str,
+    catalog_df: Optional[pd.DataFrame] = None,
+    source: str = "live",
+) -> Dict[str, str]:
+    """
+    Write the data catalog to a Parquet snapshot.
+
+    Args:
+        path: Output file path
+        catalog_df: Catalog to write; read from `source` when omitted
+        source: Catalog source description (see resolve_catalog_source)
+
+    Returns:
+        The snapshot metadata written to the file
+    """
+    if catalog_df is None:
+        catalog_df = resolve_catalog_source(source)()
+
+    metadata = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "fingerprint": compute_schema_fingerprint(catalog_df),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "row_count": str(len(catalog_df)),
+        "table_fingerprints": json.dumps(compute_table_fingerprints(catalog_df), sort_keys=True),
+    }
+
+    table = pa.Table.from_pandas(catalog_df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        **{f"{METADATA_PREFIX}{key}".encode(): value.encode() for key, value in metadata.items()},
+    })
+    pq.write_table(table, path, compression="zstd", row_group_size=SNAPSHOT_ROW_GROUP_SIZE)
+    return metadata
+
+
+def read_snapshot_metadata(path: str) -> Dict[str, str]:
+    """Read the snapshot metadata without loading the catalog rows."""
+    schema_metadata = pq.read_schema(path).metadata or {}
+    metadata = {
+        key.decode()[len(METADATA_PREFIX):]: value.decode()
+        for key, value in schema_metadata.items()
+        if key.decode().startswith(METADATA_PREFIX)
+    }
+    if "fingerprint" not in metadata:
+        raise ValueError(f"{path} is not a data catalog snapshot")
+    return metadata
+
+
+def read_catalog_snapshot(path: str, verify: bool = True) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Load a catalog snapshot and its metadata.
+
+    Args:
+        path: Snapshot file path
+        verify: Recompute the fingerprint and fail if it does not match the metadata
+
+    Returns:
+        Tuple of the catalog DataFrame and the snapshot metadata
+    """
+    metadata = read_snapshot_metadata(path)
+    catalog_df = pq.read_table(path).to_pandas()
+    if verify and compute_schema_fingerprint(catalog_df) != metadata["fingerprint"]:
+        raise ValueError(f"Catalog snapshot {path} does not match its fingerprint")
+    return catalog_df, metadata
+
+
+def read_table_fingerprints(path: str) -> Dict[str, str]:
+    """Return the per-table fingerprints of a snapshot, computing them for snapshots written without."""
+    metadata = read_snapshot_metadata(path)
+    if "table_fingerprints" in metadata:
+        return json.loads(metadata["table_fingerprints"])
+    return compute_table_fingerprints(read_catalog_snapshot(path)[0])
+
+
+def read_snapshot_tables(path: str, keys: Iterable[str]) -> pd.DataFrame:
+    """
+    Load only the catalog rows of some tables from a snapshot.
+
+    Args:
+        path: Snapshot file path
+        keys: Tables to load, as "schema.table"
+
+    Returns:
+        DataFrame with the catalog rows of those tables
+    """
+    keys = set(keys)
+    table_names = sorted({key.split(".", 1)[1] for key in keys})
+    if not table_names:
+        return pq.read_schema(path).empty_table().to_pandas()
+
+    # The filter skips row groups by their table_name statistics; the schema is checked afterwards
+    catalog_df = pq.read_table(path, filters=[("table_name", "in", table_names)]).to_pandas()
+    return catalog_df[table_keys(catalog_df).isin(keys)].reset_index(drop=True)
+
+
+def load_catalog_snapshot(path: str) -> pd.DataFrame:
+    """Load the catalog DataFrame from a snapshot, for use as a detector catalog_source."""
+    return compact_data_catalog(read_catalog_snapshot(path)[0])
+
+
+def main():
+    """Export or inspect catalog snapshots from the command line."""
+
+    parser = argparse.ArgumentParser(description="Export and inspect data catalog snapshots.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write the catalog to a snapshot file")
+    export_parser.add_argument("path", help="Output Parquet file")
+    export_parser.add_argument(
+        "--source", default="live",
+        help="Catalog source: live, migrations[:<revision>] or pg_dump:<path> (default: live)",
+    )
+
+    show_parser = subparsers.add_parser("show", help="Print the metadata of a snapshot file")
+    show_parser.add_argument("path", help="Snapshot Parquet file")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        metadata = export_catalog_snapshot(args.path, source=args.source)
+    else:
+        metadata = read_catalog_snapshot(args.path)[1]
+    metadata.pop("table_fingerprints", None)
+    print(json.dumps(metadata, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List
-from data_contract_components.detection._get_data_catalog import get_data_catalog
-from data_contract_components.detection._get_data_contract_specs import get_data_contract_specs
+from typing import Callable, Dict, Iterable, List, Optional, Any
+from functools import partial
+from data_contract_components.detection._get_data_catalog import get_data_catalog, merge_on_codes
+from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+from data_contract_components.data_assets._phase_profiler import PhaseProfiler
 
 
 class ContractCoverageDetector:
@@ -13,15 +15,34 @@ class ContractCoverageDetector:
     This class loads contract specification files and checks if the tables
     defined in those contracts are present in the data catalog.
     """
+
+    MERGE_KEYS = ['table_catalog', 'table_schema', 'table_name']
     
-    def __init__(self, contract_directory: str) -> None:
+    def __init__(
+        self,
+        contract_directory: str,
+        catalog_source: Optional[Callable[[], pd.DataFrame]] = None,
+        contract_names: Optional[Iterable[str]] = None,
+        contract_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+        profiler: Optional[PhaseProfiler] = None,
+    ) -> None:
         """
         Initialize the ContractCoverageDetector.
         
         Args:
             contract_directory: Path to the directory containing contract specification JSON files
+            catalog_source: Callable returning the data catalog DataFrame (defaults to
+                querying just the table keys from the live database with get_data_catalog)
+            contract_names: Only check these contracts (file stems); None checks them all
+            contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+            profiler: Records the phases of each detection run (defaults to one configured
+                by the DATA_CONTRACT_PROFILE environment variable, off when it is unset)
         """
         self.contract_directory = Path(contract_directory)
+        self.catalog_source = catalog_source or partial(get_data_catalog, columns=self.MERGE_KEYS)
+        self.contract_names = contract_names
+        self.contract_specs = contract_specs
+        self.profiler = profiler or PhaseProfiler.from_env(type(self).__name__)
     
     def get_contract_spec_coverage(self) -> List[Dict[str, str]]:
         """
@@ -31,7 +52,7 @@ class ContractCoverageDetector:
             List of dictionaries containing contract name and table information
             (table_catalog, table_schema, table_name)
         """
-        contract_specs = get_data_contract_specs(self.contract_directory)
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
         coverage = []
         
         for contract_name, contract_spec in contract_specs.items():
@@ -52,18 +73,25 @@ class ContractCoverageDetector:
         Returns:
             List of table names that are under contract but missing from the data catalog
         """
-        coverage = self.get_contract_spec_coverage()
-        coverage_df = pd.DataFrame(coverage)  
-        catalog_df = get_data_catalog()
-        
-        merged = coverage_df.merge(
-            catalog_df, 
-            on=['table_catalog', 'table_schema', 'table_name'], 
-            how='left', 
-            indicator=True
-        )
-        
-        missing_assets_df = merged[merged['_merge'] == 'left_only']
-        missing_table_names = missing_assets_df['table_name'].tolist()
+        with self.profiler.run():
+            with self.profiler.phase("spec_load"):
+                coverage = self.get_contract_spec_coverage()
+                coverage_df = pd.DataFrame(coverage)  
+            with self.profiler.phase("catalog_query"):
+                # One row per table is enough to tell whether it exists
+                catalog_df = self.catalog_source()[self.MERGE_KEYS].drop_duplicates()
+            
+            with self.profiler.phase("merge"):
+                merged = merge_on_codes(
+                    coverage_df, 
+                    catalog_df, 
+                    on=self.MERGE_KEYS, 
+                    how='left', 
+                    indicator=True
+                )
+            
+            with self.profiler.phase("comparison"):
+                missing_assets_df = merged[merged['_merge'] == 'left_only']
+                missing_table_names = missing_assets_df['table_name'].tolist()
         
         return missing_table_names
\ No newline at end of file
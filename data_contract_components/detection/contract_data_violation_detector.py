@@ -0,0 +1,591 @@
+import math
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Any, Optional
+from data_contract_components.data_assets._query_postgres_helper import PostgresDB
+from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a Postgres identifier (table, schema or column name)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    """Quote a Postgres string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class ContractDataViolationDetector:
+    """
+    A class to detect data-level contract violations by checking the rows of each
+    contracted table against the column constraints in its contract specification.
+
+    Every rule of a contract is compiled into a single aggregate expression
+    (count(*) FILTER (WHERE ...), max(length(...)), ...) and all rules of a table
+    are evaluated by one query, so each table is scanned once no matter how many
+    rules its contract declares.
+
+    For very large tables the query can run on a TABLESAMPLE instead. Each rule then
+    gets an estimated violation rate with a Wilson confidence interval, and rules
+    that show violations in the sample are re-checked with a full scan restricted to
+    just those rules, so the reported counts stay exact.
+
+    In incremental mode a high-water mark on created_at is kept per table in
+    data_contract.validation_watermark, and each run only validates rows inserted
+    since the last clean run, so the cost follows ingestion volume rather than table
+    size. A full sweep still runs on the first pass and then every full_sweep_interval.
+
+    Hash-partitioned tables are validated partition by partition, up to `jobs`
+    partitions at a time, and the per-partition aggregates are merged. Counts and
+    maxima merge exactly; a uniqueness rule only does when its column is the
+    partition key (duplicates then always share a partition), so any other
+    uniqueness rule is evaluated over the whole table instead.
+    """
+
+    SAMPLE_METHODS = ("SYSTEM", "BERNOULLI")
+    WATERMARK_COLUMN = "created_at"
+    WATERMARK_TABLE = "data_contract.validation_watermark"
+
+    def __init__(
+        self,
+        contract_directory: str,
+        sample_method: Optional[str] = None,
+        sample_percent: Optional[float] = None,
+        sample_rows: Optional[int] = None,
+        confidence: float = 0.95,
+        escalate_to_full_scan: bool = True,
+        incremental: bool = False,
+        full_sweep_interval: Optional[timedelta] = None,
+        lookback: timedelta = timedelta(0),
+        jobs: int = 4,
+        contract_names: Optional[Iterable[str]] = None,
+        contract_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Initialize the ContractDataViolationDetector.
+
+        Args:
+            contract_directory: Path to the directory containing contract specification JSON files
+            sample_method: None for a full scan, or "SYSTEM" (block sampling, cheapest) /
+                "BERNOULLI" (row sampling, least biased) to validate a TABLESAMPLE
+            sample_percent: Percentage of the table to sample
+            sample_rows: Target sampled row count, converted to a percentage from
+                pg_class.reltuples (takes precedence over sample_percent)
+            confidence: Confidence level of the reported intervals
+            escalate_to_full_scan: Re-check rules with sampled violations on the full table
+            incremental: Only validate rows newer than each table's stored watermark
+            full_sweep_interval: How often an incremental run falls back to validating the
+                whole table (None: only when no watermark exists yet)
+            lookback: How far behind the watermark to re-validate, to catch rows from
+                transactions that committed after a later row was already validated
+            jobs: Partitions of a partitioned table scanned in parallel
+            contract_names: Only check these contracts (file stems); None checks them all
+            contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+        """
+        if sample_method is not None:
+            sample_method = sample_method.upper()
+            if sample_method not in self.SAMPLE_METHODS:
+                raise ValueError(f"sample_method must be one of {self.SAMPLE_METHODS}")
+            if sample_percent is None and sample_rows is None:
+                raise ValueError("Sampling needs sample_percent or sample_rows")
+
+        self.contract_directory = Path(contract_directory)
+        self.sample_method = sample_method
+        self.sample_percent = sample_percent
+        self.sample_rows = sample_rows
+        self.confidence = confidence
+        self.escalate_to_full_scan = escalate_to_full_scan
+        self.incremental = incremental
+        self.full_sweep_interval = full_sweep_interval
+        self.lookback = lookback
+        self.jobs = jobs
+        self.contract_names = contract_names
+        self.contract_specs = contract_specs
+        self.sql = PostgresDB()
+
+    def compile_contract_rules(self, contract_spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Compile the column constraints of a contract specification into data rules.
+
+        An array column's declared element data_type compiles to no rule: every element
+        has the column's element type, so it is checked against the catalog instead.
+
+        Args:
+            contract_spec: A single contract specification
+
+        Returns:
+            List of rule dictionaries with keys:
+            - column_name: Column the rule applies to
+            - rule: Rule identifier (not_null, unique, max_length, array_element_not_null,
+              array_element_max_length)
+            - expected: The contract value the rule enforces
+            - expression: Aggregate SQL expression counting violating rows
+            - observed_expression: Optional aggregate reporting the worst observed value
+            - window_expression: Optional replacement for expression when only new rows
+              are scanned, for rules that also have to look at the rest of the table
+        """
+        rules = []
+        properties = contract_spec["schema"]["properties"]
+        table = self._table_reference(contract_spec)
+
+        for column_name, column_spec in properties.items():
+            constraint = column_spec.get("constraints", {})
+            array_element = column_spec.get("array_element") or {}
+            column = _quote_identifier(column_name)
+
+            if constraint.get("primaryKey", False) or constraint.get("is_nullable", True) == False:
+                rules.append({
+                    "column_name": column_name,
+                    "rule": "not_null",
+                    "expected": "no NULL values",
+                    "expression": f"count(*) FILTER (WHERE {column} IS NULL)",
+                })
+
+            if constraint.get("primaryKey", False):
+                rules.append({
+                    "column_name": column_name,
+                    "rule": "unique",
+                    "expected": "no duplicate values",
+                    "expression": f"count({column}) - count(DISTINCT {column})",
+                    # A ctid is only unique within one partition, so rows are told apart by (tableoid, ctid)
+                    "window_expression": (
+                        f"count(*) FILTER (WHERE EXISTS ("
+                        f"SELECT 1 FROM {table} AS other "
+                        f"WHERE other.{column} = validated.{column} "
+                        f"AND (other.tableoid, other.ctid) <> (validated.tableoid, validated.ctid)))"
+                    ),
+                })
+
+            max_length = constraint.get("character_maximum_length")
+            if max_length is not None:
+                rules.append({
+                    "column_name": column_name,
+                    "rule": "max_length",
+                    "expected": f"length <= {int(max_length)}",
+                    "expression": f"count(*) FILTER (WHERE length({column}) > {int(max_length)})",
+                    "observed_expression": f"max(length({column}))",
+                })
+
+            if array_element.get("is_nullable", True) == False:
+                rules.append({
+                    "column_name": column_name,
+                    "rule": "array_element_not_null",
+                    "expected": "no NULL elements",
+                    "expression": f"count(*) FILTER (WHERE array_position({column}, NULL) IS NOT NULL)",
+                })
+
+            element_max_length = array_element.get("character_maximum_length")
+            if element_max_length is not None:
+                rules.append({
+                    "column_name": column_name,
+                    "rule": "array_element_max_length",
+                    "expected": f"element length <= {int(element_max_length)}",
+                    "expression": (
+                        f"count(*) FILTER (WHERE EXISTS ("
+                        f"SELECT 1 FROM unnest({column}) AS element "
+                        f"WHERE length(element) > {int(element_max_length)}))"
+                    ),
+                    "observed_expression": (
+                        f"max((SELECT max(length(element)) FROM unnest({column}) AS element))"
+                    ),
+                })
+
+        return rules
+
+    def _table_reference(self, contract_spec: Dict[str, Any]) -> str:
+        """Return the quoted schema.table of a contract."""
+        schema = contract_spec["schema"]
+        return f"{_quote_identifier(schema['table_schema'])}.{_quote_identifier(schema['table_name'])}"
+
+    def get_sample_percent(self, contract_spec: Dict[str, Any]) -> Optional[float]:
+        """
+        Return the TABLESAMPLE percentage for a contract's table, or None for a full scan.
+
+        A target row count is converted using the planner's row estimate; tables that
+        have never been analyzed, or are smaller than the target, are scanned in full.
+        """
+        if self.sample_method is None:
+            return None
+        if self.sample_rows is None:
+            return self.sample_percent if self.sample_percent < 100 else None
+
+        table = _quote_literal(self._table_reference(contract_spec))
+        # A partitioned parent holds no rows itself; its estimate is the sum over its partitions
+        result = self.sql.query(f"""
+            SELECT coalesce(
+                (SELECT sum(greatest(reltuples, 0)) FROM pg_class
+                 WHERE oid IN (SELECT relid FROM pg_partition_tree({table}::regclass) WHERE isleaf)),
+                (SELECT reltuples FROM pg_class WHERE oid = {table}::regclass)
+            ) AS reltuples
+        """)
+        reltuples = float(result.iloc[0]["reltuples"])
+        if reltuples <= 0 or self.sample_rows >= reltuples:
+            return None
+        return 100.0 * self.sample_rows / reltuples
+
+    def confidence_interval(self, violating_rows: int, sampled_rows: int) -> tuple:
+        """
+        Wilson score interval for the violation rate at the configured confidence.
+
+        Returns:
+            (estimated_rate, lower_bound, upper_bound)
+        """
+        if sampled_rows == 0:
+            return (0.0, 0.0, 1.0)
+        z = NormalDist().inv_cdf(1 - (1 - self.confidence) / 2)
+        rate = violating_rows / sampled_rows
+        denominator = 1 + z ** 2 / sampled_rows
+        center = (rate + z ** 2 / (2 * sampled_rows)) / denominator
+        margin = z * math.sqrt(rate * (1 - rate) / sampled_rows + z ** 2 / (4 * sampled_rows ** 2)) / denominator
+        return (rate, max(0.0, center - margin), min(1.0, center + margin))
+
+    def compile_validation_query(
+        self,
+        contract_spec: Dict[str, Any],
+        rules: List[Dict[str, Any]],
+        sample_percent: Optional[float] = None,
+        since: Optional[datetime] = None,
+        relation: Optional[str] = None,
+    ) -> str:
+        """
+        Build the single aggregate query that evaluates every rule of a table.
+
+        Rule i is returned as column rule_<i> (its violating row count) and, where the
+        rule reports an observed value, rule_<i>_observed. In incremental mode the
+        query also returns max_created_at, the next watermark candidate.
+
+        Args:
+            contract_spec: A single contract specification
+            rules: Rules compiled by compile_contract_rules
+            sample_percent: Scan a TABLESAMPLE of this percentage instead of the full table
+            since: Only validate rows with created_at after this timestamp
+            relation: Scan this (already quoted) relation, e.g. one partition, instead
+                of the contracted table
+
+        Returns:
+            SQL query string
+        """
+        table = f"{relation or self._table_reference(contract_spec)} AS validated"
+        if sample_percent is not None:
+            table += f" TABLESAMPLE {self.sample_method} ({float(sample_percent)!r})"
+
+        watermark_column = _quote_identifier(self.WATERMARK_COLUMN)
+        select_list = ["count(*) AS row_count"]
+        for i, rule in enumerate(rules):
+            expression = rule.get("window_expression", rule["expression"]) if since is not None else rule["expression"]
+            select_list.append(f"{expression} AS rule_{i}")
+            if "observed_expression" in rule:
+                select_list.append(f"{rule['observed_expression']} AS rule_{i}_observed")
+        if self.incremental and self.has_watermark_column(contract_spec):
+            select_list.append(f"max({watermark_column}) AS max_created_at")
+
+        select_sql = ",\n    ".join(select_list)
+        query = f"SELECT\n    {select_sql}\nFROM {table}"
+        if since is not None:
+            query += f"\nWHERE {watermark_column} > {_quote_literal(since.isoformat())}::timestamp"
+        return query
+
+    def get_partitions(self, contract_spec: Dict[str, Any]) -> List[str]:
+        """
+        Return the quoted leaf partitions of a contract's table.
+
+        Returns:
+            List of partition names, empty when the table is not partitioned
+        """
+        table = _quote_literal(self._table_reference(contract_spec))
+        result = self.sql.query(f"""
+            SELECT relid::regclass::text AS partition_name
+            FROM pg_partition_tree({table}::regclass)
+            WHERE isleaf
+            ORDER BY 1
+        """)
+        return result["partition_name"].tolist()
+
+    def get_partition_key(self, contract_spec: Dict[str, Any]) -> List[str]:
+        """Return the partition key columns of a contract's table."""
+        table = _quote_literal(self._table_reference(contract_spec))
+        result = self.sql.query(f"""
+            SELECT pg_attribute.attname AS column_name
+            FROM pg_partitioned_table
+            JOIN pg_attribute ON pg_attribute.attrelid = pg_partitioned_table.partrelid
+                AND pg_attribute.attnum = ANY(pg_partitioned_table.partattrs::int2[])
+            WHERE pg_partitioned_table.partrelid = {table}::regclass
+        """)
+        return result["column_name"].tolist()
+
+    def has_watermark_column(self, contract_spec: Dict[str, Any]) -> bool:
+        """Return True if the contracted table declares the created_at watermark column."""
+        return self.WATERMARK_COLUMN in contract_spec["schema"]["properties"]
+
+    def get_watermark(self, contract_spec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Read the stored watermark of a contract's table.
+
+        Returns:
+            Dictionary with keys watermark (None before the first clean run) and
+            full_sweep_due (True when the whole table should be validated this run)
+        """
+        schema = contract_spec["schema"]
+        interval_sec = None if self.full_sweep_interval is None else self.full_sweep_interval.total_seconds()
+        result = self.sql.query(
+            f"""
+            SELECT
+                watermark,
+                watermark IS NULL
+                    OR last_full_sweep_at IS NULL
+                    OR (%(interval_sec)s::float8 IS NOT NULL
+                        AND now() - last_full_sweep_at >= make_interval(secs => %(interval_sec)s::float8))
+                    AS full_sweep_due
+            FROM {self.WATERMARK_TABLE}
+            WHERE table_schema = %(table_schema)s AND table_name = %(table_name)s
+            """,
+            {"interval_sec": interval_sec, "table_schema": schema["table_schema"], "table_name": schema["table_name"]},
+        )
+        if result.empty:
+            return {"watermark": None, "full_sweep_due": True}
+        row = result.iloc[0]
+        watermark = None if pd.isna(row["watermark"]) else row["watermark"].to_pydatetime()
+        return {"watermark": watermark, "full_sweep_due": bool(row["full_sweep_due"])}
+
+    def advance_watermark(self, contract_spec: Dict[str, Any], max_created_at: Any, full_sweep: bool) -> None:
+        """
+        Move a table's watermark forward after a run that found no violations.
+
+        The watermark never moves backwards, and last_full_sweep_at is only touched
+        when the whole table was validated.
+        """
+        schema = contract_spec["schema"]
+        max_created_at = None if pd.isna(max_created_at) else pd.Timestamp(max_created_at).to_pydatetime()
+        self.sql.execute(
+            f"""
+            INSERT INTO {self.WATERMARK_TABLE} AS current (table_schema, table_name, watermark, last_full_sweep_at)
+            VALUES (
+                %(table_schema)s, %(table_name)s, %(watermark)s,
+                CASE WHEN %(full_sweep)s THEN now()::timestamp END
+            )
+            ON CONFLICT (table_schema, table_name) DO UPDATE SET
+                watermark = greatest(current.watermark, EXCLUDED.watermark),
+                last_full_sweep_at = coalesce(EXCLUDED.last_full_sweep_at, current.last_full_sweep_at),
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            {
+                "table_schema": schema["table_schema"],
+                "table_name": schema["table_name"],
+                "watermark": max_created_at,
+                "full_sweep": full_sweep,
+            },
+        )
+
+    def _evaluate_rules(
+        self,
+        contract_spec: Dict[str, Any],
+        rules: List[Dict[str, Any]],
+        sample_percent: Optional[float] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate *rules* on a table, partition by partition when it is partitioned.
+
+        Returns:
+            List of dictionaries with the rule plus row_count, violating_rows, observed
+            and max_created_at (None outside incremental mode)
+        """
+        partitions = self.get_partitions(contract_spec)
+        if not partitions:
+            return self._query_rules(contract_spec, rules, sample_percent, since)
+
+        # Duplicates can only span partitions when the unique column is not the partition key
+        partition_key = self.get_partition_key(contract_spec)
+        mergeable = [
+            i for i, rule in enumerate(rules)
+            if rule["rule"] != "unique" or rule["column_name"] in partition_key
+        ]
+        whole_table = [i for i in range(len(rules)) if i not in mergeable]
+
+        results: Dict[int, Dict[str, Any]] = {}
+        if mergeable:
+            mergeable_rules = [rules[i] for i in mergeable]
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                per_partition = list(executor.map(
+                    lambda partition: self._query_rules(contract_spec, mergeable_rules, sample_percent, since, partition),
+                    partitions,
+                ))
+            results.update(zip(mergeable, self._merge_partition_results(per_partition)))
+        if whole_table:
+            whole_table_rules = [rules[i] for i in whole_table]
+            results.update(zip(whole_table, self._query_rules(contract_spec, whole_table_rules, sample_percent, since)))
+        return [results[i] for i in range(len(rules))]
+
+    def _merge_partition_results(self, per_partition: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Combine per-partition rule results: counts are summed, observed values and watermarks maxed."""
+        merged = []
+        for partition_results in zip(*per_partition):
+            observed = [result["observed"] for result in partition_results
+                        if result["observed"] is not None and not pd.isna(result["observed"])]
+            max_created_at = [result["max_created_at"] for result in partition_results
+                              if result["max_created_at"] is not None and not pd.isna(result["max_created_at"])]
+            merged.append({
+                **partition_results[0],
+                "row_count": sum(result["row_count"] for result in partition_results),
+                "violating_rows": sum(result["violating_rows"] for result in partition_results),
+                "observed": max(observed) if observed else None,
+                "max_created_at": max(max_created_at) if max_created_at else None,
+            })
+        return merged
+
+    def _query_rules(
+        self,
+        contract_spec: Dict[str, Any],
+        rules: List[Dict[str, Any]],
+        sample_percent: Optional[float] = None,
+        since: Optional[datetime] = None,
+        relation: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run one aggregate query for *rules* and return one result per rule."""
+        row = self.sql.query(self.compile_validation_query(contract_spec, rules, sample_percent, since, relation)).iloc[0]
+        results = []
+        for i, rule in enumerate(rules):
+            violating_rows = row[f"rule_{i}"]
+            results.append({
+                **rule,
+                "row_count": int(row["row_count"]),
+                "violating_rows": 0 if pd.isna(violating_rows) else int(violating_rows),
+                "observed": row[f"rule_{i}_observed"] if f"rule_{i}_observed" in row.index else None,
+                "max_created_at": row["max_created_at"] if "max_created_at" in row.index else None,
+            })
+        return results
+
+    def estimate_data_violation_rates(self) -> List[Dict[str, Any]]:
+        """
+        Estimate the violation rate of every rule from one scan (or sample) per table.
+
+        Returns:
+            List of dictionaries with keys contract_name, table_name, column_name, rule,
+            sample_percent (None for a full scan), sampled_rows, violating_rows,
+            estimated_rate, lower_bound and upper_bound
+        """
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
+        estimates = []
+
+        for contract_name, contract_spec in contract_specs.items():
+            rules = self.compile_contract_rules(contract_spec)
+            if not rules:
+                continue
+
+            sample_percent = self.get_sample_percent(contract_spec)
+            for result in self._evaluate_rules(contract_spec, rules, sample_percent):
+                rate, lower, upper = self.confidence_interval(result["violating_rows"], result["row_count"])
+                estimates.append({
+                    "contract_name": contract_name,
+                    "table_name": contract_spec["schema"]["table_name"],
+                    "column_name": result["column_name"],
+                    "rule": result["rule"],
+                    "sample_percent": sample_percent,
+                    "sampled_rows": result["row_count"],
+                    "violating_rows": result["violating_rows"],
+                    "estimated_rate": rate,
+                    "lower_bound": lower,
+                    "upper_bound": upper,
+                })
+
+        return estimates
+
+    def _format_violation(self, rule: Dict[str, Any], estimate: Optional[tuple] = None) -> str:
+        """Describe a violated rule, with its sample estimate when one was taken."""
+        detail = f"{rule['rule'].replace('_', ' ').title()}: expected {rule['expected']}, "
+        if estimate is not None and not self.escalate_to_full_scan:
+            rate, lower, upper = estimate
+            detail += (
+                f"estimated {rate:.2%} of rows violating "
+                f"({self.confidence:.0%} CI {lower:.2%}-{upper:.2%}, "
+                f"{rule['violating_rows']} of {rule['row_count']} sampled rows)"
+            )
+        else:
+            detail += f"found {rule['violating_rows']} violating rows of {rule['row_count']}"
+            if estimate is not None:
+                rate, lower, upper = estimate
+                detail += (
+                    f" (sample estimate {rate:.2%}, "
+                    f"{self.confidence:.0%} CI {lower:.2%}-{upper:.2%})"
+                )
+        if rule["observed"] is not None and not pd.isna(rule["observed"]):
+            detail += f" (max observed {rule['observed']})"
+        return detail
+
+    def detect_data_violations(self) -> List[Dict[str, str]]:
+        """
+        Detect data-level violations by running one aggregate query per contracted table.
+
+        When sampling is enabled the query runs on a TABLESAMPLE; rules that show
+        violations in the sample are escalated to one full-scan query covering only
+        those rules (unless escalate_to_full_scan is False, in which case the
+        estimated rate and its confidence interval are reported instead).
+
+        In incremental mode only rows past the table's watermark are validated, and
+        the watermark advances only after a complete (unsampled) run with no
+        violations, so rows that fail keep being reported until they are fixed.
+
+        Returns:
+            List of dictionaries containing violation details. Each dictionary has keys:
+            - contract_name: Name of the contract with violations
+            - table_name: Name of the table with violations
+            - column_name: Name of the column with violations
+            - violations: String describing the specific violation
+        """
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
+        violations = []
+
+        for contract_name, contract_spec in contract_specs.items():
+            table_name = contract_spec["schema"]["table_name"]
+            rules = self.compile_contract_rules(contract_spec)
+            if not rules:
+                continue
+
+            try:
+                since = None
+                full_sweep = True
+                if self.incremental and self.has_watermark_column(contract_spec):
+                    state = self.get_watermark(contract_spec)
+                    full_sweep = state["full_sweep_due"]
+                    if not full_sweep:
+                        since = state["watermark"] - self.lookback
+
+                sample_percent = self.get_sample_percent(contract_spec)
+                results = self._evaluate_rules(contract_spec, rules, sample_percent, since)
+                offending = [i for i, result in enumerate(results) if result["violating_rows"] > 0]
+
+                estimates = {}
+                if sample_percent is not None:
+                    estimates = {
+                        i: self.confidence_interval(results[i]["violating_rows"], results[i]["row_count"])
+                        for i in offending
+                    }
+                    if offending and self.escalate_to_full_scan:
+                        escalated = self._evaluate_rules(contract_spec, [rules[i] for i in offending], since=since)
+                        results = dict(zip(offending, escalated))
+                        offending = [i for i in offending if results[i]["violating_rows"] > 0]
+
+                if self.incremental and self.has_watermark_column(contract_spec) and sample_percent is None and not offending:
+                    self.advance_watermark(contract_spec, results[0]["max_created_at"], full_sweep)
+            except Exception as e:
+                violations.append({
+                    "contract_name": contract_name,
+                    "table_name": table_name,
+                    "column_name": None,
+                    "violations": f"Data validation query failed: {e}"
+                })
+                continue
+
+            for i in offending:
+                violations.append({
+                    "contract_name": contract_name,
+                    "table_name": table_name,
+                    "column_name": results[i]["column_name"],
+                    "violations": self._format_violation(results[i], estimates.get(i))
+                })
+
+        return violations
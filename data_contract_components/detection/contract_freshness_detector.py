@@ -0,0 +1,204 @@
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Optional
+from data_contract_components.data_assets._query_postgres_helper import PostgresDB
+from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+from data_contract_components.detection.contract_data_violation_detector import _quote_identifier
+
+
+class ContractFreshnessDetector:
+    """
+    A class to detect freshness SLA violations of contracted tables.
+
+    Contracts declare freshness expectations under a "freshness" key on a timestamp
+    column property:
+
+        "created_at": {
+            "freshness": {
+                "max_age_sec": 21600,
+                "max_lag_sec": 3600,
+                "lag_reference": {"table_name": "object", "column_name": "created_at"}
+            }
+        }
+
+    max_age_sec bounds how old the newest value of the column may be. max_lag_sec
+    bounds how far the newest value may trail the newest value of lag_reference
+    (another table in the same schema unless table_schema is given), which catches
+    a pipeline stage that stalled while the stages before it kept loading.
+
+    Every expectation only needs max() of an indexed column, which Postgres answers
+    with a single backward index step, so all of them are evaluated by one query
+    whose cost does not grow with table size.
+    """
+
+    def __init__(
+        self,
+        contract_directory: str,
+        contract_names: Optional[Iterable[str]] = None,
+        contract_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Initialize the ContractFreshnessDetector.
+
+        Args:
+            contract_directory: Path to the directory containing contract specification JSON files
+            contract_names: Only check these contracts (file stems); None checks them all
+            contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+        """
+        self.contract_directory = Path(contract_directory)
+        self.contract_names = contract_names
+        self.contract_specs = contract_specs
+        self.sql = PostgresDB()
+
+    def get_declared_freshness(self) -> List[Dict[str, Any]]:
+        """
+        Collect every freshness expectation declared in the contract specifications.
+
+        Returns:
+            List of dictionaries with keys contract_name, table_schema, table_name,
+            column_name, max_age_sec, max_lag_sec and lag_reference
+        """
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
+        declared = []
+
+        for contract_name, contract_spec in contract_specs.items():
+            schema = contract_spec["schema"]
+            for column_name, column_spec in schema["properties"].items():
+                freshness = column_spec.get("freshness")
+                if not freshness:
+                    continue
+
+                lag_reference = freshness.get("lag_reference")
+                if freshness.get("max_lag_sec") is not None and not lag_reference:
+                    raise ValueError(
+                        f"max_lag_sec on '{column_name}' in contract '{contract_name}' needs a lag_reference"
+                    )
+
+                declared.append({
+                    "contract_name": contract_name,
+                    "table_schema": schema["table_schema"],
+                    "table_name": schema["table_name"],
+                    "column_name": column_name,
+                    "max_age_sec": freshness.get("max_age_sec"),
+                    "max_lag_sec": freshness.get("max_lag_sec"),
+                    "lag_reference": lag_reference and {
+                        "table_schema": lag_reference.get("table_schema", schema["table_schema"]),
+                        "table_name": lag_reference["table_name"],
+                        "column_name": lag_reference["column_name"],
+                    },
+                })
+
+        return declared
+
+    def _newest_value_expression(self, table_schema: str, table_name: str, column_name: str) -> str:
+        """Scalar subquery returning the newest value of a column (an index-only lookup)."""
+        table = f"{_quote_identifier(table_schema)}.{_quote_identifier(table_name)}"
+        return f"(SELECT max({_quote_identifier(column_name)}) FROM {table})"
+
+    def compile_freshness_query(self, declared: List[Dict[str, Any]]) -> str:
+        """
+        Build one query returning the newest value of every declared column and lag reference.
+
+        Expectation i is returned as newest_<i> and, when it has a lag reference,
+        reference_<i>. The timestamp columns are without time zone and default to
+        CURRENT_TIMESTAMP, so ages are measured against LOCALTIMESTAMP.
+
+        Args:
+            declared: Expectations from get_declared_freshness
+
+        Returns:
+            SQL query string
+        """
+        select_list = ["LOCALTIMESTAMP AS checked_at"]
+        for i, expectation in enumerate(declared):
+            select_list.append(
+                f"{self._newest_value_expression(expectation['table_schema'], expectation['table_name'], expectation['column_name'])} AS newest_{i}"
+            )
+            reference = expectation["lag_reference"]
+            if reference:
+                select_list.append(
+                    f"{self._newest_value_expression(reference['table_schema'], reference['table_name'], reference['column_name'])} AS reference_{i}"
+                )
+
+        select_sql = ",\n    ".join(select_list)
+        return f"SELECT\n    {select_sql}"
+
+    def detect_freshness_violations(self) -> List[Dict[str, str]]:
+        """
+        Detect violations of contract-declared freshness expectations.
+
+        Returns:
+            List of dictionaries containing violation details. Each dictionary has keys:
+            - contract_name: Name of the contract with violations
+            - table_name: Name of the table with violations
+            - column_name: Name of the column with violations
+            - violations: String describing the specific violation
+        """
+        declared = self.get_declared_freshness()
+        if not declared:
+            return []
+
+        row = self.sql.query(self.compile_freshness_query(declared)).iloc[0]
+        checked_at = pd.Timestamp(row["checked_at"])
+
+        violations = []
+        for i, expectation in enumerate(declared):
+            reference_newest = row[f"reference_{i}"] if expectation["lag_reference"] else None
+            for violation_detail in self._evaluate_expectation(
+                expectation, checked_at, row[f"newest_{i}"], reference_newest
+            ):
+                violations.append({
+                    "contract_name": expectation["contract_name"],
+                    "table_name": expectation["table_name"],
+                    "column_name": expectation["column_name"],
+                    "violations": violation_detail
+                })
+
+        return violations
+
+    def _evaluate_expectation(
+        self,
+        expectation: Dict[str, Any],
+        checked_at: pd.Timestamp,
+        newest: Any,
+        reference_newest: Any,
+    ) -> List[str]:
+        """
+        Compare one expectation with the newest values read for it.
+
+        Args:
+            expectation: Expectation from get_declared_freshness
+            checked_at: Database time the newest values were read at
+            newest: Newest value of the declared column (NULL/NaT for an empty table)
+            reference_newest: Newest value of the lag reference, if the expectation has one
+
+        Returns:
+            One violation detail per broken bound. A lag is not checked while the
+            reference table is empty, since nothing upstream has loaded yet.
+        """
+        column_name = expectation["column_name"]
+        found = []
+
+        if expectation["max_age_sec"] is not None:
+            if pd.isna(newest):
+                found.append(f"Max Age: expected newest {column_name} within {expectation['max_age_sec']}s, found no rows")
+            else:
+                age_sec = (checked_at - pd.Timestamp(newest)).total_seconds()
+                if age_sec > expectation["max_age_sec"]:
+                    found.append(
+                        f"Max Age: expected newest {column_name} within {expectation['max_age_sec']}s, "
+                        f"found {age_sec:.0f}s old (newest {newest})"
+                    )
+
+        if expectation["max_lag_sec"] is not None and not pd.isna(reference_newest):
+            reference = expectation["lag_reference"]
+            reference_name = f"{reference['table_name']}.{reference['column_name']}"
+            expected = f"Max Lag: expected {column_name} within {expectation['max_lag_sec']}s of {reference_name}"
+            if pd.isna(newest):
+                found.append(f"{expected}, found no rows")
+            else:
+                lag_sec = (pd.Timestamp(reference_newest) - pd.Timestamp(newest)).total_seconds()
+                if lag_sec > expectation["max_lag_sec"]:
+                    found.append(f"{expected}, found {lag_sec:.0f}s behind")
+
+        return found
@@ -0,0 +1,260 @@
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Optional
+from data_contract_components.data_assets._query_postgres_helper import PostgresDB
+from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+
+
+def _normalize_expression(expression: Optional[str]) -> Optional[str]:
+    """
+    Canonical form of an index column or predicate for comparison.
+
+    pg_get_indexdef/pg_get_expr add casts, parentheses and identifier quotes that a
+    contract author would not write ("status = 'x'::text"), so those are dropped, along
+    with whitespace and case, and != is read as <>. String literals are kept verbatim,
+    so 'Active' and 'active' stay different.
+    """
+    if expression is None:
+        return None
+    # Odd-numbered parts are the string literals, quotes included
+    parts = re.split(r"('(?:[^']|'')*')", expression)
+    for i in range(0, len(parts), 2):
+        part = re.sub(
+            r"::(?:character varying|double precision|timestamp with(?:out)? time zone|[\w.\"]+)(?:\[\])?",
+            "",
+            parts[i],
+        )
+        part = part.replace("!=", "<>")
+        parts[i] = re.sub(r"[\s()\"]", "", part).lower()
+    return "".join(parts)
+
+
+class ContractIndexDetector:
+    """
+    A class to detect missing or mismatched indexes of contracted tables.
+
+    Contracts declare the indexes their consumers rely on under an "indexes" key
+    on the schema:
+
+        "schema": {
+            "indexes": [
+                {"columns": ["object_id"], "unique": true},
+                {"columns": ["created_at"], "method": "btree"},
+                {"columns": ["tags"], "method": "gin"},
+                {"name": "ix_object_images_recent", "columns": ["created_at"],
+                 "where": "primary_image IS NOT NULL"}
+            ]
+        }
+
+    columns lists the key columns (or expressions) in order, method defaults to
+    btree, unique is only checked when given, and where is the predicate of a
+    partial index; an index without "where" must cover the whole table. With a
+    name, that specific index is checked; otherwise any index of the table that
+    matches satisfies the declaration.
+
+    All declarations are checked against pg_index, pg_class and pg_am with a single
+    catalog query for all contracts. An index left invalid by a failed CREATE INDEX
+    CONCURRENTLY, or a partitioned index not attached to every partition, does not
+    count, since the planner cannot use it.
+    """
+
+    INDEX_KEYS = ("name", "columns", "method", "unique", "where")
+    DEFAULT_METHOD = "btree"
+
+    def __init__(
+        self,
+        contract_directory: str,
+        contract_names: Optional[Iterable[str]] = None,
+        contract_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Initialize the ContractIndexDetector.
+
+        Args:
+            contract_directory: Path to the directory containing contract specification JSON files
+            contract_names: Only check these contracts (file stems); None checks them all
+            contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+        """
+        self.contract_directory = Path(contract_directory)
+        self.contract_names = contract_names
+        self.contract_specs = contract_specs
+        self.sql = PostgresDB()
+
+    def get_declared_indexes(self) -> List[Dict[str, Any]]:
+        """
+        Collect every index declared in the contract specifications.
+
+        Returns:
+            List of dictionaries with keys contract_name, table_schema, table_name,
+            name, columns, method, unique and where
+        """
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
+        declared = []
+
+        for contract_name, contract_spec in contract_specs.items():
+            schema = contract_spec["schema"]
+            for index in schema.get("indexes") or []:
+                unknown_keys = set(index) - set(self.INDEX_KEYS)
+                if unknown_keys:
+                    raise ValueError(
+                        f"Unknown index key(s) {sorted(unknown_keys)} in contract '{contract_name}'"
+                    )
+                if not index.get("columns"):
+                    raise ValueError(f"An index in contract '{contract_name}' declares no columns")
+
+                declared.append({
+                    "contract_name": contract_name,
+                    "table_schema": schema["table_schema"],
+                    "table_name": schema["table_name"],
+                    "name": index.get("name"),
+                    "columns": list(index["columns"]),
+                    "method": index.get("method", self.DEFAULT_METHOD).lower(),
+                    "unique": index.get("unique"),
+                    "where": index.get("where"),
+                })
+
+        return declared
+
+    def get_table_indexes(self, tables: List[tuple]) -> Dict[tuple, Optional[List[Dict[str, Any]]]]:
+        """
+        Read the indexes of the given (schema, table) pairs from pg_index.
+
+        Returns:
+            {(schema, table): [index attributes]}, with None for tables that do not exist
+        """
+        rows = self.sql.query(
+            """
+            SELECT
+                tables.table_schema,
+                tables.table_name,
+                to_regclass(format('%%I.%%I', tables.table_schema, tables.table_name)) IS NOT NULL AS table_exists,
+                index_class.relname AS index_name,
+                pg_am.amname AS method,
+                pg_index.indisunique AS is_unique,
+                pg_index.indisvalid AND pg_index.indisready AS is_valid,
+                ARRAY(
+                    SELECT pg_get_indexdef(pg_index.indexrelid, key_position, true)
+                    FROM generate_series(1, pg_index.indnkeyatts) AS key_position
+                    ORDER BY key_position
+                ) AS columns,
+                pg_get_expr(pg_index.indpred, pg_index.indrelid, true) AS predicate
+            FROM unnest(%(schemas)s::text[], %(tables)s::text[]) AS tables (table_schema, table_name)
+            LEFT JOIN pg_index
+                ON pg_index.indrelid = to_regclass(format('%%I.%%I', tables.table_schema, tables.table_name))
+            LEFT JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+            LEFT JOIN pg_am ON pg_am.oid = index_class.relam
+            ORDER BY tables.table_schema, tables.table_name, index_class.relname
+            """,
+            {"schemas": [table[0] for table in tables], "tables": [table[1] for table in tables]},
+        )
+
+        table_indexes: Dict[tuple, Optional[List[Dict[str, Any]]]] = {}
+        for row in rows.to_dict("records"):
+            key = (row["table_schema"], row["table_name"])
+            if not row["table_exists"]:
+                table_indexes[key] = None
+                continue
+            indexes = table_indexes.setdefault(key, [])
+            # The DataFrame turns SQL NULLs into NaN/NA; a table without indexes has a NULL index_name
+            if isinstance(row["index_name"], str):
+                indexes.append({**row, "predicate": row["predicate"] if isinstance(row["predicate"], str) else None})
+        return table_indexes
+
+    def _index_mismatches(self, declared: Dict[str, Any], index: Dict[str, Any]) -> List[str]:
+        """Describe how an existing index differs from a declaration ([] if it satisfies it)."""
+        mismatches = []
+        if [_normalize_expression(column) for column in declared["columns"]] != [
+            _normalize_expression(column) for column in index["columns"]
+        ]:
+            mismatches.append(f"Columns: expected ({', '.join(declared['columns'])}), found ({', '.join(index['columns'])})")
+        if declared["method"] != index["method"]:
+            mismatches.append(f"Method: expected {declared['method']}, found {index['method']}")
+        if declared["unique"] is not None and bool(declared["unique"]) != bool(index["is_unique"]):
+            mismatches.append(f"Unique: expected {bool(declared['unique'])}, found {bool(index['is_unique'])}")
+        if _normalize_expression(declared["where"]) != _normalize_expression(index["predicate"]):
+            mismatches.append(
+                f"Predicate: expected {declared['where'] or 'none (full index)'}, "
+                f"found {index['predicate'] or 'none (full index)'}"
+            )
+        return mismatches
+
+    def _describe(self, declared: Dict[str, Any]) -> str:
+        """Human-readable form of a declared index, e.g. "unique btree index on (object_id)"."""
+        description = f"{'unique ' if declared['unique'] else ''}{declared['method']} index"
+        if declared["name"]:
+            description += f" {declared['name']}"
+        description += f" on ({', '.join(declared['columns'])})"
+        if declared["where"]:
+            description += f" WHERE {declared['where']}"
+        return description
+
+    def check_declared_index(self, declared: Dict[str, Any], indexes: Optional[List[Dict[str, Any]]]) -> List[str]:
+        """
+        Check one declared index against the indexes of its table.
+
+        Returns:
+            Violation descriptions, [] when a valid index satisfies the declaration
+        """
+        if indexes is None:
+            return [f"Table '{declared['table_schema']}.{declared['table_name']}' not found, cannot check {self._describe(declared)}"]
+
+        if declared["name"]:
+            candidates = [index for index in indexes if index["index_name"] == declared["name"]]
+            if not candidates:
+                return [f"Missing {self._describe(declared)}"]
+            index = candidates[0]
+            mismatches = [f"Index {index['index_name']}: {mismatch}" for mismatch in self._index_mismatches(declared, index)]
+            if not mismatches and not index["is_valid"]:
+                mismatches.append(f"Index {index['index_name']} is invalid and not used by the planner")
+            return mismatches
+
+        matching = [index for index in indexes if not self._index_mismatches(declared, index)]
+        if any(index["is_valid"] for index in matching):
+            return []
+        if matching:
+            return [
+                f"Index {index['index_name']} matches {self._describe(declared)} but is invalid and not used by the planner"
+                for index in matching
+            ]
+
+        # Report an index on the same columns as mismatched rather than the declared one as missing
+        declared_columns = [_normalize_expression(column) for column in declared["columns"]]
+        same_columns = [
+            index for index in indexes
+            if [_normalize_expression(column) for column in index["columns"]] == declared_columns
+        ]
+        if same_columns:
+            index = same_columns[0]
+            return [f"Index {index['index_name']}: {mismatch}" for mismatch in self._index_mismatches(declared, index)]
+        return [f"Missing {self._describe(declared)}"]
+
+    def detect_index_violations(self) -> List[Dict[str, str]]:
+        """
+        Detect missing or mismatched indexes declared in contract specifications.
+
+        Returns:
+            List of dictionaries containing violation details. Each dictionary has keys:
+            - contract_name: Name of the contract with violations
+            - table_name: Name of the table with violations
+            - column_name: Key columns of the declared index, comma-separated
+            - violations: String describing the specific violation
+        """
+        declared = self.get_declared_indexes()
+        if not declared:
+            return []
+
+        tables = sorted({(index["table_schema"], index["table_name"]) for index in declared})
+        table_indexes = self.get_table_indexes(tables)
+
+        violations = []
+        for index in declared:
+            indexes = table_indexes.get((index["table_schema"], index["table_name"]))
+            for violation_detail in self.check_declared_index(index, indexes):
+                violations.append({
+                    "contract_name": index["contract_name"],
+                    "table_name": index["table_name"],
+                    "column_name": ", ".join(index["columns"]),
+                    "violations": violation_detail
+                })
+
+        return violations
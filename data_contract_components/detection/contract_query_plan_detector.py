@@ -0,0 +1,302 @@
+import json
+import re
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Any, Optional
+from data_contract_components.data_assets._query_postgres_helper import PostgresDB, leaf_tables_sql
+from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+from data_contract_components.detection.contract_data_violation_detector import _quote_identifier
+
+# What a statement separator may hide in: string literals (with '' or, in E'...', backslash
+# escapes), quoted identifiers, dollar-quoted strings and comments
+_SQL_SKIPPED = re.compile(
+    r"[Ee]'(?:[^'\\]|\\.|'')*'"
+    r"|'(?:[^']|'')*'"
+    r'|"(?:[^"]|"")*"'
+    r"|(\$[A-Za-z_]*\$).*?\1"
+    r"|--[^\n]*"
+    r"|/\*.*?\*/",
+    re.DOTALL,
+)
+
+
+def _strip_statement_terminator(sql: str) -> str:
+    """
+    Strip trailing semicolons from a single SQL statement.
+
+    Raises:
+        ValueError: If a semicolon outside a literal or comment separates several statements
+    """
+    sql = sql.strip()
+    while sql.endswith(";"):
+        sql = sql[:-1].rstrip()
+    if ";" in _SQL_SKIPPED.sub(" ", sql):
+        raise ValueError("must be a single statement")
+    return sql
+
+
+def _iter_plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield a plan node and all of its descendants, depth first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _iter_plan_nodes(child)
+
+
+class ContractQueryPlanDetector:
+    """
+    A class to detect consumer queries whose plans regress past contract expectations.
+
+    Contracts declare representative consumer queries with plan expectations under
+    a "queries" key on the schema:
+
+        "schema": {
+            "queries": [
+                {
+                    "name": "lookup object_images by object_id",
+                    "sql": "SELECT primary_image FROM object_images WHERE object_id = 437133",
+                    "expect": {"no_seq_scan_above_rows": 10000, "max_total_cost": 100}
+                }
+            ]
+        }
+
+    Expectations:
+    - no_seq_scan_above_rows: no sequential scan of a table estimated to hold more
+      rows than this (a scanned partition counts its whole partitioned table)
+    - max_total_cost: the planner's estimated total cost of the query
+    - forbidden_node_types: plan node types that must not appear, e.g. ["Sort"]
+
+    Each query is planned with EXPLAIN (FORMAT JSON, VERBOSE) and never executed,
+    so the check is cheap and safe to run against production. Plans follow the
+    planner statistics, so run ANALYZE (or ContractStatisticsDetector with
+    analyze=True) after bulk loads; a sequentially scanned table that was never
+    analyzed cannot be sized and is reported as such, unless analyze=True lets the
+    check ANALYZE those tables itself. Query text must be a single statement with
+    literal values; trailing semicolons are dropped.
+    """
+
+    EXPECTATIONS = ("no_seq_scan_above_rows", "max_total_cost", "forbidden_node_types")
+    SEQ_SCAN_NODE_TYPES = ("Seq Scan", "Parallel Seq Scan")
+
+    def __init__(
+        self,
+        contract_directory: str,
+        analyze: bool = False,
+        contract_names: Optional[Iterable[str]] = None,
+        contract_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Initialize the ContractQueryPlanDetector.
+
+        Args:
+            contract_directory: Path to the directory containing contract specification JSON files
+            analyze: ANALYZE sequentially scanned tables that have no planner statistics, then re-plan
+            contract_names: Only check these contracts (file stems); None checks them all
+            contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+        """
+        self.contract_directory = Path(contract_directory)
+        self.analyze = analyze
+        self.contract_names = contract_names
+        self.contract_specs = contract_specs
+        self.sql = PostgresDB()
+
+    def get_declared_queries(self) -> List[Dict[str, Any]]:
+        """
+        Collect every consumer query declared in the contract specifications.
+
+        Returns:
+            List of dictionaries with keys contract_name, table_name, name, sql and expect
+        """
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
+        declared = []
+
+        for contract_name, contract_spec in contract_specs.items():
+            schema = contract_spec["schema"]
+            for query in schema.get("queries") or []:
+                try:
+                    sql = _strip_statement_terminator(query["sql"])
+                except ValueError as e:
+                    raise ValueError(f"Query '{query['name']}' in contract '{contract_name}' {e}") from None
+                unknown = set(query.get("expect", {})) - set(self.EXPECTATIONS)
+                if unknown:
+                    raise ValueError(
+                        f"Unknown plan expectation(s) {sorted(unknown)} in contract '{contract_name}'"
+                    )
+                declared.append({
+                    "contract_name": contract_name,
+                    "table_name": schema["table_name"],
+                    "name": query["name"],
+                    "sql": sql,
+                    "expect": query.get("expect", {}),
+                })
+
+        return declared
+
+    def explain(self, sql: str) -> Dict[str, Any]:
+        """Plan a query without executing it and return the root plan node."""
+        result = self.sql.query(f"EXPLAIN (FORMAT JSON, VERBOSE) {sql}")
+        plan = result.iloc[0, 0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]
+
+    def get_scanned_tables(self, relations: List[tuple]) -> Dict[tuple, Dict[str, Any]]:
+        """
+        Resolve the given (schema, relation) pairs to their tables and estimated row counts.
+
+        A partition resolves to its whole partitioned table, since a plan that scans
+        one partition sequentially would scan the others the same way for other
+        values.
+
+        Returns:
+            {(schema, relation): {"table": "schema.table", "table_schema": ..., "table_name": ...,
+            "rows": estimated rows}}, where rows is None if part of the table has never been
+            vacuumed or analyzed
+        """
+        if not relations:
+            return {}
+        rows = self.sql.query(
+            f"""
+            SELECT
+                relations.relation_schema,
+                relations.relation_name,
+                root_namespace.nspname AS table_schema,
+                root_class.relname AS table_name,
+                CASE
+                    WHEN bool_or(leaf.reltuples < 0) THEN NULL
+                    ELSE sum(leaf.reltuples)::float8
+                END AS table_rows
+            FROM unnest(%(schemas)s::text[], %(relations)s::text[]) AS relations (relation_schema, relation_name)
+            CROSS JOIN LATERAL (
+                SELECT coalesce(
+                    pg_partition_root(to_regclass(format('%%I.%%I', relations.relation_schema, relations.relation_name))),
+                    to_regclass(format('%%I.%%I', relations.relation_schema, relations.relation_name))
+                ) AS root
+            ) AS roots
+            JOIN pg_class AS root_class ON root_class.oid = roots.root
+            JOIN pg_namespace AS root_namespace ON root_namespace.oid = root_class.relnamespace
+            CROSS JOIN LATERAL {leaf_tables_sql("roots.root", "root_class.relkind")} AS leaves
+            JOIN pg_class AS leaf ON leaf.oid = leaves.relid
+            GROUP BY relations.relation_schema, relations.relation_name, root_namespace.nspname, root_class.relname
+            """,
+            {"schemas": [relation[0] for relation in relations], "relations": [relation[1] for relation in relations]},
+        )
+        return {
+            (row["relation_schema"], row["relation_name"]): {
+                "table": f"{row['table_schema']}.{row['table_name']}",
+                "table_schema": row["table_schema"],
+                "table_name": row["table_name"],
+                "rows": None if pd.isna(row["table_rows"]) else row["table_rows"],
+            }
+            for row in rows.to_dict("records")
+        }
+
+    def analyze_tables(self, tables: List[tuple]) -> None:
+        """ANALYZE the given (schema, table) pairs; a partitioned table is analyzed with its partitions."""
+        for table_schema, table_name in tables:
+            self.sql.execute(f"ANALYZE {_quote_identifier(table_schema)}.{_quote_identifier(table_name)}")
+
+    def _plan_queries(self, declared: List[Dict[str, Any]]) -> tuple:
+        """
+        Plan every declared query, then size the tables they scan sequentially with one catalog query.
+
+        Returns:
+            (plans, scanned_tables): per query the root plan node, or the exception raised
+            while planning it, and the get_scanned_tables result for all plans
+        """
+        plans = []
+        for query in declared:
+            try:
+                plans.append(self.explain(query["sql"]))
+            except Exception as e:
+                plans.append(e)
+
+        scanned_tables = self.get_scanned_tables(sorted({
+            (node.get("Schema"), node["Relation Name"])
+            for plan in plans if isinstance(plan, dict)
+            for node in _iter_plan_nodes(plan)
+            if node["Node Type"] in self.SEQ_SCAN_NODE_TYPES
+        }))
+        return plans, scanned_tables
+
+    def check_plan(self, query: Dict[str, Any], plan: Dict[str, Any], scanned_tables: Dict[tuple, Dict[str, Any]]) -> List[str]:
+        """
+        Compare one query plan with the query's expectations.
+
+        Returns:
+            Violation descriptions, [] when the plan meets every expectation
+        """
+        expect = query["expect"]
+        nodes = list(_iter_plan_nodes(plan))
+        violations = []
+
+        max_rows = expect.get("no_seq_scan_above_rows")
+        if max_rows is not None:
+            # One violation per table, however many of its partitions are scanned
+            seq_scanned = {}
+            for node in nodes:
+                if node["Node Type"] in self.SEQ_SCAN_NODE_TYPES:
+                    relation = (node.get("Schema"), node["Relation Name"])
+                    table = scanned_tables.get(relation, {"table": ".".join(relation), "rows": None})
+                    seq_scanned.setdefault(table["table"], table["rows"])
+            for table_name, rows in seq_scanned.items():
+                if rows is None:
+                    violations.append(
+                        f"Seq Scan on {table_name}: no planner statistics to size the table (run ANALYZE on it)"
+                    )
+                elif rows > max_rows:
+                    violations.append(
+                        f"Seq Scan on {table_name}: expected no sequential scan of tables "
+                        f"above {max_rows} rows, found ~{rows:.0f} rows"
+                    )
+
+        max_cost = expect.get("max_total_cost")
+        if max_cost is not None and plan["Total Cost"] > max_cost:
+            violations.append(f"Total Cost: expected <= {max_cost}, found {plan['Total Cost']:g}")
+
+        for node_type in expect.get("forbidden_node_types", []):
+            if any(node["Node Type"] == node_type for node in nodes):
+                violations.append(f"Plan contains a forbidden {node_type} node")
+
+        return [f"Query '{query['name']}': {violation}" for violation in violations]
+
+    def detect_query_plan_violations(self) -> List[Dict[str, str]]:
+        """
+        Detect declared consumer queries whose plans do not meet their expectations.
+
+        Returns:
+            List of dictionaries containing violation details. Each dictionary has keys:
+            - contract_name: Name of the contract with violations
+            - table_name: Name of the contracted table
+            - column_name: None (plan expectations are per query)
+            - violations: String describing the specific violation
+        """
+        declared = self.get_declared_queries()
+        if not declared:
+            return []
+
+        plans, scanned_tables = self._plan_queries(declared)
+        if self.analyze:
+            unsized = sorted({
+                (table["table_schema"], table["table_name"])
+                for table in scanned_tables.values() if table["rows"] is None
+            })
+            if unsized:
+                self.analyze_tables(unsized)
+                # Fresh statistics can change the plans themselves
+                plans, scanned_tables = self._plan_queries(declared)
+
+        violations = []
+        for query, plan in zip(declared, plans):
+            if isinstance(plan, Exception):
+                violation_details = [f"Query '{query['name']}': could not be planned: {plan}"]
+            else:
+                violation_details = self.check_plan(query, plan, scanned_tables)
+            for violation_detail in violation_details:
+                violations.append({
+                    "contract_name": query["contract_name"],
+                    "table_name": query["table_name"],
+                    "column_name": None,
+                    "violations": violation_detail
+                })
+
+        return violations
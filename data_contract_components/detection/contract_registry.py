@@ -0,0 +1,213 @@
+"""
+Postgres-backed registry of the contract specifications (migration 63d1df6e7b1f).
+
+sync() copies the spec files of a contract directory into
+data_contract.contract_registry, adding a new version whenever a spec's content
+changes and retiring contracts whose file was removed.  Lookups then use the
+registry's indexes instead of parsing every file:
+
+    python -m data_contract_components.detection.contract_registry sync
+    python -m data_contract_components.detection.contract_registry find --table object_images
+    python -m data_contract_components.detection.contract_registry find --primary-key object_id
+
+Every lookup returns {contract_name: spec}, the same shape as
+get_data_contract_specs(), and can be passed to a detector as contract_specs
+(the detection CLI does so for --changed-table).
+"""
+
+import argparse
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional
+from psycopg.types.json import Jsonb
+from data_contract_components.data_assets._query_postgres_helper import PostgresDB
+from data_contract_components.detection._get_data_contract_specs import get_data_contract_specs
+
+REGISTRY_TABLE = "data_contract.contract_registry"
+DEFAULT_CONTRACT_DIRECTORY = "data_contract_components/contract_definition"
+
+
+def compute_content_hash(contract_spec: Dict[str, Any]) -> str:
+    """Hash a spec's canonical JSON, so formatting and key order do not create new versions."""
+    canonical = json.dumps(contract_spec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ContractRegistry:
+    """
+    A class to store contract specifications in Postgres and look them up by index.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the ContractRegistry."""
+        self.sql = PostgresDB()
+
+    def sync(self, contract_directory: str = DEFAULT_CONTRACT_DIRECTORY) -> Dict[str, int]:
+        """
+        Bring the registry in line with the spec files of a contract directory.
+
+        New and changed specs get a new current version; the previous version of a
+        changed spec and the current version of a removed one are retired. All
+        changes are made in one transaction.
+
+        Args:
+            contract_directory: Path to the directory containing contract specification JSON files
+
+        Returns:
+            Dictionary with the number of contracts added, changed, retired and unchanged
+        """
+        contract_specs = get_data_contract_specs(contract_directory)
+        incoming = {
+            contract_name: compute_content_hash(contract_spec)
+            for contract_name, contract_spec in contract_specs.items()
+        }
+        current = {
+            row["contract_name"]: row["content_hash"]
+            for row in self.sql.query(
+                f"SELECT contract_name, content_hash FROM {REGISTRY_TABLE} WHERE is_current"
+            ).to_dict("records")
+        }
+
+        added = sorted(set(incoming) - set(current))
+        changed = sorted(name for name in set(incoming) & set(current) if incoming[name] != current[name])
+        removed = sorted(set(current) - set(incoming))
+
+        if added or changed or removed:
+            # Retire before inserting: the unique index allows one current version per contract.
+            self.sql.execute_all([
+                (
+                    f"""
+                    UPDATE {REGISTRY_TABLE}
+                    SET is_current = false, retired_at = CURRENT_TIMESTAMP
+                    WHERE is_current AND contract_name = ANY(%(contract_names)s)
+                    """,
+                    {"contract_names": changed + removed},
+                ),
+                (
+                    f"""
+                    INSERT INTO {REGISTRY_TABLE} (contract_name, version, spec, content_hash)
+                    SELECT
+                        incoming.contract_name,
+                        coalesce(
+                            (SELECT max(version) FROM {REGISTRY_TABLE} AS registered
+                             WHERE registered.contract_name = incoming.contract_name),
+                            0
+                        ) + 1,
+                        incoming.spec,
+                        incoming.content_hash
+                    FROM unnest(%(contract_names)s::text[], %(specs)s::jsonb[], %(content_hashes)s::text[])
+                        AS incoming(contract_name, spec, content_hash)
+                    """,
+                    {
+                        "contract_names": added + changed,
+                        "specs": [Jsonb(contract_specs[name]) for name in added + changed],
+                        "content_hashes": [incoming[name] for name in added + changed],
+                    },
+                ),
+            ])
+
+        return {
+            "added": len(added),
+            "changed": len(changed),
+            "retired": len(removed),
+            "unchanged": len(incoming) - len(added) - len(changed),
+        }
+
+    def _current_specs(self, where: str = "true", params: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """Return {contract_name: spec} for the current versions matching a condition."""
+        rows = self.sql.query(
+            f"""
+            SELECT contract_name, spec
+            FROM {REGISTRY_TABLE}
+            WHERE is_current AND {where}
+            ORDER BY contract_name
+            """,
+            params,
+        )
+        return dict(zip(rows["contract_name"], rows["spec"]))
+
+    def get_contract_specs(self, contract_names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Return the current specs, optionally only those with the given names."""
+        if contract_names is None:
+            return self._current_specs()
+        return self._current_specs("contract_name = ANY(%(contract_names)s)", {"contract_names": list(contract_names)})
+
+    def find_by_table(self, table_name: str, table_schema: str = "public") -> Dict[str, Dict[str, Any]]:
+        """Return the current specs that cover a table (uses ix_contract_registry_table)."""
+        return self._current_specs(
+            "spec #>> '{schema,table_schema}' = %(table_schema)s AND spec #>> '{schema,table_name}' = %(table_name)s",
+            {"table_schema": table_schema, "table_name": table_name},
+        )
+
+    def find_by_owner(self, owner_name: str) -> Dict[str, Dict[str, Any]]:
+        """Return the current specs owned by a team (uses ix_contract_registry_owner)."""
+        return self._current_specs("spec #>> '{owner,name}' = %(owner_name)s", {"owner_name": owner_name})
+
+    def find_containing(self, fragment: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the current specs that contain a JSON fragment (uses the GIN index).
+
+        Args:
+            fragment: Nested dictionary that must be a subset of the spec, e.g.
+                {"owner": {"email": "data-eng@museum.org"}}
+        """
+        return self._current_specs("spec @> %(fragment)s", {"fragment": Jsonb(fragment)})
+
+    def find_by_primary_key(self, column_name: str) -> Dict[str, Dict[str, Any]]:
+        """Return the current specs that declare a column as primary key."""
+        return self.find_containing(
+            {"schema": {"properties": {column_name: {"constraints": {"primaryKey": True}}}}}
+        )
+
+    def get_history(self, contract_name: str) -> List[Dict[str, Any]]:
+        """Return every registered version of a contract, oldest first."""
+        return self.sql.query(
+            f"""
+            SELECT version, content_hash, is_current, synced_at, retired_at
+            FROM {REGISTRY_TABLE}
+            WHERE contract_name = %(contract_name)s
+            ORDER BY version
+            """,
+            {"contract_name": contract_name},
+        ).to_dict("records")
+
+
+def main():
+    """Sync or query the contract registry from the command line."""
+
+    parser = argparse.ArgumentParser(description="Manage the Postgres contract registry.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Copy the contract spec files into the registry")
+    sync_parser.add_argument("--contract-directory", default=DEFAULT_CONTRACT_DIRECTORY)
+
+    find_parser = subparsers.add_parser("find", help="List the current contracts matching a lookup")
+    lookup = find_parser.add_mutually_exclusive_group(required=True)
+    lookup.add_argument("--table", help="Contracted table, optionally schema-qualified")
+    lookup.add_argument("--owner", help="Owner name")
+    lookup.add_argument("--primary-key", help="Column declared as primary key")
+    lookup.add_argument("--contains", help="JSON fragment the spec must contain")
+
+    args = parser.parse_args()
+    registry = ContractRegistry()
+
+    if args.command == "sync":
+        print(json.dumps(registry.sync(args.contract_directory)))
+        return
+
+    if args.table:
+        table_schema, _, table_name = args.table.rpartition(".")
+        contract_specs = registry.find_by_table(table_name, table_schema or "public")
+    elif args.owner:
+        contract_specs = registry.find_by_owner(args.owner)
+    elif args.primary_key:
+        contract_specs = registry.find_by_primary_key(args.primary_key)
+    else:
+        contract_specs = registry.find_containing(json.loads(args.contains))
+
+    for contract_name in contract_specs:
+        print(contract_name)
+
+
+if __name__ == "__main__":
+    main()
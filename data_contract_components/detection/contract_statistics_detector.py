@@ -0,0 +1,261 @@
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Optional
+from data_contract_components.data_assets._query_postgres_helper import PostgresDB, leaf_tables_sql
+from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+from data_contract_components.detection.contract_data_violation_detector import _quote_identifier
+
+
+class ContractStatisticsDetector:
+    """
+    A class to detect contract violations from planner statistics instead of table data.
+
+    Contracts declare thresholds under a "statistics" key, either on the schema
+    (table-level) or on a column property (column-level):
+
+        "schema": {
+            "statistics": {"min_row_count": 100, "max_dead_row_fraction": 0.2},
+            "properties": {
+                "object_id": {"statistics": {"min_distinct_fraction": 1.0}},
+                "primary_image": {"statistics": {"max_null_fraction": 0.05}}
+            }
+        }
+
+    They are answered from pg_class.reltuples, pg_stat_user_tables and pg_stats with
+    two catalog queries for all contracts together, so no table is ever scanned. The
+    numbers are estimates maintained by ANALYZE/autovacuum; pass analyze=True to
+    refresh the statistics of just the declared tables and columns first.
+
+    For a partitioned table the row and dead-row figures are summed over its
+    partitions, and column statistics come from the inherited (whole-table) rows
+    of pg_stats that ANALYZE on the parent maintains.
+    """
+
+    TABLE_THRESHOLDS = ("min_row_count", "max_row_count", "max_dead_row_fraction")
+    COLUMN_THRESHOLDS = (
+        "max_null_fraction",
+        "min_distinct_count",
+        "max_distinct_count",
+        "min_distinct_fraction",
+    )
+
+    def __init__(
+        self,
+        contract_directory: str,
+        analyze: bool = False,
+        contract_names: Optional[Iterable[str]] = None,
+        contract_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Initialize the ContractStatisticsDetector.
+
+        Args:
+            contract_directory: Path to the directory containing contract specification JSON files
+            analyze: Run ANALYZE on the declared columns before reading statistics
+            contract_names: Only check these contracts (file stems); None checks them all
+            contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+        """
+        self.contract_directory = Path(contract_directory)
+        self.analyze = analyze
+        self.contract_names = contract_names
+        self.contract_specs = contract_specs
+        self.sql = PostgresDB()
+
+    def get_declared_statistics(self) -> List[Dict[str, Any]]:
+        """
+        Collect every statistics threshold declared in the contract specifications.
+
+        Returns:
+            List of dictionaries with keys contract_name, table_schema, table_name,
+            column_name (None for table-level thresholds), threshold and expected
+        """
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
+        declared = []
+
+        for contract_name, contract_spec in contract_specs.items():
+            schema = contract_spec["schema"]
+            targets = [(None, schema.get("statistics") or {}, self.TABLE_THRESHOLDS)]
+            for column_name, column_spec in schema["properties"].items():
+                targets.append((column_name, column_spec.get("statistics") or {}, self.COLUMN_THRESHOLDS))
+
+            for column_name, statistics, allowed in targets:
+                for threshold, expected in statistics.items():
+                    if threshold not in allowed:
+                        raise ValueError(
+                            f"Unknown statistics threshold '{threshold}' in contract '{contract_name}'"
+                        )
+                    declared.append({
+                        "contract_name": contract_name,
+                        "table_schema": schema["table_schema"],
+                        "table_name": schema["table_name"],
+                        "column_name": column_name,
+                        "threshold": threshold,
+                        "expected": expected,
+                    })
+
+        return declared
+
+    def analyze_tables(self, declared: List[Dict[str, Any]]) -> None:
+        """
+        Run a targeted ANALYZE covering only the tables and columns with declared thresholds.
+
+        Table-level thresholds only need reltuples, which any ANALYZE of the table refreshes.
+        """
+        columns_by_table: Dict[tuple, set] = {}
+        for threshold in declared:
+            columns = columns_by_table.setdefault((threshold["table_schema"], threshold["table_name"]), set())
+            if threshold["column_name"] is not None:
+                columns.add(threshold["column_name"])
+
+        for (table_schema, table_name), columns in columns_by_table.items():
+            target = f"{_quote_identifier(table_schema)}.{_quote_identifier(table_name)}"
+            if columns:
+                target += " (" + ", ".join(_quote_identifier(column) for column in sorted(columns)) + ")"
+            self.sql.execute(f"ANALYZE {target}")
+
+    def get_table_statistics(self, tables: List[tuple]) -> pd.DataFrame:
+        """
+        Read row estimates and dead-tuple counts for the given (schema, table) pairs.
+
+        A reltuples of -1 means the table (or every partition of it) has never been
+        vacuumed or analyzed.
+        """
+        return self.sql.query(
+            f"""
+            SELECT
+                pg_namespace.nspname AS table_schema,
+                pg_class.relname AS table_name,
+                CASE
+                    WHEN bool_and(leaf.reltuples < 0) THEN -1
+                    ELSE sum(greatest(leaf.reltuples, 0))::float8
+                END AS reltuples,
+                sum(pg_stat_user_tables.n_live_tup)::float8 AS n_live_tup,
+                sum(pg_stat_user_tables.n_dead_tup)::float8 AS n_dead_tup
+            FROM pg_class
+            JOIN pg_namespace ON pg_namespace.oid = pg_class.relnamespace
+            CROSS JOIN LATERAL {leaf_tables_sql("pg_class.oid", "pg_class.relkind")} AS leaves
+            JOIN pg_class AS leaf ON leaf.oid = leaves.relid
+            LEFT JOIN pg_stat_user_tables ON pg_stat_user_tables.relid = leaves.relid
+            WHERE (pg_namespace.nspname, pg_class.relname) IN (
+                SELECT * FROM unnest(%(schemas)s::text[], %(tables)s::text[])
+            )
+            GROUP BY pg_namespace.nspname, pg_class.relname
+            """,
+            {"schemas": [table[0] for table in tables], "tables": [table[1] for table in tables]},
+        )
+
+    def get_column_statistics(self, tables: List[tuple]) -> pd.DataFrame:
+        """
+        Read null fractions and n_distinct estimates from pg_stats for the given tables.
+
+        A negative n_distinct is a fraction of the row count (-1 means every value is
+        distinct); _observed_value resolves it against the table's row estimate.
+        """
+        return self.sql.query(
+            """
+            SELECT
+                pg_stats.schemaname AS table_schema,
+                pg_stats.tablename AS table_name,
+                pg_stats.attname AS column_name,
+                pg_stats.null_frac,
+                pg_stats.n_distinct
+            FROM pg_stats
+            JOIN pg_namespace ON pg_namespace.nspname = pg_stats.schemaname
+            JOIN pg_class ON pg_class.relnamespace = pg_namespace.oid
+                AND pg_class.relname = pg_stats.tablename
+            WHERE pg_stats.inherited = (pg_class.relkind = 'p')
+                AND (pg_stats.schemaname, pg_stats.tablename) IN (
+                    SELECT * FROM unnest(%(schemas)s::text[], %(tables)s::text[])
+                )
+            """,
+            {"schemas": [table[0] for table in tables], "tables": [table[1] for table in tables]},
+        )
+
+    def _observed_value(
+        self,
+        threshold: Dict[str, Any],
+        table_stats: Dict[tuple, Any],
+        column_stats: Dict[tuple, Any],
+    ) -> Optional[float]:
+        """Look up the statistic a threshold is checked against, or None if it is unavailable."""
+        table_key = (threshold["table_schema"], threshold["table_name"])
+
+        if threshold["column_name"] is None:
+            table = table_stats.get(table_key)
+            if table is None:
+                return None
+            if threshold["threshold"] in ("min_row_count", "max_row_count"):
+                return None if table["reltuples"] < 0 else float(table["reltuples"])
+            live, dead = table["n_live_tup"], table["n_dead_tup"]
+            if pd.isna(live) or pd.isna(dead):
+                return None
+            return float(dead) / (live + dead) if live + dead > 0 else 0.0
+
+        column = column_stats.get(table_key + (threshold["column_name"],))
+        if column is None:
+            return None
+        if threshold["threshold"] == "max_null_fraction":
+            return float(column["null_frac"])
+
+        n_distinct = float(column["n_distinct"])
+        table = table_stats.get(table_key)
+        # None when the row count is unknown (no table statistics, or reltuples = -1)
+        reltuples = float(table["reltuples"]) if table is not None and table["reltuples"] >= 0 else None
+        if threshold["threshold"] == "min_distinct_fraction":
+            if n_distinct < 0:
+                return -n_distinct
+            return n_distinct / reltuples if reltuples else None
+        if n_distinct < 0:
+            return -n_distinct * reltuples if reltuples is not None else None
+        return n_distinct
+
+    def detect_statistics_violations(self) -> List[Dict[str, str]]:
+        """
+        Detect violations of contract-declared statistics thresholds.
+
+        Returns:
+            List of dictionaries containing violation details. Each dictionary has keys:
+            - contract_name: Name of the contract with violations
+            - table_name: Name of the table with violations
+            - column_name: Name of the column with violations (None for table-level thresholds)
+            - violations: String describing the specific violation
+        """
+        declared = self.get_declared_statistics()
+        if not declared:
+            return []
+
+        if self.analyze:
+            self.analyze_tables(declared)
+
+        tables = sorted({(threshold["table_schema"], threshold["table_name"]) for threshold in declared})
+        table_stats = {
+            (row["table_schema"], row["table_name"]): row
+            for row in self.get_table_statistics(tables).to_dict("records")
+        }
+        column_stats = {
+            (row["table_schema"], row["table_name"], row["column_name"]): row
+            for row in self.get_column_statistics(tables).to_dict("records")
+        }
+
+        violations = []
+        for threshold in declared:
+            name = threshold["threshold"].replace("_", " ").title()
+            observed = self._observed_value(threshold, table_stats, column_stats)
+
+            if observed is None:
+                detail = f"{name}: no planner statistics available (run ANALYZE on {threshold['table_name']})"
+            elif threshold["threshold"].startswith("min_") and observed < threshold["expected"]:
+                detail = f"{name}: expected >= {threshold['expected']}, found {observed:g}"
+            elif threshold["threshold"].startswith("max_") and observed > threshold["expected"]:
+                detail = f"{name}: expected <= {threshold['expected']}, found {observed:g}"
+            else:
+                continue
+
+            violations.append({
+                "contract_name": threshold["contract_name"],
+                "table_name": threshold["table_name"],
+                "column_name": threshold["column_name"],
+                "violations": detail
+            })
+
+        return violations
@@ -0,0 +1,256 @@
+import re
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Optional
+from data_contract_components.data_assets._query_postgres_helper import PostgresDB, leaf_tables_sql
+from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+
+_SIZE_UNITS = {"": 1, "b": 1, "bytes": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3, "tb": 1024 ** 4}
+
+
+def parse_size(size: Any) -> int:
+    """Convert a byte count or a size such as "512MB" or "1.5 GB" (units of 1024, like pg_size_bytes) to bytes."""
+    if isinstance(size, (int, float)):
+        return int(size)
+    match = re.fullmatch(r"\s*([0-9]+(?:\.[0-9]+)?)\s*([a-zA-Z]*)\s*", str(size))
+    if match is None or match.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size '{size}'")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def format_size(size_bytes: float) -> str:
+    """Render a byte count the way pg_size_pretty does, e.g. "512 MB"."""
+    size = float(size_bytes)
+    for unit in ("bytes", "kB", "MB", "GB"):
+        if abs(size) < 10 * 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.0f} TB"
+
+
+class ContractStorageDetector:
+    """
+    A class to detect contracted tables that outgrow their storage budgets.
+
+    Contracts declare budgets under a "storage" key on the schema:
+
+        "schema": {
+            "storage": {
+                "max_table_bytes": "512MB",
+                "max_index_bytes": "256MB",
+                "max_toast_bytes": "1GB",
+                "max_total_bytes": "2GB",
+                "max_dead_tuple_ratio": 0.2
+            }
+        }
+
+    Sizes are byte counts or strings with a unit (kB, MB, GB, TB). table_bytes is
+    the main fork (pg_relation_size), index_bytes all indexes (pg_indexes_size),
+    toast_bytes the TOAST table and its index, and total_bytes everything
+    (pg_total_relation_size); partitioned tables are summed over their partitions.
+    The dead-tuple ratio is n_dead_tup / (n_live_tup + n_dead_tup) from
+    pg_stat_user_tables, which upsert-heavy reloads such as seed_db drive up
+    until autovacuum (or seed_db.py --vacuum) catches up.
+
+    Every measurement is appended to data_contract.storage_history (migration
+    3ec6df8eb892), and a breach is reported with its change since the previous
+    run, so a budget alert shows whether the table is still growing.
+    """
+
+    BUDGETS = {
+        "max_table_bytes": "table_bytes",
+        "max_index_bytes": "index_bytes",
+        "max_toast_bytes": "toast_bytes",
+        "max_total_bytes": "total_bytes",
+        "max_dead_tuple_ratio": "dead_tuple_ratio",
+    }
+    HISTORY_TABLE = "data_contract.storage_history"
+    MEASUREMENTS = ("table_bytes", "index_bytes", "toast_bytes", "total_bytes", "live_tuples", "dead_tuples")
+
+    def __init__(
+        self,
+        contract_directory: str,
+        record_history: bool = True,
+        contract_names: Optional[Iterable[str]] = None,
+        contract_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Initialize the ContractStorageDetector.
+
+        Args:
+            contract_directory: Path to the directory containing contract specification JSON files
+            record_history: Append this run's measurements to the storage history
+            contract_names: Only check these contracts (file stems); None checks them all
+            contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+        """
+        self.contract_directory = Path(contract_directory)
+        self.record_history = record_history
+        self.contract_names = contract_names
+        self.contract_specs = contract_specs
+        self.sql = PostgresDB()
+
+    def get_declared_budgets(self) -> List[Dict[str, Any]]:
+        """
+        Collect every storage budget declared in the contract specifications.
+
+        Returns:
+            List of dictionaries with keys contract_name, table_schema, table_name,
+            budget and expected (bytes, or a ratio for max_dead_tuple_ratio)
+        """
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
+        declared = []
+
+        for contract_name, contract_spec in contract_specs.items():
+            schema = contract_spec["schema"]
+            for budget, expected in (schema.get("storage") or {}).items():
+                if budget not in self.BUDGETS:
+                    raise ValueError(f"Unknown storage budget '{budget}' in contract '{contract_name}'")
+                declared.append({
+                    "contract_name": contract_name,
+                    "table_schema": schema["table_schema"],
+                    "table_name": schema["table_name"],
+                    "budget": budget,
+                    "expected": float(expected) if budget == "max_dead_tuple_ratio" else parse_size(expected),
+                })
+
+        return declared
+
+    def measure_tables(self, tables: List[tuple]) -> pd.DataFrame:
+        """
+        Measure the storage of the given (schema, table) pairs, summed over partitions.
+
+        Tables that do not exist are left out.
+        """
+        return self.sql.query(
+            f"""
+            SELECT
+                pg_namespace.nspname AS table_schema,
+                pg_class.relname AS table_name,
+                sum(pg_relation_size(leaf.oid))::bigint AS table_bytes,
+                sum(pg_indexes_size(leaf.oid))::bigint AS index_bytes,
+                sum(coalesce(pg_total_relation_size(nullif(leaf.reltoastrelid, 0)), 0))::bigint AS toast_bytes,
+                sum(pg_total_relation_size(leaf.oid))::bigint AS total_bytes,
+                sum(pg_stat_user_tables.n_live_tup)::bigint AS live_tuples,
+                sum(pg_stat_user_tables.n_dead_tup)::bigint AS dead_tuples
+            FROM pg_class
+            JOIN pg_namespace ON pg_namespace.oid = pg_class.relnamespace
+            CROSS JOIN LATERAL {leaf_tables_sql("pg_class.oid", "pg_class.relkind")} AS leaves
+            JOIN pg_class AS leaf ON leaf.oid = leaves.relid
+            LEFT JOIN pg_stat_user_tables ON pg_stat_user_tables.relid = leaves.relid
+            WHERE (pg_namespace.nspname, pg_class.relname) IN (
+                SELECT * FROM unnest(%(schemas)s::text[], %(tables)s::text[])
+            )
+            GROUP BY pg_namespace.nspname, pg_class.relname
+            """,
+            {"schemas": [table[0] for table in tables], "tables": [table[1] for table in tables]},
+        )
+
+    def get_previous_measurements(self, tables: List[tuple]) -> Dict[tuple, Dict[str, Any]]:
+        """Read the latest recorded measurement of each of the given tables."""
+        result = self.sql.query(
+            f"""
+            SELECT DISTINCT ON (table_schema, table_name) *
+            FROM {self.HISTORY_TABLE}
+            WHERE (table_schema, table_name) IN (
+                SELECT * FROM unnest(%(schemas)s::text[], %(tables)s::text[])
+            )
+            ORDER BY table_schema, table_name, measured_at DESC
+            """,
+            {"schemas": [table[0] for table in tables], "tables": [table[1] for table in tables]},
+        )
+        return {(row["table_schema"], row["table_name"]): row for row in result.to_dict("records")}
+
+    def record_measurements(self, measurements: pd.DataFrame) -> None:
+        """Append measurements to the storage history in one transaction."""
+        columns = ("table_schema", "table_name") + self.MEASUREMENTS
+        self.sql.execute_all(
+            (
+                f"INSERT INTO {self.HISTORY_TABLE} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(f'%({column})s' for column in columns)})",
+                {
+                    "table_schema": row["table_schema"],
+                    "table_name": row["table_name"],
+                    # The DataFrame holds numpy integers (or NaN for missing statistics)
+                    **{column: None if pd.isna(row[column]) else int(row[column]) for column in self.MEASUREMENTS},
+                },
+            )
+            for row in measurements.to_dict("records")
+        )
+
+    def _observed_value(self, measurement: Dict[str, Any], budget: str) -> Optional[float]:
+        """The measured value a budget is checked against, or None if it is unavailable."""
+        if budget == "max_dead_tuple_ratio":
+            live, dead = measurement["live_tuples"], measurement["dead_tuples"]
+            if pd.isna(live) or pd.isna(dead):
+                return None
+            return float(dead) / (live + dead) if live + dead > 0 else 0.0
+        return float(measurement[self.BUDGETS[budget]])
+
+    def _format_value(self, budget: str, value: float) -> str:
+        return f"{value:.3f}" if budget == "max_dead_tuple_ratio" else format_size(value)
+
+    def _format_delta(self, budget: str, value: float, previous: Optional[Dict[str, Any]]) -> str:
+        """Describe the change since the previous run, e.g. " (+12 MB since 2026-10-18 06:00)"."""
+        if previous is None:
+            return " (first measurement)"
+        previous_value = self._observed_value(previous, budget)
+        if previous_value is None:
+            return ""
+        delta = value - previous_value
+        sign = "+" if delta >= 0 else "-"
+        since = pd.Timestamp(previous["measured_at"]).strftime("%Y-%m-%d %H:%M")
+        return f" ({sign}{self._format_value(budget, abs(delta))} since {since})"
+
+    def detect_storage_violations(self) -> List[Dict[str, str]]:
+        """
+        Detect contracted tables over their declared storage budgets.
+
+        Returns:
+            List of dictionaries containing violation details. Each dictionary has keys:
+            - contract_name: Name of the contract with violations
+            - table_name: Name of the table with violations
+            - column_name: None (budgets are per table)
+            - violations: String describing the breach and its change since the previous run
+        """
+        declared = self.get_declared_budgets()
+        if not declared:
+            return []
+
+        tables = sorted({(budget["table_schema"], budget["table_name"]) for budget in declared})
+        measurements_df = self.measure_tables(tables)
+        measurements = {
+            (row["table_schema"], row["table_name"]): row
+            for row in measurements_df.to_dict("records")
+        }
+        previous = self.get_previous_measurements(tables)
+        if self.record_history and not measurements_df.empty:
+            self.record_measurements(measurements_df)
+
+        violations = []
+        for budget in declared:
+            table_key = (budget["table_schema"], budget["table_name"])
+            name = budget["budget"].replace("_", " ").title()
+            measurement = measurements.get(table_key)
+            observed = None if measurement is None else self._observed_value(measurement, budget["budget"])
+
+            if measurement is None:
+                detail = f"{name}: table {budget['table_schema']}.{budget['table_name']} not found"
+            elif observed is None:
+                detail = f"{name}: no table statistics available (run ANALYZE on {budget['table_name']})"
+            elif observed > budget["expected"]:
+                detail = (
+                    f"{name}: expected <= {self._format_value(budget['budget'], budget['expected'])}, "
+                    f"found {self._format_value(budget['budget'], observed)}"
+                    + self._format_delta(budget["budget"], observed, previous.get(table_key))
+                )
+            else:
+                continue
+
+            violations.append({
+                "contract_name": budget["contract_name"],
+                "table_name": budget["table_name"],
+                "column_name": None,
+                "violations": detail
+            })
+
+        return violations
@@ -1,8 +1,10 @@
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Any
-from data_contract_components.detection._get_data_catalog import get_data_catalog
-from data_contract_components.detection._get_data_contract_specs import get_data_contract_specs
+from typing import Callable, Dict, Iterable, List, Optional, Any
+from functools import partial
+from data_contract_components.detection._get_data_catalog import get_data_catalog, merge_on_codes
+from data_contract_components.detection._get_data_contract_specs import resolve_data_contract_specs
+from data_contract_components.data_assets._phase_profiler import PhaseProfiler
 
 
 class ContractViolationDetector:
@@ -13,19 +15,58 @@ class ContractViolationDetector:
     This class validates that the actual database schema matches the constraints
     defined in the contract specifications.
     """
+
+    MERGE_KEYS = ['table_catalog', 'table_schema', 'table_name', 'column_name']
+
+    # Catalog fields compared against the contract; no other catalog field is loaded
+    CONSTRAINT_FIELDS = [
+        'constraint_type',
+        'data_type',
+        'is_nullable',
+        'numeric_precision',
+        'datetime_precision',
+        'character_maximum_length',
+        'is_updatable',
+        'element_data_type',
+        'element_character_maximum_length',
+        'element_numeric_precision',
+        'element_datetime_precision'
+    ]
     
-    def __init__(self, contract_directory: str) -> None:
+    def __init__(
+        self,
+        contract_directory: str,
+        catalog_source: Optional[Callable[[], pd.DataFrame]] = None,
+        contract_names: Optional[Iterable[str]] = None,
+        contract_specs: Optional[Dict[str, Dict[str, Any]]] = None,
+        profiler: Optional[PhaseProfiler] = None,
+    ) -> None:
         """
         Initialize the ContractViolationDetector.
         
         Args:
             contract_directory: Path to the directory containing contract specification JSON files
+            catalog_source: Callable returning the data catalog DataFrame (defaults to
+                querying just the compared fields from the live database with get_data_catalog)
+            contract_names: Only check these contracts (file stems); None checks them all
+            contract_specs: Specs to check instead of the files (see resolve_data_contract_specs)
+            profiler: Records the phases of each detection run (defaults to one configured
+                by the DATA_CONTRACT_PROFILE environment variable, off when it is unset)
         """
         self.contract_directory = Path(contract_directory)
+        self.catalog_source = catalog_source or partial(
+            get_data_catalog, columns=self.MERGE_KEYS + self.CONSTRAINT_FIELDS
+        )
+        self.contract_names = contract_names
+        self.contract_specs = contract_specs
+        self.profiler = profiler or PhaseProfiler.from_env(type(self).__name__)
     
     def _values_equal(self, val1: Any, val2: Any) -> bool:
         """
-        Compare two values, handling NaN properly using pandas equality.
+        Compare two values, treating every kind of missing value (None, NaN, pd.NA) as equal.
+
+        Catalog values come from nullable integer and categorical columns, so the
+        comparison is by value rather than by dtype (32.0 from a contract equals 32).
         
         Args:
             val1: First value to compare
@@ -34,7 +75,9 @@ class ContractViolationDetector:
         Returns:
             True if values are equal (including NaN == NaN), False otherwise
         """
-        return pd.Series([val1]).equals(pd.Series([val2]))
+        if pd.isna(val1) or pd.isna(val2):
+            return pd.isna(val1) and pd.isna(val2)
+        return bool(val1 == val2)
     
     def transform_contract_specs_to_catalog_format(self) -> List[Dict[str, Any]]:
         """
@@ -43,7 +86,7 @@ class ContractViolationDetector:
         Returns:
             List of dictionaries containing contract constraints in catalog format
         """
-        contract_specs = get_data_contract_specs(self.contract_directory)
+        contract_specs = resolve_data_contract_specs(self.contract_directory, self.contract_names, self.contract_specs)
         catalog_format_specs = []
         
         for contract_name, contract_spec in contract_specs.items():
@@ -88,17 +131,29 @@ class ContractViolationDetector:
             - column_name: Name of the column with violations
             - violations: String describing the specific violation
         """
-        contract_specs_df = pd.DataFrame(self.transform_contract_specs_to_catalog_format())
-        catalog_df = get_data_catalog()
-        
-        merged = contract_specs_df.merge(
-            catalog_df,
-            on=['table_catalog', 'table_schema', 'table_name', 'column_name'],
-            how='left',
-            suffixes=('_contract', '_catalog'),
-            indicator=True
-        )
+        with self.profiler.run():
+            with self.profiler.phase("spec_load"):
+                contract_specs_df = pd.DataFrame(self.transform_contract_specs_to_catalog_format())
+            with self.profiler.phase("catalog_query"):
+                catalog_df = self.catalog_source()[self.MERGE_KEYS + self.CONSTRAINT_FIELDS]
+            
+            with self.profiler.phase("merge"):
+                merged = merge_on_codes(
+                    contract_specs_df,
+                    catalog_df,
+                    on=self.MERGE_KEYS,
+                    how='left',
+                    suffixes=('_contract', '_catalog'),
+                    indicator=True
+                )
+            
+            with self.profiler.phase("comparison"):
+                violations = self._compare_merged_catalog(merged)
         
+        return violations
+    
+    def _compare_merged_catalog(self, merged: pd.DataFrame) -> List[Dict[str, str]]:
+        """Turn the contract/catalog merge into violation dictionaries (see detect_constraint_violations)."""
         violations = []
         
         # Check for missing columns in data catalog
@@ -114,25 +169,10 @@ class ContractViolationDetector:
         # Check for constraint violations on existing columns
         existing_columns = merged[merged['_merge'] == 'both']
         
-        # Define fields to check for violations
-        constraint_fields = [
-            'constraint_type',
-            'data_type', 
-            'is_nullable',
-            'numeric_precision',
-            'datetime_precision',
-            'character_maximum_length',
-            'is_updatable',
-            'element_data_type',
-            'element_character_maximum_length',
-            'element_numeric_precision',
-            'element_datetime_precision'
-        ]
-        
         for violation in existing_columns.itertuples():
             violations_found = []
             
-            for field in constraint_fields:
+            for field in self.CONSTRAINT_FIELDS:
                 contract_field = f'{field}_contract'
                 catalog_field = f'{field}_catalog'
                 
@@ -0,0 +1,85 @@
+import unittest
+
+import pandas as pd
+
+from data_contract_components.detection.contract_freshness_detector import ContractFreshnessDetector
+
+CHECKED_AT = pd.Timestamp("2026-10-19 12:00:00")
+
+
+def expectation(max_age_sec=None, max_lag_sec=None):
+    return {
+        "contract_name": "object_images_contract_spec",
+        "table_schema": "public",
+        "table_name": "object_images",
+        "column_name": "created_at",
+        "max_age_sec": max_age_sec,
+        "max_lag_sec": max_lag_sec,
+        "lag_reference": (
+            {"table_schema": "public", "table_name": "object", "column_name": "created_at"}
+            if max_lag_sec is not None else None
+        ),
+    }
+
+
+class TestEvaluateExpectation(unittest.TestCase):
+    """_evaluate_expectation compares already-read newest values, so no database is needed."""
+
+    def setUp(self):
+        self.detector = ContractFreshnessDetector("unused", contract_specs={})
+
+    def evaluate(self, expectation, newest, reference_newest=None):
+        return self.detector._evaluate_expectation(expectation, CHECKED_AT, newest, reference_newest)
+
+    def test_age_within_bound(self):
+        self.assertEqual(self.evaluate(expectation(max_age_sec=3600), pd.Timestamp("2026-10-19 11:00:00")), [])
+
+    def test_age_over_bound(self):
+        found = self.evaluate(expectation(max_age_sec=3600), pd.Timestamp("2026-10-19 10:59:59"))
+        self.assertEqual(len(found), 1)
+        self.assertIn("found 3601s old", found[0])
+
+    def test_age_of_empty_table(self):
+        for newest in (None, pd.NaT, float("nan")):
+            found = self.evaluate(expectation(max_age_sec=3600), newest)
+            self.assertEqual(len(found), 1)
+            self.assertIn("found no rows", found[0])
+
+    def test_lag_within_bound(self):
+        found = self.evaluate(
+            expectation(max_lag_sec=600), pd.Timestamp("2026-10-19 09:50:00"), pd.Timestamp("2026-10-19 10:00:00")
+        )
+        self.assertEqual(found, [])
+
+    def test_lag_over_bound(self):
+        found = self.evaluate(
+            expectation(max_lag_sec=600), pd.Timestamp("2026-10-19 09:49:59"), pd.Timestamp("2026-10-19 10:00:00")
+        )
+        self.assertEqual(len(found), 1)
+        self.assertIn("of object.created_at, found 601s behind", found[0])
+
+    def test_lag_ignores_the_age(self):
+        # Both tables stalled together: no lag, however old the newest rows are
+        stalled = pd.Timestamp("2026-01-01 00:00:00")
+        self.assertEqual(self.evaluate(expectation(max_lag_sec=600), stalled, stalled), [])
+
+    def test_lag_of_empty_table_behind_loaded_reference(self):
+        found = self.evaluate(expectation(max_lag_sec=600), pd.NaT, pd.Timestamp("2026-10-19 10:00:00"))
+        self.assertEqual(len(found), 1)
+        self.assertIn("found no rows", found[0])
+
+    def test_lag_skipped_while_reference_is_empty(self):
+        for reference_newest in (None, pd.NaT, float("nan")):
+            self.assertEqual(self.evaluate(expectation(max_lag_sec=600), pd.NaT, reference_newest), [])
+            self.assertEqual(
+                self.evaluate(expectation(max_lag_sec=600), pd.Timestamp("2026-10-19 10:00:00"), reference_newest), []
+            )
+
+    def test_age_and_lag_reported_separately(self):
+        both = expectation(max_age_sec=3600, max_lag_sec=600)
+        found = self.evaluate(both, pd.Timestamp("2026-10-19 08:00:00"), pd.Timestamp("2026-10-19 11:30:00"))
+        self.assertEqual([detail.split(":")[0] for detail in found], ["Max Age", "Max Lag"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from data_contract_components.detection.contract_statistics_detector import ContractStatisticsDetector
+
+
+def threshold(name, column_name=None):
+    return {"table_schema": "public", "table_name": "objects", "column_name": column_name, "threshold": name}
+
+
+def table_stats(reltuples, n_live_tup=float("nan"), n_dead_tup=float("nan")):
+    return {("public", "objects"): {"reltuples": reltuples, "n_live_tup": n_live_tup, "n_dead_tup": n_dead_tup}}
+
+
+def column_stats(null_frac=0.0, n_distinct=0.0):
+    return {("public", "objects", "object_id"): {"null_frac": null_frac, "n_distinct": n_distinct}}
+
+
+class TestObservedValue(unittest.TestCase):
+    """_observed_value resolves a threshold from already-read catalog rows, so no database is needed."""
+
+    def setUp(self):
+        self.detector = ContractStatisticsDetector("unused", contract_specs={})
+
+    def observe(self, name, tables, columns=None, column_name=None):
+        return self.detector._observed_value(threshold(name, column_name), tables, columns or {})
+
+    def test_row_count_is_reltuples(self):
+        self.assertEqual(self.observe("min_row_count", table_stats(1200.0)), 1200.0)
+        self.assertEqual(self.observe("max_row_count", table_stats(0.0)), 0.0)
+
+    def test_never_analyzed_table_has_no_row_count(self):
+        self.assertIsNone(self.observe("min_row_count", table_stats(-1.0)))
+        self.assertIsNone(self.observe("max_row_count", {}))
+
+    def test_dead_row_fraction_of_summed_partitions(self):
+        # A partitioned table arrives with n_live_tup/n_dead_tup already summed over its partitions
+        self.assertEqual(self.observe("max_dead_row_fraction", table_stats(900.0, 900.0, 100.0)), 0.1)
+        self.assertEqual(self.observe("max_dead_row_fraction", table_stats(0.0, 0.0, 0.0)), 0.0)
+        self.assertIsNone(self.observe("max_dead_row_fraction", table_stats(900.0)))
+
+    def test_null_fraction(self):
+        observed = self.observe("max_null_fraction", table_stats(100.0), column_stats(null_frac=0.25), "object_id")
+        self.assertEqual(observed, 0.25)
+        self.assertIsNone(self.observe("max_null_fraction", table_stats(100.0), {}, "object_id"))
+
+    def test_positive_n_distinct_is_a_count(self):
+        columns = column_stats(n_distinct=40.0)
+        self.assertEqual(self.observe("min_distinct_count", table_stats(200.0), columns, "object_id"), 40.0)
+        self.assertEqual(self.observe("min_distinct_fraction", table_stats(200.0), columns, "object_id"), 0.2)
+        # Without a row count a fraction cannot be derived from a count
+        self.assertIsNone(self.observe("min_distinct_fraction", table_stats(-1.0), columns, "object_id"))
+        self.assertIsNone(self.observe("min_distinct_fraction", table_stats(0.0), columns, "object_id"))
+
+    def test_negative_n_distinct_is_a_fraction_of_the_rows(self):
+        columns = column_stats(n_distinct=-0.5)
+        self.assertEqual(self.observe("min_distinct_fraction", table_stats(200.0), columns, "object_id"), 0.5)
+        self.assertEqual(self.observe("max_distinct_count", table_stats(200.0), columns, "object_id"), 100.0)
+        # -1 means every value is distinct
+        self.assertEqual(
+            self.observe("min_distinct_count", table_stats(1500.0), column_stats(n_distinct=-1.0), "object_id"), 1500.0
+        )
+
+    def test_negative_n_distinct_without_row_count(self):
+        columns = column_stats(n_distinct=-0.5)
+        self.assertIsNone(self.observe("min_distinct_count", table_stats(-1.0), columns, "object_id"))
+        self.assertIsNone(self.observe("min_distinct_count", {}, columns, "object_id"))
+        # The fraction does not need the row count
+        self.assertEqual(self.observe("min_distinct_fraction", table_stats(-1.0), columns, "object_id"), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
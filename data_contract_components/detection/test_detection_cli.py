@@ -0,0 +1,98 @@
+import contextlib
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+
+from data_contract_components.detection.__main__ import EXIT_ERROR, EXIT_OK, EXIT_VIOLATIONS, main
+
+CONTRACT_DIRECTORY = pathlib.Path(__file__).resolve().parents[1] / "contract_definition"
+CONTRACT_NAME = "object_images_contract_spec"
+
+
+class TestDetectionCli(unittest.TestCase):
+    """The catalog checks run against the catalog the migrations build, so no database is needed."""
+
+    def run_cli(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exit_code = main(list(argv))
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def mismatched_contract_directory(self):
+        """A contract directory whose one contract declares object_id as bigint; the migrations make it integer."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        contract_spec = json.loads((CONTRACT_DIRECTORY / f"{CONTRACT_NAME}.json").read_text())
+        contract_spec["schema"]["properties"]["object_id"]["constraints"]["data_type"] = "bigint"
+        (pathlib.Path(directory.name) / f"{CONTRACT_NAME}.json").write_text(json.dumps(contract_spec))
+        return directory.name
+
+    def test_no_violations_exits_0(self):
+        exit_code, stdout, _ = self.run_cli("violations", "--catalog", "migrations")
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertIn("No violations found", stdout)
+
+    def test_violations_exit_1(self):
+        exit_code, stdout, _ = self.run_cli(
+            "--contract-directory", self.mismatched_contract_directory(), "violations", "--catalog", "migrations"
+        )
+        self.assertEqual(exit_code, EXIT_VIOLATIONS)
+        self.assertIn("Data Type: expected bigint, found integer", stdout)
+        self.assertIn("1 violation(s) found", stdout)
+
+    def test_json_format(self):
+        exit_code, stdout, _ = self.run_cli(
+            "--contract-directory", self.mismatched_contract_directory(), "violations", "--catalog", "migrations",
+            "--format", "json",
+        )
+        self.assertEqual(exit_code, EXIT_VIOLATIONS)
+        self.assertEqual(json.loads(stdout), [{
+            "check": "violations",
+            "contract_name": CONTRACT_NAME,
+            "table_name": "object_images",
+            "column_name": "object_id",
+            "violations": "Data Type: expected bigint, found integer",
+        }])
+
+    def test_github_format(self):
+        exit_code, stdout, _ = self.run_cli(
+            "--format", "github", "--contract-directory", self.mismatched_contract_directory(),
+            "violations", "--catalog", "migrations",
+        )
+        self.assertEqual(exit_code, EXIT_VIOLATIONS)
+        self.assertEqual(
+            stdout.splitlines(),
+            [f"::error title=Data contract {CONTRACT_NAME} (violations)::"
+             "object_images.object_id: Data Type: expected bigint, found integer"],
+        )
+
+    def test_shared_options_before_or_after_the_command(self):
+        before = self.run_cli("--format", "json", "--contract", CONTRACT_NAME, "violations", "--catalog", "migrations")
+        after = self.run_cli("violations", "--catalog", "migrations", "--format", "json", "--contract", CONTRACT_NAME)
+        self.assertEqual(before, (EXIT_OK, "[]\n", ""))
+        self.assertEqual(after, before)
+        # Given after the command, an option only overrides what was given before it
+        exit_code, stdout, _ = self.run_cli("--format", "json", "violations", "--catalog", "migrations", "--jobs", "2")
+        self.assertEqual((exit_code, json.loads(stdout)), (EXIT_OK, []))
+
+    def test_unknown_contract_exits_2(self):
+        exit_code, stdout, stderr = self.run_cli("--contract", "no_such_contract_spec", "violations", "--catalog", "migrations")
+        self.assertEqual(exit_code, EXIT_ERROR)
+        self.assertEqual(stdout, "")
+        self.assertTrue(stderr.startswith("error: "))
+        self.assertIn("no_such_contract_spec", stderr)
+
+    def test_list(self):
+        exit_code, stdout, _ = self.run_cli("list", "--contract", CONTRACT_NAME)
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(stdout, f"{CONTRACT_NAME}\tpublic.object_images\t4 columns\tData Engineering Team\n")
+
+        exit_code, stdout, _ = self.run_cli("--format", "json", "list")
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertIn(CONTRACT_NAME, [contract["contract_name"] for contract in json.loads(stdout)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,32 +1,198 @@
+import os
+import re
 import unittest
+import zlib
+from functools import lru_cache
+from pathlib import Path
 from data_contract_components.detection.contract_coverage_detector import ContractCoverageDetector
 from data_contract_components.detection.contract_violation_detector import ContractViolationDetector
+from data_contract_components.detection.contract_data_violation_detector import ContractDataViolationDetector
+from data_contract_components.detection.contract_index_detector import ContractIndexDetector
+from data_contract_components.detection.contract_query_plan_detector import ContractQueryPlanDetector
+from data_contract_components.detection.contract_storage_detector import ContractStorageDetector
+from data_contract_components.detection.contract_statistics_detector import ContractStatisticsDetector
+from data_contract_components.detection.contract_freshness_detector import ContractFreshnessDetector
+from data_contract_components.detection._get_offline_data_catalog import resolve_catalog_source
+
+CONTRACT_DIRECTORY = "data_contract_components/contract_definition"
+
+# Where the catalog checks read the schema from: "live" (default), "migrations[:<revision>]",
+# "pg_dump:<path>" or "snapshot:<path>". The offline sources let schema changes be gated
+# without a database.
+CATALOG_SOURCE = os.environ.get("DATA_CONTRACT_CATALOG", "live")
+
+# Split the contracts across CI workers: worker i of n runs with
+# CONTRACT_TEST_SHARD_INDEX=i CONTRACT_TEST_SHARD_COUNT=n.
+SHARD_INDEX = int(os.environ.get("CONTRACT_TEST_SHARD_INDEX", "0"))
+SHARD_COUNT = int(os.environ.get("CONTRACT_TEST_SHARD_COUNT", "1"))
+
+
+def shard_contract_names(contract_names, shard_index, shard_count):
+    """
+    Return the contracts that belong to one shard.
+
+    Contracts are assigned by a hash of their name rather than by position, so adding
+    or removing a contract does not move every other contract to a different worker.
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Shard index {shard_index} is out of range for {shard_count} shards")
+    return [
+        contract_name for contract_name in contract_names
+        if zlib.crc32(contract_name.encode("utf-8")) % shard_count == shard_index
+    ]
+
+
+@lru_cache(maxsize=None)
+def get_cached_data_catalog():
+    """Read the data catalog once per test process and share it across every contract's tests."""
+    return resolve_catalog_source(CATALOG_SOURCE)()
 
 
 class TestContractViolations(unittest.TestCase):
-    def setUp(self):
-        self.contract_coverage_detector = ContractCoverageDetector("data_contract_components/contract_definition")
-        self.contract_violation_detector = ContractViolationDetector("data_contract_components/contract_definition")
+    """
+    Contract checks, generated per contract and per check type.
+
+    Each contract gets its own test methods (see _add_contract_tests), so a failing
+    contract is reported and timed on its own, and the suite can be split across
+    workers with the shard environment variables or any per-test parallel runner.
+    """
 
-    def test_all_contract_assets_present_in_catalog(self):
-        """Test that all assets under contract are present in the data catalog"""
-        missing_table_names = self.contract_coverage_detector.detect_coverage_in_data_catalog()
+    def _format_violations(self, violations):
+        violation_lines = []
+        for i, violation in enumerate(violations, 1):
+            violation_lines.append(f"{i}. Contract: {violation.get('contract_name', 'N/A')}")
+            violation_lines.append(f"   Table: {violation.get('table_name', 'N/A')}")
+            violation_lines.append(f"   Column: {violation.get('column_name', 'N/A')}")
+            violation_lines.append(f"   Issue: {violation.get('violations', 'N/A')}")
+            violation_lines.append("")  # Empty line between violations
+        return "\n".join(violation_lines)
+
+    def check_contract_assets_present_in_catalog(self, contract_name):
+        """Test that the assets under a contract are present in the data catalog"""
+        detector = ContractCoverageDetector(
+            CONTRACT_DIRECTORY, catalog_source=get_cached_data_catalog, contract_names=[contract_name]
+        )
+        missing_table_names = detector.detect_coverage_in_data_catalog()
 
         self.assertTrue(len(missing_table_names) == 0, f"All assets under contract should be present in data catalog.\nMissing: {missing_table_names}")
 
-    def test_data_contracts_against_data_catalog(self):
-        """Test that all data contract constraints match the data catalog."""
-        violations = self.contract_violation_detector.detect_constraint_violations()
+    def check_data_contract_against_data_catalog(self, contract_name):
+        """Test that a data contract's constraints match the data catalog."""
+        detector = ContractViolationDetector(
+            CONTRACT_DIRECTORY, catalog_source=get_cached_data_catalog, contract_names=[contract_name]
+        )
+        violations = detector.detect_constraint_violations()
 
         if violations:
-            violation_lines = []
-            for i, violation in enumerate(violations, 1):
-                violation_lines.append(f"{i}. Contract: {violation.get('contract_name', 'N/A')}")
-                violation_lines.append(f"   Table: {violation.get('table_name', 'N/A')}")
-                violation_lines.append(f"   Column: {violation.get('column_name', 'N/A')}")
-                violation_lines.append(f"   Issue: {violation.get('violations', 'N/A')}")
-                violation_lines.append("")  # Empty line between violations
-            violation_text = "\n".join(violation_lines)
+            violation_text = self._format_violations(violations)
             self.fail(f"All data contract constraints should match the data catalog.\n\nViolations:\n{violation_text}")
-        else:
-            self.assertTrue(True)
+
+    def check_data_contract_against_table_data(self, contract_name):
+        """Test that the rows of a contracted table respect the contract constraints."""
+        if CATALOG_SOURCE != "live":
+            self.skipTest("table data checks need a live database")
+
+        detector = ContractDataViolationDetector(CONTRACT_DIRECTORY, contract_names=[contract_name])
+        violations = detector.detect_data_violations()
+
+        if violations:
+            violation_text = self._format_violations(violations)
+            self.fail(f"All table data should respect the data contract constraints.\n\nViolations:\n{violation_text}")
+
+    def check_data_contract_indexes(self, contract_name):
+        """Test that the indexes a data contract declares exist and match."""
+        if CATALOG_SOURCE != "live":
+            self.skipTest("index checks need a live database")
+
+        detector = ContractIndexDetector(CONTRACT_DIRECTORY, contract_names=[contract_name])
+        violations = detector.detect_index_violations()
+
+        if violations:
+            violation_text = self._format_violations(violations)
+            self.fail(f"All indexes declared by the data contract should exist.\n\nViolations:\n{violation_text}")
+
+    def check_data_contract_query_plans(self, contract_name):
+        """Test that the consumer queries of a data contract are planned within their expectations."""
+        if CATALOG_SOURCE != "live":
+            self.skipTest("query plan checks need a live database")
+
+        # A freshly migrated table has no planner statistics, so let the check analyze what it scans
+        detector = ContractQueryPlanDetector(CONTRACT_DIRECTORY, analyze=True, contract_names=[contract_name])
+        violations = detector.detect_query_plan_violations()
+
+        if violations:
+            violation_text = self._format_violations(violations)
+            self.fail(f"All consumer queries should meet their plan expectations.\n\nViolations:\n{violation_text}")
+
+    def check_data_contract_storage_budgets(self, contract_name):
+        """Test that a contracted table stays within its declared storage budgets."""
+        if CATALOG_SOURCE != "live":
+            self.skipTest("storage budget checks need a live database")
+
+        # Only the detection CLI records storage history, so test runs do not skew the trends
+        detector = ContractStorageDetector(CONTRACT_DIRECTORY, record_history=False, contract_names=[contract_name])
+        violations = detector.detect_storage_violations()
+
+        if violations:
+            violation_text = self._format_violations(violations)
+            self.fail(f"All contracted tables should stay within their storage budgets.\n\nViolations:\n{violation_text}")
+
+    def check_data_contract_statistics(self, contract_name):
+        """Test that the planner statistics of a contracted table meet the declared thresholds."""
+        if CATALOG_SOURCE != "live":
+            self.skipTest("statistics checks need a live database")
+
+        # The migrated tables may never have been analyzed, so refresh just the declared ones
+        detector = ContractStatisticsDetector(CONTRACT_DIRECTORY, analyze=True, contract_names=[contract_name])
+        violations = detector.detect_statistics_violations()
+
+        if violations:
+            violation_text = self._format_violations(violations)
+            self.fail(f"All planner statistics should meet the data contract thresholds.\n\nViolations:\n{violation_text}")
+
+    def check_data_contract_freshness(self, contract_name):
+        """Test that the timestamp columns of a contracted table meet the declared freshness expectations."""
+        if CATALOG_SOURCE != "live":
+            self.skipTest("freshness checks need a live database")
+
+        detector = ContractFreshnessDetector(CONTRACT_DIRECTORY, contract_names=[contract_name])
+        violations = detector.detect_freshness_violations()
+
+        if violations:
+            violation_text = self._format_violations(violations)
+            self.fail(f"All contracted tables should meet their freshness expectations.\n\nViolations:\n{violation_text}")
+
+
+CONTRACT_CHECKS = [
+    "check_contract_assets_present_in_catalog",
+    "check_data_contract_against_data_catalog",
+    "check_data_contract_against_table_data",
+    "check_data_contract_indexes",
+    "check_data_contract_query_plans",
+    "check_data_contract_storage_budgets",
+    "check_data_contract_statistics",
+    "check_data_contract_freshness",
+]
+
+
+def _add_contract_tests(test_case, contract_names):
+    """Add a test_<check>__<contract> method to the test case for every check and contract."""
+    for contract_name in contract_names:
+        for check_name in CONTRACT_CHECKS:
+            def test(self, check_name=check_name, contract_name=contract_name):
+                getattr(self, check_name)(contract_name)
+
+            test_name = f"test_{check_name[len('check_'):]}__{re.sub(r'[^0-9a-zA-Z_]', '_', contract_name)}"
+            test.__name__ = test_name
+            test.__doc__ = f"{getattr(test_case, check_name).__doc__} ({contract_name})"
+            setattr(test_case, test_name, test)
+
+
+_add_contract_tests(
+    TestContractViolations,
+    shard_contract_names(
+        sorted(path.stem for path in Path(CONTRACT_DIRECTORY).glob("*.json")),
+        SHARD_INDEX,
+        SHARD_COUNT,
+    ),
+)